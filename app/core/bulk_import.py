@@ -0,0 +1,208 @@
+import asyncio
+import codecs
+import csv
+import itertools
+import json
+import logging
+import tempfile
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Tuple
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app import models, schemas
+from app.core.catalog_cache import catalog_cache
+from app.core.suggest import suggest_service
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Colonnes acceptées dans un fichier d'import (mêmes noms que schemas.BookCreate)
+IMPORT_FIELDS = (
+    "title", "author", "isbn", "publisher", "publication_date",
+    "number_of_copies", "available_copies",
+)
+
+# Paramètres liés par requête au plus (limite du protocole de PostgreSQL,
+# imposée par asyncpg) : l'INSERT d'un lot en lie un par colonne et par ligne
+MAX_QUERY_PARAMETERS = 32767
+MAX_BATCH_SIZE = MAX_QUERY_PARAMETERS // len(IMPORT_FIELDS)
+
+# Taille d'un bloc copié depuis le fichier reçu, et taille au-delà de laquelle
+# la copie est écrite sur disque
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+async def spool_upload(upload: UploadFile) -> BinaryIO:
+    """
+    Copie un fichier reçu dans un fichier temporaire propre à l'import (en
+    mémoire jusqu'à UPLOAD_SPOOL_MAX_SIZE, puis sur disque), positionné au début.
+
+    Le rapport d'import est envoyé après le retour du handler ; selon sa
+    version, FastAPI ferme alors déjà l'UploadFile. La copie reste ouverte
+    jusqu'à ce que l'appelant la ferme.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+    try:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(spooled.write, chunk)
+        spooled.seek(0)
+    except BaseException:
+        spooled.close()
+        raise
+    return spooled
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Lit un fichier CSV (avec ligne d'en-tête) ligne par ligne.
+    Les cellules vides sont considérées comme absentes (None).
+    """
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"))
+    for row in reader:
+        yield reader.line_num, {
+            key: (value if value != "" else None)
+            for key, value in row.items()
+            if key in IMPORT_FIELDS
+        }
+
+
+def _ndjson_rows(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Lit un fichier NDJSON (un objet JSON par ligne) ligne par ligne.
+    Une ligne invalide est retournée sous forme d'exception, pour être signalée.
+    """
+    for line_number, line in enumerate(codecs.iterdecode(stream, "utf-8-sig"), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as exc:
+            yield line_number, exc
+
+
+def _error(row: int, detail: str, isbn=None) -> Dict:
+    return {"type": "error", "row": row, "isbn": isbn, "detail": detail}
+
+
+async def _insert_batch(batch: List[Tuple[int, schemas.BookCreate]]) -> Tuple[int, List[Dict]]:
+    """
+    Insère un lot de livres validés en une seule requête
+    INSERT ... ON CONFLICT (isbn) DO NOTHING, puis valide la transaction.
+
+    Returns:
+        Tuple[int, List[Dict]]: Le nombre de livres insérés et les erreurs
+            des lignes ignorées (ISBN déjà présent dans la base).
+    """
+    statement = (
+        pg_insert(models.Book)
+        .values([
+            {
+                "title": book.title,
+                "author": book.author,
+                "isbn": book.isbn,
+                "publisher": book.publisher,
+                "publication_date": book.publication_date,
+                "number_of_copies": book.number_of_copies,
+                "available_copies": book.number_of_copies,
+            }
+            for _, book in batch
+        ])
+        .on_conflict_do_nothing(index_elements=["isbn"])
+        .returning(models.Book.id, models.Book.isbn)
+    )
+    async with SessionLocal() as db:
+        result = await db.execute(statement)
+        inserted = result.all()
+        await db.commit()
+
+    if inserted:
+        await catalog_cache.invalidate_books([], lists=True)
+    inserted_isbns = {row.isbn for row in inserted}
+    errors = [
+        _error(line, "ISBN already exists", book.isbn)
+        for line, book in batch
+        if book.isbn not in inserted_isbns
+    ]
+    return len(inserted), errors
+
+
+async def import_books(stream: BinaryIO, file_format: str, batch_size: int) -> AsyncIterator[str]:
+    """
+    Importe des livres depuis un fichier CSV ou NDJSON, par lots.
+
+    Le fichier est lu et validé (schemas.BookCreate) lot par lot : la mémoire
+    utilisée dépend de la taille d'un lot, pas de celle du fichier. Chaque lot
+    est inséré et validé dans sa propre transaction. La taille d'un lot est
+    limitée à MAX_BATCH_SIZE lignes (paramètres d'une requête).  L'index
+    d'autocomplétion est reconstruit une seule fois, à la fin de l'import
+    (hors de la boucle d'événements), plutôt que mis à jour livre par livre.
+
+    Yields:
+        str: Les lignes NDJSON du rapport : une ligne "error" par ligne rejetée,
+            une ligne "progress" par lot, puis une ligne "summary".
+    """
+    if batch_size > MAX_BATCH_SIZE:
+        logger.warning(
+            "Bulk import batch size %d exceeds the query parameter limit, using %d",
+            batch_size, MAX_BATCH_SIZE,
+        )
+        batch_size = MAX_BATCH_SIZE
+    rows = _csv_rows(stream) if file_format == "csv" else _ndjson_rows(stream)
+    processed = inserted = rejected = 0
+
+    while True:
+        # La lecture du fichier (éventuellement sur disque) est faite hors de
+        # la boucle d'événements.
+        chunk = await asyncio.to_thread(list, itertools.islice(rows, batch_size))
+        if not chunk:
+            break
+
+        errors, valid, seen_isbns = [], [], set()
+        for line, data in chunk:
+            if isinstance(data, Exception):
+                errors.append(_error(line, f"Invalid JSON: {data}"))
+                continue
+            try:
+                book = schemas.BookCreate(**data)
+            except (ValidationError, TypeError) as exc:
+                detail = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in exc.errors()
+                ) if isinstance(exc, ValidationError) else str(exc)
+                isbn = data.get("isbn") if isinstance(data, dict) else None
+                errors.append(_error(line, detail, isbn))
+                continue
+            # Déduplication des ISBN à l'intérieur du lot ; les doublons avec la
+            # base ou les lots précédents sont écartés par ON CONFLICT.
+            if book.isbn in seen_isbns:
+                errors.append(_error(line, "Duplicate ISBN in file", book.isbn))
+                continue
+            seen_isbns.add(book.isbn)
+            valid.append((line, book))
+
+        if valid:
+            batch_inserted, conflicts = await _insert_batch(valid)
+            inserted += batch_inserted
+            errors.extend(conflicts)
+
+        processed += len(chunk)
+        rejected += len(errors)
+        for error in sorted(errors, key=lambda error: error["row"]):
+            yield json.dumps(error) + "\n"
+        yield json.dumps(
+            {"type": "progress", "processed": processed, "inserted": inserted, "rejected": rejected}
+        ) + "\n"
+
+    if inserted:
+        try:
+            await suggest_service.rebuild()
+        except Exception:
+            # Les livres importés seront indexés par la reconstruction périodique
+            logger.exception("Suggest index rebuild after bulk import failed")
+    logger.info("Bulk import finished: %d rows, %d inserted, %d rejected", processed, inserted, rejected)
+    yield json.dumps(
+        {"type": "summary", "processed": processed, "inserted": inserted, "rejected": rejected}
+    ) + "\n"
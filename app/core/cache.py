@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache en mémoire borné (éviction LRU) avec une durée de vie par entrée.
+
+    Prévu pour être utilisé depuis la boucle d'événements : les opérations
+    sont synchrones et ne nécessitent pas de verrou.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        """
+        Args:
+            maxsize (int): Nombre maximal d'entrées (0 désactive le cache).
+            ttl (float): Durée de vie par défaut des entrées, en secondes.
+            on_evict (Callable, optional): Appelée avec (clé, valeur) pour chaque
+                entrée évincée (expirée ou la moins récemment utilisée).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retourne la valeur associée à la clé, ou None si elle est absente ou expirée.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Enregistre une valeur. Si le cache est plein, l'entrée la moins
+        récemment utilisée est évincée.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted_key, (evicted, _) = self._data.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """
+        Supprime une entrée si elle existe.
+
+        Returns:
+            La valeur supprimée, ou None si la clé était absente.
+        """
+        entry = self._data.pop(key, None)
+        return None if entry is None else entry[0]
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Supprime toutes les entrées pour lesquelles predicate(clé, valeur) est vrai.
+
+        Returns:
+            int: Le nombre d'entrées supprimées.
+        """
+        keys = [key for key, (value, _) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Retourne les compteurs du cache (hits, misses, taille, taux de succès).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
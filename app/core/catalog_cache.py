@@ -0,0 +1,300 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Étiquette des pages de GET /books : leur composition change à chaque création
+# ou suppression de livre, et à chaque modification d'un champ filtré ou trié.
+BOOK_LIST_TAG = "books"
+
+
+def book_tag(book_id: int) -> str:
+    """
+    Retourne l'étiquette des entrées qui représentent un livre (détail et pages).
+    """
+    return f"book:{book_id}"
+
+
+class MemoryCacheBackend:
+    """
+    Stockage propre au worker : cache LRU borné (TTLCache) et index des
+    étiquettes vers les clés, pour invalider exactement les entrées concernées.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl, on_evict=self._forget)
+        self._tags: Dict[str, Set[str]] = {}
+
+    def _forget(self, key: str, entry: Tuple[Any, Tuple[str, ...]]) -> None:
+        # Retire une entrée supprimée ou évincée de l'index des étiquettes
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._cache.get(key)
+        return None if entry is None else entry[0]
+
+    async def snapshot(self) -> None:
+        # Les invalidations de ce stockage sont celles du worker, suivies par
+        # CatalogCache.generation()
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float, tags: List[str], snapshot: None) -> None:
+        if self._cache.maxsize <= 0:
+            return
+        previous = self._cache.pop(key)
+        if previous is not None:
+            self._forget(key, previous)
+        self._cache.set(key, (value, tuple(tags)), ttl)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+    async def invalidate(self, tags: List[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                entry = self._cache.pop(key)
+                if entry is not None:
+                    self._forget(key, entry)
+
+
+class SharedCacheBackend:
+    """
+    Stockage partagé entre les workers, sur un serveur clé-valeur.
+
+    Le client doit fournir les méthodes asynchrones get, set(ex=), mget et
+    incr de redis.asyncio.Redis ; tout objet équivalent (par exemple un
+    dictionnaire en mémoire pour les tests locaux) peut le remplacer.
+
+    Chaque étiquette a un numéro de version sur le serveur. Une entrée garde
+    les versions de ses étiquettes au moment de son enregistrement ; elle est
+    périmée dès qu'une de ces versions a été incrémentée par une invalidation.
+
+    Un compteur global (l'époque) est incrémenté par chaque invalidation, avant
+    les versions des étiquettes. Il est relevé avant la lecture de la base
+    (snapshot) : une valeur n'est pas enregistrée s'il a changé depuis, car
+    une écriture d'un autre worker a pu se produire après la lecture.
+    """
+
+    # Le préfixe par défaut porte le format des entrées : il change avec lui, pour
+    # que des workers de versions différentes ne lisent pas les entrées des autres
+    def __init__(self, client, prefix: str = "catalog:v2:"):
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    @property
+    def _epoch_key(self) -> str:
+        return f"{self.prefix}epoch"
+
+    async def _counters(self, keys: List[str]) -> List[int]:
+        if not keys:
+            return []
+        values = await self.client.mget(keys)
+        return [int(value or 0) for value in values]
+
+    async def _versions(self, tags: List[str]) -> List[int]:
+        return await self._counters([self._tag_key(tag) for tag in tags])
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if await self._versions(entry["tags"]) != entry["versions"]:
+            return None
+        return entry["value"]
+
+    async def snapshot(self) -> int:
+        """
+        Retourne l'époque, à relever avant de lire la base puis à passer à set().
+        """
+        [epoch] = await self._counters([self._epoch_key])
+        return epoch
+
+    async def set(self, key: str, value: Any, ttl: float, tags: List[str], snapshot: int) -> None:
+        # Époque et versions sont lues ensemble : si une invalidation a commencé
+        # depuis le relevé, la valeur est ignorée ; si elle commence après cette
+        # lecture, elle incrémente les versions enregistrées et périme l'entrée
+        epoch, *versions = await self._counters(
+            [self._epoch_key] + [self._tag_key(tag) for tag in tags]
+        )
+        if epoch != snapshot:
+            return
+        entry = {"value": value, "tags": tags, "versions": versions}
+        await self.client.set(self.prefix + key, json.dumps(entry), ex=max(1, int(ttl)))
+
+    async def invalidate(self, tags: List[str]) -> None:
+        await self.client.incr(self._epoch_key)
+        await asyncio.gather(*(self.client.incr(self._tag_key(tag)) for tag in tags))
+
+
+class CatalogCache:
+    """
+    Cache des lectures du catalogue (GET /books et GET /books/{id}), commun à
+    tous les utilisateurs.
+
+    Les entrées sont indexées par les paramètres normalisés de la requête et
+    étiquetées par les livres qu'elles représentent (book_tag) et, pour les
+    pages, par BOOK_LIST_TAG. Les écritures invalident exactement les
+    étiquettes concernées. Une erreur du stockage est traitée comme un
+    défaut de cache : la lecture est faite dans la base.
+    """
+
+    def __init__(self, backend, ttl: float, settle_seconds: float = 0.0):
+        """
+        Args:
+            backend: Le stockage (MemoryCacheBackend, SharedCacheBackend), ou None
+                pour désactiver le cache.
+            ttl (float): Durée de vie des entrées, en secondes.
+            settle_seconds (float): Délai après une invalidation pendant lequel
+                aucune valeur n'est enregistrée (retard des réplicas en lecture).
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.settle_seconds = settle_seconds
+        self._invalidated_at = float("-inf")
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.errors = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def key(namespace: str, **params) -> str:
+        """
+        Construit la clé d'une requête : les paramètres absents sont ignorés et
+        les autres triés, pour que deux requêtes équivalentes partagent l'entrée.
+        """
+        return f"{namespace}?" + urlencode(
+            sorted((name, value) for name, value in params.items() if value is not None)
+        )
+
+    async def generation(self) -> Optional[Tuple[int, Any]]:
+        """
+        Retourne l'état des invalidations (celles du worker et, pour un stockage
+        partagé, celles de tous les workers), à relever avant de lire la base
+        puis à passer à set(). Retourne None si le stockage est injoignable :
+        la valeur lue ne sera pas enregistrée.
+        """
+        if self.backend is None:
+            return None
+        generation = self._invalidations
+        try:
+            return generation, await self.backend.snapshot()
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache read failed", exc_info=True)
+            return None
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Retourne la valeur en cache pour la clé, ou None (défaut de cache).
+        """
+        if self.backend is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache read failed", exc_info=True)
+            value = None
+        counter = self.misses if value is None else self.hits
+        counter[namespace] = counter.get(namespace, 0) + 1
+        return value
+
+    async def set(
+        self, key: str, value: Any, tags: List[str], generation: Optional[Tuple[int, Any]]
+    ) -> None:
+        """
+        Enregistre une valeur lue dans la base (données JSON uniquement).
+
+        La valeur est ignorée si une invalidation a eu lieu depuis `generation`
+        (dans ce worker ou, avec un stockage partagé, dans un autre) : elle a pu
+        être lue avant une écriture dont l'invalidation est déjà passée.
+        Elle l'est aussi pendant `settle_seconds` après une invalidation : lue
+        sur un réplica, elle peut ne pas encore contenir l'écriture.
+        """
+        if self.backend is None or generation is None:
+            return
+        invalidations, snapshot = generation
+        if invalidations != self._invalidations:
+            return
+        if time.monotonic() - self._invalidated_at < self.settle_seconds:
+            return
+        try:
+            await self.backend.set(key, value, self.ttl, tags, snapshot)
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache write failed", exc_info=True)
+
+    async def invalidate_books(self, book_ids: Iterable[int], lists: bool = False) -> None:
+        """
+        Invalide les entrées qui représentent les livres donnés et, si `lists`
+        est vrai, toutes les pages de GET /books.
+        À appeler après la validation de la transaction qui les modifie.
+        """
+        self._invalidations += 1
+        self._invalidated_at = time.monotonic()
+        tags = [book_tag(book_id) for book_id in book_ids]
+        if lists:
+            tags.append(BOOK_LIST_TAG)
+        if self.backend is None or not tags:
+            return
+        try:
+            await self.backend.invalidate(tags)
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache invalidation failed", exc_info=True)
+
+    def stats(self) -> dict:
+        """
+        Retourne les compteurs du cache par type de lecture (hits, misses,
+        taux de succès) et le nombre d'erreurs du stockage.
+        """
+        namespaces = {}
+        for namespace in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits.get(namespace, 0), self.misses.get(namespace, 0)
+            namespaces[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "namespaces": namespaces,
+            "errors": self.errors,
+        }
+
+
+def create_catalog_cache() -> CatalogCache:
+    """
+    Construit le cache du catalogue selon la configuration (CATALOG_CACHE_BACKEND).
+    """
+    if settings.CATALOG_CACHE_BACKEND == "redis":
+        # Dépendance optionnelle, nécessaire uniquement pour le cache partagé
+        from redis import asyncio as redis
+
+        backend = SharedCacheBackend(redis.from_url(settings.CATALOG_CACHE_REDIS_URL))
+    elif settings.CATALOG_CACHE_BACKEND == "memory" and settings.CATALOG_CACHE_SIZE > 0:
+        backend = MemoryCacheBackend(settings.CATALOG_CACHE_SIZE, settings.CATALOG_CACHE_TTL_SECONDS)
+    else:
+        backend = None
+    # Avec des réplicas, les lectures qui suivent une écriture peuvent être en retard
+    settle_seconds = settings.DB_REPLICA_MAX_LAG_SECONDS if settings.DATABASE_REPLICA_URLS.strip() else 0.0
+    return CatalogCache(backend, settings.CATALOG_CACHE_TTL_SECONDS, settle_seconds)
+
+
+# Cache du catalogue partagé par l'application
+catalog_cache = create_catalog_cache()
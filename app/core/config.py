@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     """
@@ -20,10 +20,106 @@ class Settings(BaseSettings):
     # Construction de l'URL de la base de données
     #DATABASE_URL: str = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     DATABASE_URL: str = f"postgresql://{DB_USER}:{DB_PASS}@db:{DB_PORT}/{DB_NAME}"
+    # Réplicas en lecture (URLs séparées par des virgules, vide : aucun réplica).
+    # Les lectures sans écriture (GET du catalogue, des membres et des emprunts,
+    # exports) sont réparties entre les réplicas ; les écritures, et les
+    # réponses qui les suivent, restent sur la base principale.
+    DATABASE_REPLICA_URLS: str = ""
+    # Pools de connexions, par moteur (base principale, chaque réplica)
+    DB_POOL_SIZE: int = 5  # Connexions gardées ouvertes
+    DB_MAX_OVERFLOW: int = 10  # Connexions supplémentaires au-delà de la taille du pool
+    DB_REPLICA_POOL_SIZE: int = 10
+    DB_REPLICA_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # Attente maximale d'une connexion libre
+    # Retard de réplication toléré : après une invalidation, le cache du
+    # catalogue n'enregistre pas de lecture pendant ce délai (elle a pu être
+    # faite sur un réplica qui n'a pas encore reçu l'écriture)
+    DB_REPLICA_MAX_LAG_SECONDS: float = 1.0
+    # Serveur de production (python -m app.serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # Nombre de workers (0 : un par CPU disponible)
+    # Développement : un seul processus, rechargé à chaque modification du code
+    SERVER_RELOAD: bool = False
+    # Arrêt : délai laissé aux requêtes en cours (emprunts, retours) et au lot
+    # du passage des emprunts en retard pour se terminer
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # Connexions PostgreSQL disponibles (max_connections du serveur, identique
+    # pour les réplicas) et connexions réservées hors de l'API (migrations,
+    # administration). Le serveur de production réduit les pools de chaque
+    # worker pour que l'ensemble des workers reste dans ce budget.
+    DB_MAX_CONNECTIONS: int = 100
+    DB_RESERVED_CONNECTIONS: int = 10
+    # Démarrage : le worker ne se déclare prêt (/health/ready) qu'après avoir
+    # vérifié que les migrations sont appliquées, ouvert les connexions des
+    # pools et chargé bcrypt. Tant que le schéma n'est pas à jour, la
+    # vérification est refaite après ce délai.
+    WARMUP_RETRY_SECONDS: int = 5
+    READINESS_TIMEOUT_SECONDS: float = 2.0  # Délai de la requête de contrôle de /health/ready
+    # Journalisation (voir app/core/logs.py) : niveau global, niveaux par logger
+    # (JSON, par exemple {"sqlalchemy.engine": "WARNING"}) et format des
+    # enregistrements ("json" ou "text")
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {}
+    LOG_FORMAT: str = "json"
+    # Enregistrements en attente d'écriture ; au-delà, ils sont abandonnés
+    LOG_QUEUE_SIZE: int = 10000
+    # Messages d'information fréquents (lectures, erreurs 4xx) : un sur N est
+    # conservé, par clé d'échantillonnage (par exemple "books.list") ; 1 les
+    # conserve tous
+    LOG_SAMPLE_EVERY: int = 10
+    LOG_SAMPLE_EVERY_BY_KEY: Dict[str, int] = {}
     # Clé secrète pour l'encodage et le décodage des tokens JWT
     JWT_SECRET_KEY: str = "secret"  # À changer en production
     JWT_ALGORITHM: str = "HS256"  # Algorithme utilisé pour l'encodage JWT
     JWT_EXPIRE_MINUTES: int = 60 * 24 * 7  # Durée de validité des tokens (7 jours par défaut)
+    # Hachage des mots de passe (bcrypt)
+    # Coût bcrypt ; les hachages d'un autre coût sont recalculés à la connexion
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # Pool d'exécution du hachage : "thread" ou "process"
+    PASSWORD_HASH_WORKERS: int = 4  # Nombre de workers du pool de hachage
+    # Nombre maximal d'opérations de hachage en cours ou en attente ; au-delà,
+    # les requêtes de connexion/inscription sont rejetées avec un 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # Cache des utilisateurs authentifiés (par token), propre à chaque worker.
+    # La durée de vie borne le délai de prise en compte d'un changement fait
+    # par un autre worker ; 0 désactive le cache.
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # Index d'autocomplétion des titres et auteurs (/books/suggest), en mémoire.
+    # Il est reconstruit périodiquement depuis la base pour intégrer les
+    # modifications faites par les autres workers.
+    SUGGEST_MEMORY_BUDGET_MB: int = 64  # Taille mémoire maximale estimée de l'index
+    SUGGEST_REFRESH_SECONDS: int = 300  # Période de reconstruction (0 : jamais)
+    # Import en masse du catalogue (/books/import) : nombre de lignes par lot
+    # (une requête INSERT et une transaction par lot), limité à 4681 (7
+    # paramètres par ligne, 32767 au plus par requête)
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    # Exports (/books/export, /members/export, /loans/export) : nombre de lignes
+    # lues par aller-retour avec le curseur côté serveur
+    EXPORT_BATCH_SIZE: int = 1000
+    # Emprunts : durée par défaut d'un emprunt (date de retour prévue) et
+    # passage périodique des emprunts dépassés au statut "En retard"
+    LOAN_DURATION_DAYS: int = 14
+    OVERDUE_SWEEP_SECONDS: int = 900  # Période du passage (0 : jamais)
+    OVERDUE_SWEEP_BATCH_SIZE: int = 1000  # Emprunts mis à jour par transaction
+    # Cache des lectures du catalogue (GET /books, GET /books/{id}) :
+    # "memory" (propre à chaque worker), "redis" (partagé entre les workers,
+    # nécessite le paquet redis) ou "none". Les écritures invalident les entrées
+    # concernées ; la durée de vie borne le délai de prise en compte d'une
+    # modification faite par un autre worker avec le cache "memory".
+    CATALOG_CACHE_BACKEND: str = "memory"
+    CATALOG_CACHE_SIZE: int = 10000  # Nombre maximal d'entrées (cache "memory")
+    CATALOG_CACHE_TTL_SECONDS: int = 30
+    CATALOG_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # Métriques Prometheus sur /metrics (latence par route, requêtes en cours,
+    # pools de connexions et de hachage, emprunts). L'endpoint n'est pas
+    # authentifié : à n'exposer qu'au réseau de supervision.
+    METRICS_ENABLED: bool = True
+    # Hors production : nombre et durée des requêtes SQL de chaque requête HTTP
+    # dans les en-têtes X-DB-Queries et X-DB-Time-ms, et avertissement lorsqu'une
+    # même requête SQL est exécutée au moins ce nombre de fois (accès N+1)
+    QUERY_REPEAT_WARNING_THRESHOLD: int = 5
 
     postgres_user: str
     postgres_password: str
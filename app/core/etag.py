@@ -0,0 +1,60 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Calcule un ETag fort à partir des identifiants et versions des lignes
+    qui composent une réponse.
+
+    La colonne "version" de chaque ligne est incrémentée à chaque modification :
+    l'ETag change dès qu'une des lignes représentées change, sans avoir à
+    construire ni à sérialiser la réponse.
+
+    Args:
+        *parts: Les valeurs décrivant la représentation (type, IDs, versions).
+
+    Returns:
+        str: L'ETag, entre guillemets.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Indique si l'en-tête If-None-Match de la requête désigne l'ETag courant
+    (comparaison faible, comme le prévoit la RFC 9110 pour If-None-Match).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Applique un GET conditionnel : retourne une réponse 304 si le client
+    possède déjà la représentation courante, sinon ajoute l'ETag aux
+    en-têtes de la réponse et retourne None.
+
+    Les réponses sont propres à l'utilisateur authentifié (private) et doivent
+    être revalidées à chaque utilisation (no-cache).
+
+    Args:
+        request (Request): La requête HTTP (en-tête If-None-Match).
+        response (Response): La réponse HTTP de l'endpoint (en-têtes déjà définis).
+        etag (str): L'ETag de la représentation courante.
+
+    Returns:
+        Optional[Response]: La réponse 304 à retourner telle quelle, ou None.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
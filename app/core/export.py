@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+import logging
+from datetime import date
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.database import read_session
+
+logger = logging.getLogger(__name__)
+
+# Types de contenu des formats d'export
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def stream_rows(query: Select, file_format: str, batch_size: int) -> AsyncIterator[str]:
+    """
+    Exécute la requête avec un curseur côté serveur et encode les lignes au fil de l'eau.
+
+    La requête est lue par paquets de `batch_size` lignes (yield_per) : la mémoire
+    utilisée dépend de la taille d'un paquet, pas du nombre de lignes exportées.
+    Une session de lecture (réplica) dédiée est ouverte pour toute la durée de
+    l'export, la session de la requête HTTP étant fermée avant l'envoi de la réponse.
+
+    Args:
+        query (Select): La requête (colonnes explicites, dont les noms forment l'en-tête).
+        file_format (str): 'csv' ou 'ndjson'.
+        batch_size (int): Le nombre de lignes lues par aller-retour vers la base.
+
+    Yields:
+        str: Un morceau du fichier exporté (l'en-tête, puis un morceau par paquet).
+    """
+    fields = [column.name for column in query.selected_columns]
+    exported = 0
+    async with read_session() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            yield buffer.getvalue()
+            async for partition in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(partition)
+                exported += len(partition)
+                yield buffer.getvalue()
+        else:
+            async for partition in result.partitions():
+                exported += len(partition)
+                yield "".join(
+                    json.dumps(dict(zip(fields, row)), default=_json_default) + "\n"
+                    for row in partition
+                )
+    logger.info("Exported %d rows (%s)", exported, file_format)
+
+
+def export_response(query: Select, file_format: str, filename: str, batch_size: int) -> StreamingResponse:
+    """
+    Construit la réponse HTTP d'un export (fichier en pièce jointe, envoyé en continu).
+
+    Args:
+        query (Select): La requête des lignes à exporter.
+        file_format (str): 'csv' ou 'ndjson'.
+        filename (str): Le nom du fichier, sans extension.
+        batch_size (int): Le nombre de lignes lues par aller-retour vers la base.
+
+    Returns:
+        StreamingResponse: La réponse dont le corps est produit par stream_rows.
+    """
+    return StreamingResponse(
+        stream_rows(query, file_format, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'},
+    )
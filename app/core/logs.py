@@ -0,0 +1,146 @@
+"""
+Journalisation de l'application : file d'attente, format JSON et échantillonnage.
+
+Les appels au journal ne font qu'ajouter l'enregistrement à une file
+(QueueHandler) : le message est formaté (arguments %-style compris) et écrit
+sur la sortie standard par un thread dédié (QueueListener), hors de la
+boucle d'événements.  Les arguments des messages doivent donc être des
+valeurs simples (chaînes, nombres), pas des objets ORM.
+
+Les messages d'information fréquents (lectures du catalogue, erreurs 4xx)
+portent une clé d'échantillonnage :
+
+    logger.info("Retrieved %d books", count, extra={"sample": "books.list"})
+
+Seul un enregistrement sur LOG_SAMPLE_EVERY (ou LOG_SAMPLE_EVERY_BY_KEY[clé])
+est conservé par clé ; il indique le taux dans le champ "sampled_every".
+Les avertissements et erreurs ne sont jamais échantillonnés.
+"""
+import atexit
+import itertools
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# Attributs propres à LogRecord : les autres viennent de `extra` et sont
+# ajoutés tels quels à l'enregistrement JSON
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {
+    "message", "asctime", "taskName", "sample", "color_message",
+}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formate chaque enregistrement en un objet JSON sur une ligne.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Ne conserve qu'un enregistrement sur N parmi ceux qui portent la même clé
+    d'échantillonnage (attribut `sample`) et un niveau inférieur à WARNING.
+    """
+
+    def __init__(self, every: int, every_by_key: Dict[str, int]):
+        super().__init__()
+        self.every = every
+        self.every_by_key = every_by_key
+        self.counters: Dict[str, itertools.count] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+        every = self.every_by_key.get(key, self.every)
+        if every <= 1:
+            return True
+        counter = self.counters.setdefault(key, itertools.count())
+        if next(counter) % every:
+            return False
+        record.sampled_every = every
+        return True
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler qui transmet l'enregistrement sans le formater et qui, si la
+    file est pleine (sortie bloquée), l'abandonne au lieu de bloquer l'appelant.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # L'enregistrement reste dans le processus : le formatage est laissé
+        # au thread du QueueListener
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "Log queue full: %d records dropped",
+                    "args": (self.dropped,),
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging() -> None:
+    """
+    Installe la file de journalisation sur le logger racine et démarre le
+    thread d'écriture (une seule fois par processus), puis applique les
+    niveaux LOG_LEVEL et LOG_LEVELS.
+    """
+    global _listener
+    if _listener is None:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if settings.LOG_FORMAT == "json":
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s"))
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        queue_handler = AsyncQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_EVERY, settings.LOG_SAMPLE_EVERY_BY_KEY))
+
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        # Écrit les enregistrements restants à la sortie du processus
+        atexit.register(_listener.stop)
+
+    logging.getLogger().setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
@@ -0,0 +1,155 @@
+import time
+from typing import Callable, Dict
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Métriques applicatives exposées sur /metrics (avec celles de starlette_exporter :
+# latence par route, requêtes en cours). Elles sont propres à chaque worker.
+
+# Emprunts créés et retournés (y compris par les opérations groupées)
+LOANS_CREATED = Counter("library_loans_created_total", "Loans created")
+LOANS_RETURNED = Counter("library_loans_returned_total", "Loans returned")
+
+# Temps d'attente pour obtenir une connexion du pool (création comprise)
+DB_POOL_WAIT = Histogram(
+    "library_db_pool_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+def instrumented_pool_class(name: str) -> type:
+    """
+    Retourne une classe de pool (AsyncAdaptedQueuePool) qui mesure le temps
+    d'attente de chaque connexion dans DB_POOL_WAIT, avec le libellé `name`.
+
+    Le nom est porté par la classe : il est conservé lorsque le pool est
+    recréé (engine.dispose()).
+    """
+
+    class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                DB_POOL_WAIT.labels(name).observe(time.perf_counter() - started)
+
+    # Le journal du pool est nommé d'après le module de sa classe : celui de
+    # SQLAlchemy, pour en garder le niveau (pas de messages INFO à chaque dispose())
+    InstrumentedAsyncQueuePool.__module__ = AsyncAdaptedQueuePool.__module__
+    return InstrumentedAsyncQueuePool
+
+
+class PoolCollector:
+    """
+    Lit l'état des pools de connexions à chaque collecte (connexions prêtées,
+    inactives, en débordement, taille configurée).
+    """
+
+    def __init__(self, engines: Dict[str, object]):
+        """
+        Args:
+            engines (Dict[str, AsyncEngine]): Les moteurs, par nom de pool.
+        """
+        self.engines = engines
+
+    def collect(self):
+        checked_out = GaugeMetricFamily(
+            "library_db_pool_checked_out", "Connections currently checked out", labels=["pool"]
+        )
+        idle = GaugeMetricFamily(
+            "library_db_pool_idle", "Idle connections in the pool", labels=["pool"]
+        )
+        overflow = GaugeMetricFamily(
+            "library_db_pool_overflow", "Connections open beyond the pool size", labels=["pool"]
+        )
+        size = GaugeMetricFamily("library_db_pool_size", "Configured pool size", labels=["pool"])
+        for name, engine in self.engines.items():
+            pool = engine.sync_engine.pool
+            checked_out.add_metric([name], pool.checkedout())
+            idle.add_metric([name], pool.checkedin())
+            # overflow() est négatif tant que le pool n'est pas plein
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            size.add_metric([name], pool.size())
+        return [checked_out, idle, overflow, size]
+
+
+class CatalogCacheCollector:
+    """
+    Expose les compteurs du cache du catalogue (succès et défauts par type de lecture).
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def collect(self):
+        hits = CounterMetricFamily(
+            "library_catalog_cache_hits", "Catalog cache hits", labels=["namespace"]
+        )
+        misses = CounterMetricFamily(
+            "library_catalog_cache_misses", "Catalog cache misses", labels=["namespace"]
+        )
+        for namespace, count in self.cache.hits.items():
+            hits.add_metric([namespace], count)
+        for namespace, count in self.cache.misses.items():
+            misses.add_metric([namespace], count)
+        errors = CounterMetricFamily("library_catalog_cache_errors", "Catalog cache backend errors")
+        errors.add_metric([], self.cache.errors)
+        return [hits, misses, errors]
+
+
+class PrincipalCacheCollector:
+    """
+    Expose les compteurs du cache des utilisateurs authentifiés (succès,
+    défauts, nombre d'entrées).
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def collect(self):
+        stats = self.cache.stats()
+        hits = CounterMetricFamily("library_principal_cache_hits", "Principal cache hits")
+        hits.add_metric([], stats["hits"])
+        misses = CounterMetricFamily("library_principal_cache_misses", "Principal cache misses")
+        misses.add_metric([], stats["misses"])
+        size = GaugeMetricFamily("library_principal_cache_size", "Principal cache entries")
+        size.add_metric([], stats["size"])
+        return [hits, misses, size]
+
+
+def register_collectors(
+    engines: Dict[str, object], password_hasher, catalog_cache, principal_cache
+) -> None:
+    """
+    Enregistre les métriques lues à la collecte : pools de connexions, file
+    du pool de hachage bcrypt, cache du catalogue, cache des utilisateurs
+    authentifiés.
+
+    Args:
+        engines (Dict[str, AsyncEngine]): Les moteurs de base de données, par nom.
+        password_hasher (PasswordHasher): Le pool de hachage des mots de passe.
+        catalog_cache (CatalogCache): Le cache du catalogue.
+        principal_cache (TTLCache): Le cache des utilisateurs authentifiés.
+    """
+    REGISTRY.register(PoolCollector(engines))
+    REGISTRY.register(CatalogCacheCollector(catalog_cache))
+    REGISTRY.register(PrincipalCacheCollector(principal_cache))
+    _gauge(
+        "library_password_hash_pending",
+        "Password hash operations running or queued",
+        lambda: password_hasher.pending,
+    )
+    _gauge(
+        "library_password_hash_queued",
+        "Password hash operations waiting for a worker",
+        lambda: max(password_hasher.pending - password_hasher.workers, 0),
+    )
+
+
+def _gauge(name: str, documentation: str, function: Callable[[], float]) -> None:
+    Gauge(name, documentation).set_function(function)
@@ -0,0 +1,172 @@
+"""
+Migrations versionnées du schéma de la base de données.
+
+Les fichiers migrations/NNNN_description.sql sont appliqués dans l'ordre de
+leur numéro, chacun dans sa propre transaction, et enregistrés dans la table
+schema_migrations.  Les migrations sont exécutées hors des processus de
+l'API (avant le déploiement) ; au démarrage, l'API vérifie seulement que le
+schéma est à jour avant de se déclarer prête (/health/ready).
+
+Plusieurs exécutions simultanées sont sérialisées par un verrou consultatif.
+
+Exemple:
+    python -m app.core.migrations            # applique les migrations en attente
+    python -m app.core.migrations --status   # liste les migrations et leur état
+"""
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Répertoire des fichiers de migration (à la racine du dépôt)
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+# Identifiant du verrou consultatif PostgreSQL pris pendant les migrations
+MIGRATION_LOCK_ID = 7_104_001
+
+CREATE_MIGRATIONS_TABLE = text(
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    " version VARCHAR PRIMARY KEY,"
+    " name VARCHAR NOT NULL,"
+    " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+)
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Tuple[str, Path]]:
+    """
+    Retourne les migrations du répertoire, triées par version.
+
+    Returns:
+        List[Tuple[str, Path]]: Les couples (version, fichier), la version étant
+            le préfixe numérique du nom du fichier ("0003" pour 0003_loans_surrogate_id.sql).
+    """
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        version = path.name.split("_", 1)[0]
+        if not version.isdigit():
+            raise ValueError(f"Migration file name must start with its version: {path.name}")
+        migrations.append((version, path))
+    versions = [version for version, _ in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+async def applied_versions(connection: AsyncConnection) -> Set[str]:
+    """
+    Retourne les versions déjà appliquées (ensemble vide si la table
+    schema_migrations n'existe pas encore).
+    """
+    exists = await connection.scalar(text("SELECT to_regclass('schema_migrations') IS NOT NULL"))
+    if not exists:
+        return set()
+    result = await connection.execute(text("SELECT version FROM schema_migrations"))
+    return set(result.scalars())
+
+
+async def pending_migrations(connection: AsyncConnection, directory: Path = MIGRATIONS_DIR) -> List[str]:
+    """
+    Retourne les noms des fichiers de migration qui n'ont pas été appliqués.
+    """
+    applied = await applied_versions(connection)
+    return [path.name for version, path in discover_migrations(directory) if version not in applied]
+
+
+async def migrate(database_url: str, directory: Path = MIGRATIONS_DIR) -> List[str]:
+    """
+    Applique les migrations en attente, dans l'ordre.
+
+    Chaque migration et son enregistrement dans schema_migrations sont faits
+    dans la même transaction : une migration qui échoue n'est pas enregistrée
+    et arrête l'exécution.
+
+    Args:
+        database_url (str): L'URL de la base de données (pilote asyncpg).
+        directory (Path, optional): Le répertoire des fichiers de migration.
+
+    Returns:
+        List[str]: Les noms des fichiers appliqués.
+    """
+    migrations = discover_migrations(directory)
+    db_engine = create_async_engine(database_url, poolclass=NullPool)
+    applied_now = []
+    try:
+        async with db_engine.connect() as connection:
+            # Verrou de session (conservé après le commit) : une seule exécution à la fois
+            await connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            await connection.commit()
+            try:
+                await connection.execute(CREATE_MIGRATIONS_TABLE)
+                applied = await applied_versions(connection)
+                await connection.commit()
+                for version, path in migrations:
+                    if version in applied:
+                        continue
+                    logger.info("Applying migration %s", path.name)
+                    async with connection.begin():
+                        # L'enregistrement ouvre la transaction du pilote, dans laquelle
+                        # le fichier est ensuite exécuté
+                        await connection.execute(
+                            text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                            {"version": version, "name": path.name},
+                        )
+                        # Les fichiers contiennent plusieurs instructions (et des blocs
+                        # DO) : ils sont exécutés tels quels par asyncpg, sans préparation
+                        raw_connection = await connection.get_raw_connection()
+                        await raw_connection.driver_connection.execute(path.read_text(encoding="utf-8"))
+                    applied_now.append(path.name)
+            finally:
+                await connection.rollback()
+                await connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                await connection.commit()
+    finally:
+        await db_engine.dispose()
+    return applied_now
+
+
+async def status(database_url: str, directory: Path = MIGRATIONS_DIR) -> None:
+    """
+    Affiche l'état (appliquée ou en attente) de chaque migration.
+    """
+    db_engine = create_async_engine(database_url, poolclass=NullPool)
+    try:
+        async with db_engine.connect() as connection:
+            applied = await applied_versions(connection)
+    finally:
+        await db_engine.dispose()
+    for version, path in discover_migrations(directory):
+        print(f"{'applied' if version in applied else 'pending':<8} {path.name}")
+
+
+def main() -> None:
+    # Import local : app.database crée les moteurs de l'application
+    from app.database import async_url
+
+    parser = argparse.ArgumentParser(description="Apply versioned database schema migrations.")
+    parser.add_argument("--status", action="store_true", help="Liste les migrations et leur état")
+    parser.add_argument("--directory", type=Path, default=MIGRATIONS_DIR, help="Répertoire des migrations")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = async_url(settings.DATABASE_URL)
+    if args.status:
+        asyncio.run(status(database_url, args.directory))
+        return
+    applied = asyncio.run(migrate(database_url, args.directory))
+    if applied:
+        logger.info("%d migration(s) applied", len(applied))
+    else:
+        logger.info("Database schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
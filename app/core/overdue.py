@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import select
+
+from app import models
+from app.core.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def due_date_for(loan_date: date) -> date:
+    """
+    Retourne la date de retour prévue d'un emprunt commencé à loan_date
+    (politique par défaut : LOAN_DURATION_DAYS jours).
+    """
+    return loan_date + timedelta(days=settings.LOAN_DURATION_DAYS)
+
+
+async def mark_overdue_loans(
+    batch_size: int, today: Optional[date] = None, stop: Optional[asyncio.Event] = None
+) -> int:
+    """
+    Passe au statut "En retard" les emprunts en cours dont la date de retour
+    prévue est dépassée.
+
+    Les emprunts sont traités par lots de `batch_size`, chacun dans sa propre
+    transaction, en parcourant l'index partiel des emprunts en cours.  Les
+    lignes verrouillées (retour en cours, autre worker) sont ignorées
+    (SKIP LOCKED) et traitées au passage suivant.  Si `stop` est levé (arrêt
+    du worker), le passage s'arrête après le lot en cours, une fois validé.
+
+    Returns:
+        int: Le nombre d'emprunts passés en retard.
+    """
+    loans = models.loan_association_table
+    today = today or date.today()
+    marked = 0
+    while True:
+        batch = (
+            select(loans.c.id)
+            .where(
+                loans.c.status == "En cours",
+                loans.c.due_date < today,
+                loans.c.return_date.is_(None),
+            )
+            .order_by(loans.c.due_date)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with SessionLocal() as db:
+            result = await db.execute(
+                loans.update()
+                .where(loans.c.id.in_(batch.scalar_subquery()))
+                .values(status="En retard", version=loans.c.version + 1)
+                .returning(loans.c.id)
+            )
+            count = len(result.all())
+            await db.commit()
+        marked += count
+        if count < batch_size or (stop is not None and stop.is_set()):
+            return marked
+
+
+async def sweep_periodically(interval_seconds: int, batch_size: int, stop: asyncio.Event) -> None:
+    """
+    Met à jour les emprunts en retard au démarrage, puis toutes les
+    `interval_seconds` secondes, jusqu'à ce que `stop` soit levé : le lot en
+    cours est alors terminé (et validé) avant le retour.
+    """
+    while not stop.is_set():
+        try:
+            marked = await mark_overdue_loans(batch_size, stop=stop)
+            if marked:
+                logger.info("Overdue sweep: %d loans marked as overdue", marked)
+        except Exception:
+            logger.exception("Overdue sweep failed")
+        try:
+            await asyncio.wait_for(stop.wait(), interval_seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,143 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import Date, and_, false, or_, tuple_
+
+
+def encode_cursor(sort_key: str, values: Sequence[Any]) -> str:
+    """
+    Encode la position d'une ligne (valeurs des colonnes de tri) en un curseur opaque.
+
+    Args:
+        sort_key (str): Identifiant du tri utilisé (par exemple "title:asc").
+        values (Sequence): Les valeurs des colonnes de tri de la dernière ligne.
+
+    Returns:
+        str: Le curseur, encodé en base64 compatible URL.
+    """
+    payload = {
+        "s": sort_key,
+        "v": [value.isoformat() if isinstance(value, date) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, columns: Sequence) -> List[Any]:
+    """
+    Décode un curseur produit par encode_cursor pour le tri donné.
+
+    Args:
+        cursor (str): Le curseur reçu dans le paramètre "after".
+        sort_key (str): Identifiant du tri de la requête courante.
+        columns (Sequence): Les colonnes de tri, pour reconvertir les valeurs.
+
+    Returns:
+        List: Les valeurs des colonnes de tri.
+
+    Raises:
+        HTTPException: Si le curseur est invalide ou a été produit pour un autre tri.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+        if payload["s"] != sort_key or len(values) != len(columns):
+            raise ValueError("cursor does not match the requested sort")
+        return [
+            date.fromisoformat(value)
+            if value is not None and isinstance(column.expression.type, Date)
+            else value
+            for column, value in zip(columns, values)
+        ]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def _keyset_or_condition(columns: Sequence, values: Sequence[Any], descending: bool):
+    """
+    Condition "après la ligne (values)" développée colonne par colonne, pour
+    les curseurs qui contiennent une valeur nulle (ordre par défaut de
+    PostgreSQL : NULLS LAST en ordre croissant, NULLS FIRST en décroissant).
+    Elle n'est pas exploitable comme borne d'un parcours d'index.
+    """
+    condition = false()
+    for column, value in reversed(list(zip(columns, values))):
+        if value is None:
+            after = column.isnot(None) if descending else false()
+            equal = column.is_(None)
+        else:
+            after = column < value if descending else or_(column > value, column.is_(None))
+            equal = column == value
+        condition = or_(after, and_(equal, condition))
+    return condition
+
+
+def keyset_segments(columns: Sequence, values: Sequence[Any], descending: bool = False) -> list:
+    """
+    Construit les conditions qui sélectionnent, dans l'ordre du tri, les lignes
+    situées après la ligne (values). Les lignes de la page sont celles de la
+    première condition, complétées au besoin par celles des suivantes.
+
+    Lorsque le curseur ne contient pas de valeur nulle, chaque condition est
+    une comparaison de tuples, bornée par l'index composite des colonnes :
+
+    - en ordre décroissant (NULLS FIRST), les lignes nulles précèdent le
+      curseur : la comparaison de tuples suffit ;
+    - en ordre croissant (NULLS LAST), la première colonne de tri peut être
+      nulle : les lignes nulles, placées après toutes les autres, forment une
+      seconde condition (elles ne satisfont pas la comparaison de tuples).
+
+    Seule la première colonne de tri peut être nulle (les suivantes, dont
+    l'ID, ne le sont pas). Un curseur qui contient une valeur nulle (page
+    dans les lignes nulles) utilise la condition développée colonne par
+    colonne.
+
+    Args:
+        columns (Sequence): Les colonnes de tri, la dernière étant unique (ID).
+        values (Sequence): Les valeurs de ces colonnes pour la dernière ligne vue.
+        descending (bool): True si le tri est décroissant.
+
+    Returns:
+        list: Les conditions à appliquer tour à tour à la clause WHERE.
+    """
+    if None in values:
+        return [_keyset_or_condition(columns, values, descending)]
+    if descending:
+        return [tuple_(*columns) < tuple_(*values)]
+    segments = [tuple_(*columns) > tuple_(*values)]
+    if columns[0].expression.nullable:
+        segments.append(columns[0].is_(None))
+    return segments
+
+
+def keyset_condition(columns: Sequence, values: Sequence[Any], descending: bool = False):
+    """
+    Construit la condition "après la ligne (values)" pour un tri sur columns,
+    en une seule clause (voir keyset_segments).
+
+    Pour un tri croissant sur une colonne pouvant être nulle, cette clause
+    n'est pas bornée par l'index : les pages de ces tris utilisent
+    keyset_segments.
+
+    Returns:
+        ColumnElement: La condition à ajouter à la clause WHERE.
+    """
+    segments = keyset_segments(columns, values, descending)
+    return segments[0] if len(segments) == 1 else or_(*segments)
+
+
+def set_next_cursor(request: Request, response: Response, cursor: str) -> None:
+    """
+    Expose le curseur de la page suivante dans les en-têtes de la réponse
+    (X-Next-Cursor et Link rel="next").
+    """
+    next_url = request.url.remove_query_params("skip").include_query_params(after=cursor)
+    response.headers["X-Next-Cursor"] = cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -0,0 +1,106 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Nombre, durée et texte des requêtes SQL exécutées pendant une requête HTTP.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # En secondes
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int):
+        """
+        Retourne les requêtes exécutées au moins `threshold` fois, avec leur
+        nombre d'exécutions (signe d'un accès N+1).
+        """
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+# Statistiques de la requête HTTP en cours (None hors d'une requête)
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Enregistre sur le moteur (synchrone, engine.sync_engine pour un moteur
+    asynchrone) les événements qui comptent et chronomètrent les requêtes
+    dans les statistiques de la requête HTTP en cours.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None and conn.info.get("query_started"):
+            stats.record(statement, time.perf_counter() - conn.info["query_started"].pop())
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI qui mesure les requêtes SQL de chaque requête HTTP.
+
+    Les compteurs sont ajoutés aux en-têtes de la réponse (X-DB-Queries,
+    X-DB-Time-ms : requêtes exécutées avant l'envoi des en-têtes), et un
+    avertissement est journalisé lorsqu'une même requête est exécutée au
+    moins `repeat_threshold` fois.
+    """
+
+    def __init__(self, app, repeat_threshold: int):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.duration * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            for statement, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "Possible N+1 query: %d executions of the same statement in %s %s: %s",
+                    count, scope["method"], scope["path"], " ".join(statement.split())[:200],
+                )
+
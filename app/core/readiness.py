@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.migrations import pending_migrations
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    État de démarrage du worker, exposé par /health/ready.
+
+    Le worker n'est prêt qu'après la préparation (warm_up) : schéma à jour,
+    connexions des pools ouvertes, pool bcrypt démarré, index d'autocomplétion
+    construit. Il cesse de l'être au début de l'arrêt, pour que l'orchestrateur
+    ne lui envoie plus de trafic.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.detail = "starting"
+
+    async def warm_up(self, engines: Dict[str, object], password_hasher, suggest_service,
+                      retry_seconds: int) -> None:
+        """
+        Prépare le worker puis le déclare prêt. Tant que des migrations sont en
+        attente (ou que la préparation échoue, base injoignable par exemple),
+        elle est refaite toutes les `retry_seconds` secondes.
+
+        Args:
+            engines (Dict[str, AsyncEngine]): Les moteurs, par nom de pool.
+            password_hasher (PasswordHasher): Le pool de hachage des mots de passe.
+            suggest_service (SuggestService): L'index d'autocomplétion.
+            retry_seconds (int): Délai entre deux vérifications du schéma.
+        """
+        while True:
+            try:
+                async with engines["primary"].connect() as connection:
+                    pending = await pending_migrations(connection)
+                if not pending:
+                    self.detail = "warming up"
+                    await asyncio.gather(
+                        *(self._open_connections(engine) for engine in engines.values()),
+                        password_hasher.warm_up(),
+                    )
+                    await suggest_service.rebuild()
+                    break
+                self.detail = f"pending migrations: {', '.join(pending)}"
+            except Exception as e:
+                self.detail = f"warm-up failed: {e!r}"
+            logger.warning("Worker not ready (%s), retrying in %ds", self.detail, retry_seconds)
+            await asyncio.sleep(retry_seconds)
+        self.ready, self.detail = True, "ready"
+        logger.info("Worker warmed up and ready to serve traffic.")
+
+    @staticmethod
+    async def _open_connections(engine) -> None:
+        # Autant de connexions que la taille du pool, tenues ensemble puis
+        # rendues au pool, qui les garde ouvertes
+        async with AsyncExitStack() as stack:
+            connections = await asyncio.gather(
+                *(stack.enter_async_context(engine.connect()) for _ in range(engine.sync_engine.pool.size()))
+            )
+            for connection in connections:
+                await connection.execute(text("SELECT 1"))
+
+    async def check(self, engine, timeout: float) -> Optional[str]:
+        """
+        Vérifie que le worker peut servir des requêtes.
+
+        Returns:
+            Optional[str]: None si le worker est prêt, sinon la raison.
+        """
+        if not self.ready:
+            return self.detail
+        try:
+            await asyncio.wait_for(self._ping(engine), timeout)
+        except Exception as e:
+            return f"database unavailable: {e!r}"
+        return None
+
+    @staticmethod
+    async def _ping(engine) -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+
+# État de démarrage du worker
+readiness = Readiness()
@@ -0,0 +1,256 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app import models
+from app.core.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Coût mémoire estimé d'une clé de l'index, en plus de ses caractères
+# (chaîne Python, entrées des listes parallèles).
+_ENTRY_OVERHEAD_BYTES = 120
+# Nombre maximal de suffixes indexés par texte (un par début de mot).
+_MAX_WORDS_PER_TEXT = 8
+
+
+def normalize(value: str) -> str:
+    """
+    Normalise un texte pour la recherche par préfixe : sans accents,
+    insensible à la casse, espaces réduits.
+    """
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def _keys_for(text: Optional[str]) -> List[str]:
+    """
+    Retourne les clés indexées pour un texte : le texte complet et chacun de
+    ses suffixes commençant à un mot (« misera » trouve « Les Misérables »).
+    """
+    if not text:
+        return []
+    words = normalize(text).split(" ")[:_MAX_WORDS_PER_TEXT]
+    return [" ".join(words[start:]) for start in range(len(words)) if words[start]]
+
+
+class PrefixIndex:
+    """
+    Index de préfixes en mémoire sur les titres et auteurs des livres.
+
+    Les clés normalisées sont conservées dans une liste triée (avec la liste
+    parallèle des IDs de livres) : une recherche est une dichotomie suivie
+    d'un parcours des clés qui commencent par le préfixe.
+
+    Cette liste de base n'est construite que par bulk_load : les livres
+    ajoutés ou modifiés ensuite sont placés dans un petit index delta, trié
+    lui aussi, et les entrées de base des livres modifiés ou supprimés sont
+    masquées. Les recherches parcourent les deux index ; le delta est fusionné
+    dans la base lors de la reconstruction périodique (SuggestService.rebuild).
+    """
+
+    def __init__(self, memory_budget_bytes: int):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.memory_bytes = 0
+        self.truncated = False
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        self._delta_keys: List[str] = []
+        self._delta_ids: List[int] = []
+        # Livres dont les entrées de la liste de base ne sont plus valides
+        self._stale: Set[int] = set()
+        self._books: Dict[int, Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    @property
+    def delta_size(self) -> int:
+        """
+        Nombre de clés ajoutées depuis la construction de la liste de base.
+        """
+        return len(self._delta_keys)
+
+    def add(self, book_id: int, title: str, author: str) -> None:
+        """
+        Ajoute un livre à l'index (ou remplace son entrée existante).
+        """
+        if book_id in self._books:
+            self.remove(book_id)
+        keys = _keys_for(title) + _keys_for(author)
+        cost = sum(len(key) + _ENTRY_OVERHEAD_BYTES for key in keys)
+        if self.memory_bytes + cost > self.memory_budget_bytes:
+            if not self.truncated:
+                logger.warning("Suggest index memory budget reached, new books are not indexed")
+            self.truncated = True
+            return
+        self._books[book_id] = (title, author)
+        self.memory_bytes += cost
+        for key in keys:
+            position = bisect.bisect_left(self._delta_keys, key)
+            self._delta_keys.insert(position, key)
+            self._delta_ids.insert(position, book_id)
+
+    def remove(self, book_id: int) -> None:
+        """
+        Retire un livre de l'index s'il y figure.
+        """
+        entry = self._books.pop(book_id, None)
+        if entry is None:
+            return
+        self._stale.add(book_id)
+        for key in _keys_for(entry[0]) + _keys_for(entry[1]):
+            self.memory_bytes -= len(key) + _ENTRY_OVERHEAD_BYTES
+            position = bisect.bisect_left(self._delta_keys, key)
+            while position < len(self._delta_keys) and self._delta_keys[position] == key:
+                if self._delta_ids[position] == book_id:
+                    del self._delta_keys[position]
+                    del self._delta_ids[position]
+                    break
+                position += 1
+
+    def bulk_load(self, rows: Iterable[Tuple[int, str, str]]) -> None:
+        """
+        Remplit un index vide en une seule passe (tri unique au lieu
+        d'insertions successives).
+        """
+        pairs = []
+        for book_id, title, author in rows:
+            keys = _keys_for(title) + _keys_for(author)
+            cost = sum(len(key) + _ENTRY_OVERHEAD_BYTES for key in keys)
+            if self.memory_bytes + cost > self.memory_budget_bytes:
+                self.truncated = True
+                break
+            self._books[book_id] = (title, author)
+            self.memory_bytes += cost
+            pairs.extend((key, book_id) for key in keys)
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._ids = [book_id for _, book_id in pairs]
+        if self.truncated:
+            logger.warning(
+                "Suggest index memory budget reached: %d books indexed", len(self._books)
+            )
+
+    @staticmethod
+    def _matches(keys: List[str], ids: List[int], prefix: str) -> Iterator[Tuple[str, int]]:
+        """
+        Parcourt, dans l'ordre, les entrées d'une liste triée dont la clé
+        commence par le préfixe.
+        """
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield keys[position], ids[position]
+            position += 1
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[int, str, str]]:
+        """
+        Retourne au plus `limit` livres dont le titre ou l'auteur contient un mot
+        commençant par le préfixe, par ordre alphabétique de la clé trouvée.
+
+        Returns:
+            List[Tuple[int, str, str]]: (ID, titre, auteur) des livres trouvés.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        base = (
+            (key, book_id) for key, book_id in self._matches(self._keys, self._ids, prefix)
+            if book_id not in self._stale
+        )
+        delta = self._matches(self._delta_keys, self._delta_ids, prefix)
+        results, seen = [], set()
+        for _, book_id in heapq.merge(base, delta):
+            if len(results) >= limit:
+                break
+            if book_id not in seen:
+                seen.add(book_id)
+                title, author = self._books[book_id]
+                results.append((book_id, title, author))
+        return results
+
+
+class SuggestService:
+    """
+    Détient l'index de préfixes courant et le reconstruit depuis la base.
+
+    Les modifications reçues pendant une reconstruction sont rejouées sur le
+    nouvel index avant qu'il ne remplace l'ancien.
+    """
+
+    def __init__(self, memory_budget_bytes: int):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.index = PrefixIndex(memory_budget_bytes)
+        self._pending: Optional[List[tuple]] = None
+        self._rebuild_again = False
+
+    def add(self, book_id: int, title: str, author: str) -> None:
+        self.index.add(book_id, title, author)
+        if self._pending is not None:
+            self._pending.append(("add", book_id, title, author))
+
+    def remove(self, book_id: int) -> None:
+        self.index.remove(book_id)
+        if self._pending is not None:
+            self._pending.append(("remove", book_id))
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[int, str, str]]:
+        return self.index.search(prefix, limit)
+
+    async def rebuild(self) -> None:
+        """
+        Reconstruit l'index à partir de la table "books".
+
+        Si une reconstruction est déjà en cours, elle est relancée une fois
+        terminée : les livres écrits après sa lecture de la table (par un
+        import en masse, par exemple) figurent dans l'index suivant.
+        """
+        if self._pending is not None:
+            self._rebuild_again = True
+            return
+        try:
+            while True:
+                self._pending = []
+                self._rebuild_again = False
+                async with SessionLocal() as db:
+                    result = await db.stream(
+                        select(models.Book.id, models.Book.title, models.Book.author)
+                        .execution_options(yield_per=5000)
+                    )
+                    rows = [tuple(row) async for row in result]
+                index = PrefixIndex(self.memory_budget_bytes)
+                # Le tri de l'index est fait hors de la boucle d'événements
+                await asyncio.to_thread(index.bulk_load, rows)
+                for operation in self._pending:
+                    if operation[0] == "add":
+                        index.add(*operation[1:])
+                    else:
+                        index.remove(operation[1])
+                self.index = index
+                logger.info("Suggest index rebuilt: %d books", len(index))
+                if not self._rebuild_again:
+                    break
+        finally:
+            self._pending = None
+
+    async def refresh_periodically(self, interval_seconds: int) -> None:
+        """
+        Reconstruit l'index toutes les `interval_seconds` secondes.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Suggest index refresh failed")
+
+
+# Index d'autocomplétion partagé par l'application
+suggest_service = SuggestService(settings.SUGGEST_MEMORY_BUDGET_MB * 1024 * 1024)
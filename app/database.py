@@ -1,59 +1,101 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
+import itertools
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
-import time
+from app.core.metrics import instrumented_pool_class
+from app.core.query_stats import instrument_engine
+from fastapi import Depends
 import logging
 
 logger = logging.getLogger(__name__)
 
-# URL de la base de données
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# Création du moteur de la base de données
+def async_url(url: str):
+    """
+    Retourne l'URL de connexion avec le pilote asynchrone asyncpg, imposé
+    quel que soit le schéma fourni dans la configuration
+    (postgresql://, postgresql+psycopg2://, ...).
+    """
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def create_engine(url: str, name: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """
+    Crée un moteur asynchrone avec son propre pool de connexions.
+
+    Le pool est instrumenté (temps d'attente des connexions exposé sur
+    /metrics sous le nom `name`) et les requêtes SQL sont comptées par
+    requête HTTP (voir QueryStatsMiddleware).
+    """
+    db_engine = create_async_engine(
+        async_url(url),
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        poolclass=instrumented_pool_class(name),
+    )
+    instrument_engine(db_engine.sync_engine)
+    return db_engine
+
+
+# URL de la base de données principale
+SQLALCHEMY_DATABASE_URL = async_url(settings.DATABASE_URL)
+
+# Moteur de la base principale : toutes les écritures et les lectures qui
+# doivent voir les écritures récentes
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
+    settings.DATABASE_URL, "primary", settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+)
+# Moteurs des réplicas en lecture, un pool par réplica
+replica_engines = [
+    create_engine(url.strip(), f"replica{index}", settings.DB_REPLICA_POOL_SIZE,
+                  settings.DB_REPLICA_MAX_OVERFLOW)
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS.split(","), start=1)
+    if url.strip()
+]
+# Tous les moteurs, par nom de pool (métriques, arrêt)
+engines = {"primary": engine}
+engines.update((f"replica{index}", replica) for index, replica in enumerate(replica_engines, start=1))
+
+# Création d'une "session locale" asynchrone.
+# expire_on_commit=False : les objets restent lisibles après le commit sans
+# déclencher de rechargement implicite (interdit en mode asynchrone).
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
-# Création d'une "session locale".
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Définition de la base déclarative.
-Base = declarative_base()
-
-
-async def create_db_and_tables(retries: int = 10, delay_seconds: int = 5):
-    """
-    Crée toutes les tables définies dans les modèles SQLAlchemy.
-    Cette fonction est appelée au démarrage de l'application.
-    Inclut une logique de re-tentative pour la connexion à la base de données
-    et la création des tables.
-    """
-    # Importez les modèles ici pour vous assurer qu'ils sont chargés et enregistrés
-    # avec Base.metadata avant d'appeler create_all.
-    # C'est une bonne pratique pour éviter les problèmes d'ordre d'importation.
-    from app import models # Ceci assure que les modèles sont enregistrés
-
-    for i in range(retries):
-        try:
-            logger.info(f"Tentative {i+1}/{retries} de création des tables de la base de données...")
-            # La méthode create_all est synchrone, mais elle sera exécutée dans le contexte
-            # asynchrone de l'événement de démarrage de FastAPI.
-            Base.metadata.create_all(engine)
-            logger.info("Tables de la base de données créées avec succès.")
-            return # Sortir de la boucle si la création réussit
-        except Exception as e:
-            logger.warning(f"Erreur lors de la création des tables: {e}. Re-tentative dans {delay_seconds} secondes...")
-            time.sleep(delay_seconds) # Attendre avant la prochaine tentative
-    
-    logger.error("Échec de la création des tables de la base de données après plusieurs tentatives.")
-    raise Exception("Impossible de se connecter à la base de données ou de créer les tables.")
-
-
-# Fonction pour obtenir une session de base de données (reste inchangée)
+# Sessions de lecture : une fabrique par réplica, utilisées à tour de rôle
+# (la base principale lorsqu'aucun réplica n'est configuré)
+_read_sessions = itertools.cycle([
+    async_sessionmaker(bind=replica, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    for replica in replica_engines
+] or [SessionLocal])
+
+
+# Fonction pour obtenir une session de base de données asynchrone
 async def get_db():
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
+        yield db
+
+
+def read_session() -> AsyncSession:
+    """
+    Ouvre une session de lecture sur le réplica suivant (ou sur la base
+    principale sans réplica), hors d'une requête HTTP (exports). Les données peuvent être en retard sur les
+    écritures récentes : à n'utiliser que pour des lectures.
+    """
+    return next(_read_sessions)()
+
+
+# Fonction pour obtenir une session de lecture (réplica)
+async def get_read_db(db: AsyncSession = Depends(get_db)):
+    """
+    Retourne une session sur un réplica. Sans réplica, la session de la base
+    principale de la requête (get_db, partagée avec l'authentification) est
+    réutilisée plutôt que d'occuper une seconde connexion du même pool.
+    """
+    if not replica_engines:
         yield db
-    finally:
-        db.close()
+        return
+    async with read_session() as replica_db:
+        yield replica_db
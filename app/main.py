@@ -3,17 +3,27 @@ from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from starlette_exporter import PrometheusMiddleware, handle_metrics
 from app.routers import books, members, loans, auth
 #from app.routers import books, members, loans, auth
-from app.database import create_db_and_tables
+from app.database import engine, engines
 from app.core.exceptions import CustomException
 from app.core.config import settings
+from app.security import password_hasher, principal_cache
+from app.core.suggest import suggest_service
+from app.core.catalog_cache import catalog_cache
+from app.core.metrics import register_collectors
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.overdue import sweep_periodically
+from app.core.readiness import readiness
+from app.core.logs import configure_logging
 from fastapi.responses import JSONResponse
 from starlette.responses import JSONResponse
 import asyncio
+from typing import Optional
 
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -31,25 +41,123 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # En-têtes de pagination lisibles par le frontend
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],
 )
 
+# Métriques Prometheus : latence par route (chemins regroupés par modèle de
+# route) et requêtes en cours, plus les métriques de app.core.metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        PrometheusMiddleware,
+        app_name="library",
+        prefix="library",
+        group_paths=True,
+        skip_paths=["/metrics", "/health", "/health/live", "/health/ready"],
+    )
+    app.add_route("/metrics", handle_metrics)
+    register_collectors(engines, password_hasher, catalog_cache, principal_cache)
+
+# Comptage des requêtes SQL par requête HTTP (en-têtes de diagnostic), hors production
+if settings.ENV != "production":
+    app.add_middleware(
+        QueryStatsMiddleware, repeat_threshold=settings.QUERY_REPEAT_WARNING_THRESHOLD
+    )
+
 @app.get("/health", status_code=200)
+@app.get("/health/live", status_code=200)
 async def health_check():
     """
-    Endpoint de contrôle de santé pour vérifier que l'API est en cours d'exécution.
+    Endpoint de contrôle de santé pour vérifier que l'API est en cours d'exécution
+    (liveness : le processus répond, qu'il soit prêt ou non).
     """
     return {"status": "ok"}
 
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Indique si le worker peut recevoir du trafic (readiness) : préparation
+    terminée (schéma à jour, pools ouverts, bcrypt chargé) et base principale
+    joignable. Retourne 503 sinon, et pendant l'arrêt.
+    """
+    reason = await readiness.check(engine, settings.READINESS_TIMEOUT_SECONDS)
+    if reason:
+        return JSONResponse({"status": "unavailable", "detail": reason}, status_code=503)
+    return {"status": "ready"}
+
+# Tâches de fond lancées au démarrage, annulées à l'arrêt
+background_tasks = []
+# Passage périodique des emprunts en retard : arrêté à la fin du lot en cours
+overdue_sweep_stop = asyncio.Event()
+overdue_sweep: Optional[asyncio.Task] = None
+
 # Gestionnaire d'événements pour la startup de l'application
 @app.on_event("startup")
 async def on_startup():
     """
     Fonction appelée au démarrage de l'application.
-    Crée les tables de la base de données.
+    Lance la préparation du worker (vérification des migrations, ouverture des
+    pools, chargement de bcrypt, index d'autocomplétion) sans l'attendre : le
+    worker répond à /health/live aussitôt et à /health/ready une fois prêt.
+    Lance aussi le passage périodique des emprunts en retard.
+    Le schéma n'est pas créé ici : les migrations sont appliquées avant le
+    déploiement (python -m app.core.migrations).
     """
-    await create_db_and_tables()
-    logger.info("Application démarrée et tables de la base de données créées.")
-
+    global overdue_sweep
+    background_tasks.append(asyncio.create_task(readiness.warm_up(
+        engines, password_hasher, suggest_service, settings.WARMUP_RETRY_SECONDS
+    )))
+    if settings.SUGGEST_REFRESH_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            suggest_service.refresh_periodically(settings.SUGGEST_REFRESH_SECONDS)
+        ))
+    if settings.OVERDUE_SWEEP_SECONDS > 0:
+        overdue_sweep = asyncio.create_task(sweep_periodically(
+            settings.OVERDUE_SWEEP_SECONDS, settings.OVERDUE_SWEEP_BATCH_SIZE, overdue_sweep_stop
+        ))
+    logger.info("Application démarrée.")
+
+
+# Gestionnaire d'événements pour l'arrêt de l'application
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Fonction appelée à l'arrêt de l'application.
+    Appelée par le serveur une fois les requêtes en cours terminées (ou annulées
+    après SERVER_GRACEFUL_TIMEOUT_SECONDS). Le worker cesse d'être prêt, laisse
+    le passage des emprunts en retard valider son lot en cours, puis arrête les
+    tâches de fond, libère le pool de hachage des mots de passe et ferme les
+    pools de connexions (base principale et réplicas).
+    """
+    readiness.ready, readiness.detail = False, "shutting down"
+    if overdue_sweep is not None:
+        overdue_sweep_stop.set()
+        try:
+            await asyncio.wait_for(overdue_sweep, settings.SERVER_GRACEFUL_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.error("Overdue sweep did not stop in time and was cancelled")
+    for task in background_tasks:
+        task.cancel()
+    password_hasher.shutdown()
+    for db_engine in engines.values():
+        await db_engine.dispose()
+
+
+
+def log_http_error(request, status_code: int, detail) -> None:
+    """
+    Journalise une réponse d'erreur : ERROR pour les erreurs du serveur (5xx),
+    INFO échantillonné pour celles du client (4xx : ressource introuvable,
+    requête invalide, authentification), qui sont attendues et fréquentes.
+    """
+    if status_code >= 500:
+        logger.error("HTTP %d on %s %s: %s", status_code, request.method, request.url.path, detail)
+    else:
+        logger.info(
+            "HTTP %d on %s %s: %s", status_code, request.method, request.url.path, detail,
+            extra={"sample": f"http.{status_code}", "status_code": status_code},
+        )
 
 
 # Gestionnaire d'erreurs global pour les exceptions HTTP de Starlette
@@ -59,10 +167,11 @@ async def http_exception_handler(request, exc):
     Gestionnaire d'erreurs pour les exceptions HTTP standard (comme 404, etc.).
     Retourne une réponse JSON avec le code d'erreur et le message.
     """
-    logger.error(f"HTTP Exception: {exc.status_code} - {exc.detail}")
+    log_http_error(request, exc.status_code, exc.detail)
     return JSONResponse(
         {"detail": exc.detail, "status_code": exc.status_code},
         status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -73,7 +182,7 @@ async def validation_exception_handler(request, exc):
     Gestionnaire d'erreurs pour les erreurs de validation des données (Pydantic).
     Retourne une réponse JSON avec les détails de l'erreur.
     """
-    logger.error(f"Validation Error: {exc}")
+    log_http_error(request, 422, exc.errors())
     return JSONResponse(
         {"detail": exc.errors(), "status_code": 422}, status_code=422
     )
@@ -85,7 +194,7 @@ async def custom_exception_handler(request, exc):
     Gestionnaire d'erreurs pour les exceptions personnalisées de l'application.
     Retourne une réponse JSON avec le code d'erreur et le message.
     """
-    logger.error(f"Custom Exception: {exc.status_code} - {exc.detail}")
+    log_http_error(request, exc.status_code, exc.detail)
     return JSONResponse(
         {"detail": exc.detail, "status_code": exc.status_code},
         status_code=exc.status_code,
@@ -105,12 +214,10 @@ def read_root():
 
 
 if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info",
-    )
\ No newline at end of file
+    # Même démarrage que python -m app.serve (plusieurs workers, ou un seul
+    # processus rechargé avec SERVER_RELOAD=true). Le processus est remplacé :
+    # les workers ne peuvent pas importer l'application depuis __main__.
+    import os
+    import sys
+
+    os.execv(sys.executable, [sys.executable, "-m", "app.serve"])
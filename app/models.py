@@ -1,18 +1,44 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, DDL, Integer, String, Date, ForeignKey, Index, Table, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.ext.declarative import declarative_base
 
 # Définition de la base
 Base = declarative_base()
 
+# Configuration de recherche plein texte : français, sans accents
+# (« misérables » et « miserables » donnent les mêmes lexèmes).
+BOOK_SEARCH_CONFIG = "public.fr_unaccent"
+
+# Table des emprunts.  Chaque emprunt a son propre ID : un membre peut emprunter
+# plusieurs fois le même livre.
 loan_association_table = Table(
     "loan_association",
     Base.metadata,
-    Column("book_id", ForeignKey("books.id"), primary_key=True),
-    Column("member_id", ForeignKey("members.id"), primary_key=True),
+    Column("id", Integer, primary_key=True),
+    Column("book_id", ForeignKey("books.id"), nullable=False),
+    Column("member_id", ForeignKey("members.id"), nullable=False),
     Column("loan_date", Date),
+    Column("due_date", Date, nullable=True),  # Date de retour prévue
     Column("return_date", Date, nullable=True),
     Column("status", String, default="En cours"),
+    # Version de la ligne, incrémentée à chaque modification (ETag)
+    Column("version", Integer, nullable=False, server_default="1"),
+    # Emprunts en cours (non retournés), par date de retour prévue
+    Index(
+        "ix_loans_active_due_date", "due_date", "id",
+        postgresql_where=text("return_date IS NULL"),
+    ),
+    # Emprunts "En cours" par date de retour prévue (passage en retard)
+    Index(
+        "ix_loans_in_progress_due_date", "due_date",
+        postgresql_where=text("status = 'En cours'"),
+    ),
+    # Historique des emprunts d'un membre et d'un livre
+    Index("ix_loans_member_id_loan_date", "member_id", "loan_date", "id"),
+    Index("ix_loans_book_id_loan_date", "book_id", "loan_date", "id"),
+    # Filtre par statut de GET /loans (trié par ID)
+    Index("ix_loans_status_id", "status", "id"),
 )
 
 
@@ -47,16 +73,56 @@ class Book(Base):
     number_of_copies = Column(Integer, default=1, nullable=False)  # Nombre total d'exemplaires
     available_copies = Column(Integer, default=1,
                                   nullable=False)  # Nombre d'exemplaires disponibles
+    # Version de la ligne, incrémentée à chaque modification (ETag)
+    version = Column(Integer, nullable=False, server_default="1")
+    # Vecteur de recherche plein texte (titre > auteur > éditeur), maintenu par
+    # PostgreSQL (colonne générée). Différé : il n'est jamais chargé avec le livre.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{BOOK_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{BOOK_SEARCH_CONFIG}', coalesce(author, '')), 'B') || "
+            f"setweight(to_tsvector('{BOOK_SEARCH_CONFIG}', coalesce(publisher, '')), 'C')",
+            persisted=True,
+        ),
+    ))
 
     # Ajout de la relation avec Member via la table d'association
     members = relationship(
-        "Member", secondary=loan_association_table, back_populates="books"
+        "Member", secondary=loan_association_table, back_populates="books", viewonly=True
+    )
+
+    # Index composites pour le tri et la pagination par curseur (clé de tri + ID)
+    __table_args__ = (
+        Index("ix_books_title_id", "title", "id"),
+        Index("ix_books_author_id", "author", "id"),
+        Index("ix_books_publication_date_id", "publication_date", "id"),
+        # Index GIN pour la recherche plein texte
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
     )
 
     def __repr__(self):
         return f"<Book(title='{self.title}', author='{self.author}', isbn='{self.isbn}')>"
 
 
+# La configuration de recherche doit exister avant la création de la table "books",
+# dont la colonne générée search_vector dépend.
+event.listen(
+    Book.__table__,
+    "before_create",
+    DDL(
+        "CREATE EXTENSION IF NOT EXISTS unaccent;"
+        "DO $$ BEGIN"
+        " IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'fr_unaccent') THEN"
+        "  CREATE TEXT SEARCH CONFIGURATION public.fr_unaccent (COPY = pg_catalog.french);"
+        "  ALTER TEXT SEARCH CONFIGURATION public.fr_unaccent"
+        "   ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;"
+        " END IF;"
+        " END $$;"
+    ),
+)
+
+
 # Définition du modèle pour les membres
 class Member(Base):
     __tablename__ = "members"
@@ -71,12 +137,21 @@ class Member(Base):
     join_date = Column(Date, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True,
                            nullable=False)  # Clé étrangère vers la table User
+    # Version de la ligne, incrémentée à chaque modification (ETag)
+    version = Column(Integer, nullable=False, server_default="1")
     user = relationship("User", backref="member",
                             uselist=False)  # Relation one-to-one avec User
 
     # Ajout de la relation avec Book via la table d'association
     books = relationship(
-        "Book", secondary=loan_association_table, back_populates="members"
+        "Book", secondary=loan_association_table, back_populates="members", viewonly=True
+    )
+
+    # Index composites pour le tri et la pagination par curseur (clé de tri + ID)
+    __table_args__ = (
+        Index("ix_members_last_name_first_name_id", "last_name", "first_name", "id"),
+        Index("ix_members_first_name_id", "first_name", "id"),
+        Index("ix_members_join_date_id", "join_date", "id"),
     )
 
     def __repr__(self):
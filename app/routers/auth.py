@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
 from app.database import get_db
 from app.security import (
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     get_password_hash,
-    get_current_user
+    get_current_user,
+    get_current_admin_user,
+    invalidate_principal,
+    password_hasher,
 )
 from datetime import timedelta
 from app.core.config import settings
@@ -20,13 +24,13 @@ logger = logging.getLogger(__name__)
 
 # Endpoint pour l'inscription d'un nouvel utilisateur
 @router.post("/register", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
-async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Enregistre un nouvel utilisateur dans la base de données.
 
     Args:
         user (schemas.UserCreate): Les données de l'utilisateur à enregistrer.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
 
     Returns:
         schemas.User: L'utilisateur nouvellement créé.
@@ -35,9 +39,10 @@ async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db))
         HTTPException: Si le nom d'utilisateur ou l'email est déjà pris.
     """
     # Vérifie si le nom d'utilisateur est déjà utilisé
-    db_user_by_username = (
-        db.query(models.User).filter(models.User.username == user.username).first()
+    result = await db.execute(
+        select(models.User).where(models.User.username == user.username)
     )
+    db_user_by_username = result.scalars().first()
     if db_user_by_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,17 +50,18 @@ async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db))
         )
 
     # Vérifie si l'email est déjà utilisé
-    db_user_by_email = (
-        db.query(models.User).filter(models.User.email == user.email).first()
+    result = await db.execute(
+        select(models.User).where(models.User.email == user.email)
     )
+    db_user_by_email = result.scalars().first()
     if db_user_by_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    # Hash le mot de passe avant de l'enregistrer
-    hashed_password = get_password_hash(user.password)
+    # Hash le mot de passe avant de l'enregistrer (dans le pool bcrypt)
+    hashed_password = await password_hasher.run(get_password_hash, user.password)
     db_user = models.User(
         username=user.username,
         email=user.email,
@@ -66,9 +72,9 @@ async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db))
         role="member" #Rôle par défaut
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    logger.info(f"User registered: {db_user.username}")
+    await db.commit()
+    await db.refresh(db_user)
+    logger.info("User registered: %s", db_user.username)
     return db_user
 
 
@@ -76,7 +82,7 @@ async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db))
 # Endpoint pour la connexion d'un utilisateur et l'obtention d'un token JWT
 @router.post("/login")
 async def login_user(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
     """
     Connecte un utilisateur et retourne un token JWT.
@@ -84,7 +90,7 @@ async def login_user(
     Args:
         form_data (OAuth2PasswordRequestForm, optional): Les données du formulaire de connexion
             (nom d'utilisateur et mot de passe).
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
 
     Returns:
         dict: Un dictionnaire contenant le token d'accès et le type de token.
@@ -93,9 +99,10 @@ async def login_user(
         HTTPException: Si les informations d'identification sont invalides.
     """
     # Vérifie si l'utilisateur existe
-    user = (
-        db.query(models.User).filter(models.User.username == form_data.username).first()
+    result = await db.execute(
+        select(models.User).where(models.User.username == form_data.username)
     )
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,8 +110,11 @@ async def login_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Vérifie si le mot de passe est correct
-    if not verify_password(form_data.password, user.password_hash):
+    # Vérifie si le mot de passe est correct (dans le pool bcrypt)
+    verified, new_hash = await password_hasher.run(
+        verify_and_update_password, form_data.password, user.password_hash
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -116,9 +126,13 @@ async def login_user(
         data={"sub": user.username},
         expires_delta=timedelta(minutes=settings.JWT_EXPIRE_MINUTES),
     )
+    # Recalcule le hachage si le coût bcrypt configuré a changé
+    if new_hash:
+        user.password_hash = new_hash
     user.last_login = date.today()
-    db.commit()
-    logger.info(f"User logged in: {user.username}")
+    await db.commit()
+    invalidate_principal(user.id)
+    logger.info("User logged in: %s", user.username)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -135,5 +149,43 @@ async def get_me(current_user: models.User = Depends(get_current_user)):
     Returns:
         schemas.User: Les informations de l'utilisateur actuel.
     """
-    logger.info(f"User profile accessed: {current_user.username}")
-    return current_user
\ No newline at end of file
+    logger.info("User profile accessed: %s", current_user.username, extra={"sample": "auth.me"})
+    return current_user
+
+
+# Endpoint pour modifier le rôle d'un utilisateur (accessible uniquement aux administrateurs)
+@router.put("/users/{user_id}/role", response_model=schemas.User)
+async def update_user_role(
+    user_id: int,
+    update: schemas.UserRoleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user),
+):
+    """
+    Modifie le rôle d'un utilisateur. Accessible uniquement aux administrateurs.
+    Les entrées de l'utilisateur dans le cache des utilisateurs authentifiés
+    de ce worker sont supprimées : le nouveau rôle s'applique à sa requête
+    suivante (après PRINCIPAL_CACHE_TTL_SECONDS au plus sur les autres workers).
+
+    Args:
+        user_id (int): L'ID de l'utilisateur à modifier.
+        update (schemas.UserRoleUpdate): Le nouveau rôle.
+        db (AsyncSession, optional): La session de base de données.
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+            Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
+
+    Returns:
+        schemas.User: L'utilisateur modifié.
+
+    Raises:
+        HTTPException: Si l'utilisateur n'est pas trouvé.
+    """
+    result = await db.execute(select(models.User).where(models.User.id == user_id))
+    db_user = result.scalars().first()
+    if not db_user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    db_user.role = update.role
+    await db.commit()
+    invalidate_principal(db_user.id)
+    logger.info("User role updated by %s: %s is now %s", current_user.username, db_user.username, update.role)
+    return db_user
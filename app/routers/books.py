@@ -1,20 +1,106 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import TypeAdapter
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.core.bulk_import import import_books, spool_upload
+from app.core.catalog_cache import BOOK_LIST_TAG, book_tag, catalog_cache
+from app.core.config import settings
+from app.core.export import export_response
+from app.core.suggest import suggest_service
+from app.core.etag import compute_etag, conditional_response
+from app.core.pagination import decode_cursor, encode_cursor, keyset_segments, set_next_cursor
 from app.security import get_current_user, get_current_admin_user
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Colonnes de tri pour chaque option de "sort".  L'ID termine chaque clé de tri
+# pour la rendre unique (pagination par curseur) ; chaque clé est couverte par
+# un index composite (voir models.Book).
+BOOK_SORT_COLUMNS = {
+    "title": (models.Book.title, models.Book.id),
+    "author": (models.Book.author, models.Book.id),
+    "publication_date": (models.Book.publication_date, models.Book.id),
+}
+
+# Sérialisation des pages de livres.  Les réponses du catalogue sont mises en
+# cache déjà sérialisées en JSON et renvoyées telles quelles (voir json_response)
+BOOK_LIST_ADAPTER = TypeAdapter(List[schemas.Book])
+
+# Colonnes des exports de livres
+BOOK_EXPORT_COLUMNS = (
+    models.Book.id,
+    models.Book.title,
+    models.Book.author,
+    models.Book.isbn,
+    models.Book.publisher,
+    models.Book.publication_date,
+    models.Book.number_of_copies,
+    models.Book.available_copies,
+)
+
+
+def json_response(body: str, response: Response) -> Response:
+    """
+    Construit la réponse d'une entrée du cache du catalogue, déjà sérialisée :
+    FastAPI ne la revalide pas par le response_model et ne la réencode pas.
+
+    Args:
+        body (str): Le corps JSON de la réponse.
+        response (Response): La réponse HTTP de l'endpoint (en-têtes déjà définis).
+
+    Returns:
+        Response: La réponse JSON, avec les en-têtes de l'endpoint.
+    """
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+
+# Filtres et tri communs à la liste et à l'export des livres
+def filter_books(query, title: Optional[str], author: Optional[str], isbn: Optional[str]):
+    """
+    Applique à la requête les filtres de GET /books.
+
+    Args:
+        query (Select): La requête sur les livres.
+        title (str, optional): Filtrer les livres par titre.
+        author (str, optional): Filtrer les livres par auteur.
+        isbn (str, optional): Filtrer les livres par ISBN.
+
+    Returns:
+        Select: La requête filtrée.
+    """
+    if title:
+        query = query.where(models.Book.title.ilike(f"%{title}%"))  # Recherche insensible à la casse
+    if author:
+        query = query.where(models.Book.author.ilike(f"%{author}%"))
+    if isbn:
+        query = query.where(models.Book.isbn == isbn)
+    return query
+
+
+def book_sort(sort: Optional[str], order: Optional[str]):
+    """
+    Retourne les colonnes de tri, le sens du tri et l'identifiant du tri
+    (utilisé par les curseurs) pour les paramètres "sort" et "order".
+    Le tri par défaut est par titre.
+    """
+    sort_columns = BOOK_SORT_COLUMNS[sort or "title"]
+    descending = bool(sort) and order == "desc"
+    sort_key = f"{sort or 'title'}:{'desc' if descending else 'asc'}"
+    return sort_columns, descending, sort_key
+
 
 # Endpoint pour créer un nouveau livre (accessible uniquement aux administrateurs)
 @router.post("/", response_model=schemas.Book, status_code=status.HTTP_201_CREATED)
 async def create_book(
     book: schemas.BookCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user),
 ):
     """
@@ -22,7 +108,7 @@ async def create_book(
 
     Args:
         book (schemas.BookCreate): Les données du livre à créer.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
             Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
 
@@ -33,7 +119,8 @@ async def create_book(
         HTTPException: Si un livre avec le même ISBN existe déjà.
     """
     # Vérifie si un livre avec le même ISBN existe déjà
-    db_book = db.query(models.Book).filter(models.Book.isbn == book.isbn).first()
+    result = await db.execute(select(models.Book).where(models.Book.isbn == book.isbn))
+    db_book = result.scalars().first()
     if db_book:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="ISBN already exists"
@@ -50,33 +137,86 @@ async def create_book(
         available_copies=book.number_of_copies,
     )
     db.add(db_book)
-    db.commit()
-    db.refresh(db_book)
-    logger.info(f"Book created: {db_book.title} (ID: {db_book.id})")
+    await db.commit()
+    await db.refresh(db_book)
+    suggest_service.add(db_book.id, db_book.title, db_book.author)
+    await catalog_cache.invalidate_books([db_book.id], lists=True)
+    logger.info("Book created: %s (ID: %d)", db_book.title, db_book.id)
     return db_book
 
 
 
+# Endpoint pour importer des livres en masse (accessible uniquement aux administrateurs)
+@router.post("/import", status_code=status.HTTP_200_OK)
+async def bulk_import_books(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: models.User = Depends(get_current_admin_user),
+):
+    """
+    Importe des livres depuis un fichier CSV (avec en-tête) ou NDJSON.
+    Accessible uniquement aux administrateurs.
+
+    Les lignes sont validées comme pour la création d'un livre, puis insérées
+    par lots ; les ISBN déjà présents (dans la base ou plus haut dans le
+    fichier) sont ignorés et signalés.
+
+    Args:
+        file (UploadFile): Le fichier à importer.
+        format (str, optional): 'csv' ou 'ndjson' ; déduit de l'extension du fichier si absent.
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+            Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
+
+    Returns:
+        StreamingResponse: Le rapport d'import au format NDJSON, envoyé au fil de
+            l'eau : une ligne "error" par ligne rejetée, une ligne "progress"
+            par lot, puis une ligne "summary".
+    """
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    logger.info("Bulk import started by %s: %s (%s)", current_user.username, file.filename, format)
+    # Le fichier est copié avant le retour du handler : le rapport est lu
+    # dans cette copie, fermée une fois la réponse envoyée
+    stream = await spool_upload(file)
+    return StreamingResponse(
+        import_books(stream, format, settings.BULK_IMPORT_BATCH_SIZE),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(stream.close),
+    )
+
+
+
 # Endpoint pour récupérer tous les livres avec pagination, filtrage et tri
 @router.get("/", response_model=List[schemas.Book])
 async def get_books(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Curseur de la page suivante (remplace skip)"),
     title: Optional[str] = Query(None),
     author: Optional[str] = Query(None),
     isbn: Optional[str] = Query(None),
-    sort: Optional[str] = Query(None, regex="^(title|author|publication_date)$"),
-    order: Optional[str] = Query("asc", regex="^(asc|desc)$"),
+    sort: Optional[str] = Query(None, pattern="^(title|author|publication_date)$"),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$"),
     current_user: models.User = Depends(get_current_user),
 ):
     """
     Récupère tous les livres de la base de données, avec pagination, filtrage et tri.
+    Lorsqu'une page est pleine, le curseur de la page suivante est retourné dans
+    les en-têtes X-Next-Cursor et Link. La réponse porte un ETag : une requête
+    avec If-None-Match reçoit une réponse 304 si la page n'a pas changé.
+    Les pages sont lues à travers le cache du catalogue.
 
     Args:
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (lien de la page suivante, If-None-Match).
+        response (Response): La réponse HTTP (en-têtes de pagination et ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
         skip (int, optional): Le nombre d'éléments à sauter (pour la pagination).
         limit (int, optional): Le nombre maximum d'éléments à retourner (pour la pagination).
+        after (str, optional): Le curseur de la page suivante (pagination par curseur).
         title (str, optional): Filtrer les livres par titre.
         author (str, optional): Filtrer les livres par auteur.
         isbn (str, optional): Filtrer les livres par ISBN.
@@ -87,45 +227,223 @@ async def get_books(
     Returns:
         List[schemas.Book]: La liste des livres соответств. aux critères de filtrage, tri et pagination.
     """
-    query = db.query(models.Book)
-
-    # Applique les filtres si des valeurs sont fournies
-    if title:
-        query = query.filter(models.Book.title.ilike(f"%{title}%"))  # Recherche insensible à la casse
-    if author:
-        query = query.filter(models.Book.author.ilike(f"%{author}%"))
-    if isbn:
-        query = query.filter(models.Book.isbn == isbn)
+    sort_columns, descending, sort_key = book_sort(sort, order)
+
+    # Lecture dans le cache du catalogue (paramètres normalisés : tri explicite,
+    # filtres vides ignorés, décalage ignoré avec un curseur)
+    cache_key = catalog_cache.key(
+        "books",
+        title=title or None,
+        author=author or None,
+        isbn=isbn or None,
+        sort=sort_key,
+        after=after,
+        skip=None if after else skip,
+        limit=limit,
+    )
+    page = await catalog_cache.get("books", cache_key)
+    if page is None:
+        generation = await catalog_cache.generation()
+        # Applique les filtres si des valeurs sont fournies
+        query = filter_books(select(models.Book), title, author, isbn)
+
+        # Applique le tri (par défaut par titre)
+        query = query.order_by(
+            *(column.desc() if descending else column for column in sort_columns)
+        )
 
-    # Applique le tri si un champ de tri est fourni
-    if sort:
-        if order == "asc":
-            query = query.order_by(getattr(models.Book, sort))
+        # Applique la pagination : par curseur si "after" est fourni, sinon par
+        # décalage. Avec un curseur, chaque segment est lu par l'index de la clé
+        # de tri ; le second (livres sans date de publication, après les autres
+        # en ordre croissant) n'est lu que pour compléter la dernière page datée.
+        if after:
+            values = decode_cursor(after, sort_key, sort_columns)
+            segments = [query.where(condition) for condition in keyset_segments(sort_columns, values, descending)]
         else:
-            query = query.order_by(getattr(models.Book, sort).desc())
-    else:
-        query = query.order_by(models.Book.title)  # Tri par défaut par titre
+            segments = [query.offset(skip)]
+        books = []
+        for segment in segments:
+            result = await db.execute(segment.limit(limit - len(books)))
+            books.extend(result.scalars().all())
+            if len(books) == limit:
+                break
+
+        # Une seule validation des lignes (lecture des attributs), sérialisée en JSON
+        # par pydantic-core ; les succès du cache ne sont ni revalidés ni réencodés
+        page = {
+            "body": BOOK_LIST_ADAPTER.dump_json(
+                BOOK_LIST_ADAPTER.validate_python(books, from_attributes=True)
+            ).decode(),
+            "count": len(books),
+            "next_cursor": encode_cursor(
+                sort_key, [getattr(books[-1], column.key) for column in sort_columns]
+            ) if len(books) == limit else None,
+            "etag": compute_etag("books", [(book.id, book.version) for book in books]),
+        }
+        await catalog_cache.set(
+            cache_key, page, [BOOK_LIST_TAG] + [book_tag(book.id) for book in books], generation
+        )
 
-    # Applique la pagination
-    books = query.offset(skip).limit(limit).all()
-    logger.info(f"Retrieved {len(books)} books (skip: {skip}, limit: {limit})")
+    if page["next_cursor"]:
+        set_next_cursor(request, response, page["next_cursor"])
+    # Réponse 304 si le client possède déjà cette page (mêmes livres, mêmes versions)
+    not_modified = conditional_response(request, response, page["etag"])
+    if not_modified:
+        return not_modified
+    logger.info(
+        "Retrieved %d books (skip: %d, limit: %d)", page["count"], skip, limit, extra={"sample": "books.list"}
+    )
+    return json_response(page["body"], response)
+
+
+
+# Endpoint pour exporter les livres (CSV ou NDJSON), sans limite de taille
+@router.get("/export")
+async def export_books(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    title: Optional[str] = Query(None),
+    author: Optional[str] = Query(None),
+    isbn: Optional[str] = Query(None),
+    sort: Optional[str] = Query(None, pattern="^(title|author|publication_date)$"),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$"),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Exporte tous les livres correspondant aux filtres de GET /books, dans le même ordre.
+    Les lignes sont lues avec un curseur côté serveur et envoyées au fil de l'eau.
+
+    Args:
+        format (str, optional): Le format du fichier ('csv' ou 'ndjson').
+        title (str, optional): Filtrer les livres par titre.
+        author (str, optional): Filtrer les livres par auteur.
+        isbn (str, optional): Filtrer les livres par ISBN.
+        sort (str, optional): Le champ sur lequel trier les livres.
+        order (str, optional): L'ordre de tri ('asc' ou 'desc').
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        StreamingResponse: Le fichier exporté.
+    """
+    query = filter_books(select(*BOOK_EXPORT_COLUMNS), title, author, isbn)
+    sort_columns, descending, _ = book_sort(sort, order)
+    query = query.order_by(
+        *(column.desc() if descending else column for column in sort_columns)
+    )
+    logger.info("Books export started by %s (%s)", current_user.username, format)
+    return export_response(query, format, "books", settings.EXPORT_BATCH_SIZE)
+
+
+
+# Endpoint pour la recherche plein texte dans le catalogue
+@router.get("/search", response_model=List[schemas.Book])
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Recherche des livres par titre, auteur et éditeur, triés par pertinence.
+    La recherche ignore les accents et la casse, et accepte la syntaxe
+    de recherche web ("expression exacte", -exclusion, OR).
+
+    Args:
+        q (str): Les termes recherchés.
+        db (AsyncSession, optional): La session de lecture (réplica).
+        skip (int, optional): Le nombre d'éléments à sauter (pour la pagination).
+        limit (int, optional): Le nombre maximum d'éléments à retourner (pour la pagination).
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        List[schemas.Book]: Les livres correspondants, du plus pertinent au moins pertinent.
+    """
+    search_config = literal_column(f"'{models.BOOK_SEARCH_CONFIG}'::regconfig")
+    ts_query = func.websearch_to_tsquery(search_config, q)
+    rank = func.ts_rank_cd(models.Book.search_vector, ts_query)
+    query = (
+        select(models.Book)
+        .where(models.Book.search_vector.bool_op("@@")(ts_query))
+        .order_by(rank.desc(), models.Book.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    books = result.scalars().all()
+    logger.info(
+        "Search '%s' returned %d books (skip: %d, limit: %d)", q, len(books), skip, limit,
+        extra={"sample": "books.search"},
+    )
     return books
 
 
 
+# Endpoint pour l'autocomplétion des titres et auteurs
+@router.get("/suggest", response_model=List[schemas.BookSuggestion])
+async def suggest_books(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Propose des livres dont le titre ou l'auteur contient un mot commençant
+    par le préfixe saisi (sans tenir compte des accents ni de la casse).
+    Servi par l'index en mémoire, sans requête vers la base de données.
+
+    Args:
+        prefix (str): Le début du texte saisi.
+        limit (int, optional): Le nombre maximum de suggestions.
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        List[schemas.BookSuggestion]: Les livres proposés.
+    """
+    return [
+        schemas.BookSuggestion(id=book_id, title=title, author=author)
+        for book_id, title, author in suggest_service.search(prefix, limit)
+    ]
+
+
+
+# Endpoint pour consulter les statistiques du cache du catalogue (administrateurs)
+@router.get("/cache/stats", response_model=dict)
+async def get_catalog_cache_stats(
+    current_user: models.User = Depends(get_current_admin_user),
+):
+    """
+    Retourne les compteurs du cache du catalogue de ce worker : succès, défauts
+    et taux de succès par type de lecture ("book", "books"), erreurs du stockage.
+
+    Args:
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+            Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
+
+    Returns:
+        dict: Les statistiques du cache.
+    """
+    return catalog_cache.stats()
+
+
+
 # Endpoint pour récupérer un livre par ID
 @router.get("/{book_id}", response_model=schemas.Book)
 async def get_book(
     book_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     """
-    Récupère un livre par son ID.
+    Récupère un livre par son ID, à travers le cache du catalogue.
+    La réponse porte un ETag : une requête avec If-None-Match reçoit une
+    réponse 304 si le livre n'a pas changé.
 
     Args:
         book_id (int): L'ID du livre à récupérer.
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (en-tête If-None-Match).
+        response (Response): La réponse HTTP (en-tête ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
@@ -134,14 +452,29 @@ async def get_book(
     Raises:
         HTTPException: Si le livre n'est pas trouvé.
     """
-    # Récupère le livre
-    db_book = db.query(models.Book).filter(models.Book.id == book_id).first()
-    if not db_book:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
-        )
-    logger.info(f"Retrieved book with ID {book_id}: {db_book.title}")
-    return db_book
+    cache_key = catalog_cache.key("book", id=book_id)
+    entry = await catalog_cache.get("book", cache_key)
+    if entry is None:
+        generation = await catalog_cache.generation()
+        # Récupère le livre
+        result = await db.execute(select(models.Book).where(models.Book.id == book_id))
+        db_book = result.scalars().first()
+        if not db_book:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
+            )
+        entry = {
+            "body": schemas.Book.model_validate(db_book).model_dump_json(),
+            "title": db_book.title,
+            "etag": compute_etag("book", db_book.id, db_book.version),
+        }
+        await catalog_cache.set(cache_key, entry, [book_tag(book_id)], generation)
+
+    not_modified = conditional_response(request, response, entry["etag"])
+    if not_modified:
+        return not_modified
+    logger.info("Retrieved book with ID %d: %s", book_id, entry["title"], extra={"sample": "books.get"})
+    return json_response(entry["body"], response)
 
 
 
@@ -150,7 +483,7 @@ async def get_book(
 async def update_book(
     book_id: int,
     book: schemas.BookUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user),
 ):
     """
@@ -159,7 +492,7 @@ async def update_book(
     Args:
         book_id (int): L'ID du livre à modifier.
         book (schemas.BookUpdate): Les nouvelles données du livre.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
             Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
 
@@ -170,7 +503,8 @@ async def update_book(
         HTTPException: Si le livre n'est pas trouvé ou si l'ISBN est déjà utilisé par un autre livre.
     """
     # Récupère le livre à modifier
-    db_book = db.query(models.Book).filter(models.Book.id == book_id).first()
+    result = await db.execute(select(models.Book).where(models.Book.id == book_id))
+    db_book = result.scalars().first()
     if not db_book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
@@ -178,12 +512,24 @@ async def update_book(
 
     # Vérifie si l'ISBN est déjà utilisé par un autre livre
     if book.isbn and book.isbn != db_book.isbn:
-        isbn_exists = db.query(models.Book).filter(models.Book.isbn == book.isbn).first()
+        result = await db.execute(select(models.Book).where(models.Book.isbn == book.isbn))
+        isbn_exists = result.scalars().first()
         if isbn_exists:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="ISBN already exists"
             )
 
+    # Les pages ne changent de composition que si un champ filtré ou trié change
+    lists_changed = any(
+        value and value != getattr(db_book, field)
+        for field, value in (
+            ("title", book.title),
+            ("author", book.author),
+            ("isbn", book.isbn),
+            ("publication_date", book.publication_date),
+        )
+    )
+
     # Met à jour les champs du livre
     if book.title:
         db_book.title = book.title
@@ -199,9 +545,12 @@ async def update_book(
         db_book.number_of_copies = book.number_of_copies
     if book.available_copies:
         db_book.available_copies = book.available_copies
-    db.commit()
-    db.refresh(db_book)
-    logger.info(f"Book updated: {db_book.title} (ID: {db_book.id})")
+    db_book.version = models.Book.version + 1  # Nouvelle version (ETag)
+    await db.commit()
+    await db.refresh(db_book)
+    suggest_service.add(db_book.id, db_book.title, db_book.author)
+    await catalog_cache.invalidate_books([db_book.id], lists=lists_changed)
+    logger.info("Book updated: %s (ID: %d)", db_book.title, db_book.id)
     return db_book
 
 
@@ -210,7 +559,7 @@ async def update_book(
 @router.delete("/{book_id}", response_model=dict, status_code=status.HTTP_200_OK)
 async def delete_book(
     book_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user),
 ):
     """
@@ -218,7 +567,7 @@ async def delete_book(
 
     Args:
         book_id (int): L'ID du livre à supprimer.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
             Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
 
@@ -229,14 +578,17 @@ async def delete_book(
         HTTPException: Si le livre n'est pas trouvé.
     """
     # Récupère le livre à supprimer
-    db_book = db.query(models.Book).filter(models.Book.id == book_id).first()
+    result = await db.execute(select(models.Book).where(models.Book.id == book_id))
+    db_book = result.scalars().first()
     if not db_book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
         )
 
     # Supprime le livre
-    db.delete(db_book)
-    db.commit()
-    logger.info(f"Book deleted: {db_book.title} (ID: {book_id})")
+    await db.delete(db_book)
+    await db.commit()
+    suggest_service.remove(book_id)
+    await catalog_cache.invalidate_books([book_id], lists=True)
+    logger.info("Book deleted: %s (ID: %d)", db_book.title, book_id)
     return {"message": "Book deleted successfully"}
\ No newline at end of file
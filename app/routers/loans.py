@@ -1,35 +1,277 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import Date, Integer, any_, bindparam, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.core.catalog_cache import catalog_cache
+from app.core.config import settings
+from app.core.etag import compute_etag, conditional_response
+from app.core.export import export_response
+from app.core.metrics import LOANS_CREATED, LOANS_RETURNED
+from app.core.overdue import due_date_for
+from app.core.pagination import decode_cursor, encode_cursor, keyset_condition, set_next_cursor
 from app.security import get_current_user
 from datetime import date
 import logging
-from sqlalchemy.orm import joinedload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Colonnes du livre retournées par les mises à jour des exemplaires disponibles
+# (sans le vecteur de recherche, jamais chargé avec le livre)
+BOOK_RETURNING_COLUMNS = [
+    column for column in models.Book.__table__.c if column.key != "search_vector"
+]
 
-# Fonction utilitaire pour vérifier la disponibilité d'un livre
-def check_book_availability(db: Session, book_id: int) -> bool:
+
+# Fonction utilitaire pour expliquer l'échec d'un emprunt
+async def checkout_error(db: AsyncSession, book_id: int) -> HTTPException:
     """
-    Vérifie si un livre est disponible pour l'emprunt.
+    Détermine pourquoi aucun exemplaire d'un livre n'a pu être réservé.
+    Appelée uniquement lorsque la réservation a échoué.
 
     Args:
-        db (Session): La session de base de données.
-        book_id (int): L'ID du livre à vérifier.
+        db (AsyncSession): La session de base de données.
+        book_id (int): L'ID du livre demandé.
 
     Returns:
-        bool: True si le livre est disponible, False sinon.
+        HTTPException: L'erreur à lever (404 si le livre n'existe pas,
+            400 s'il n'a plus d'exemplaire disponible).
     """
-    book = db.query(models.Book).filter(models.Book.id == book_id).first()
-    if not book:
-        raise HTTPException(
+    result = await db.execute(select(models.Book.id).where(models.Book.id == book_id))
+    if result.first() is None:
+        return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
         )
-    return book.available_copies > 0
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Book not available for loan",
+    )
+
+
+
+# Requête de base pour les emprunts avec les détails du livre et du membre
+def loan_details_query():
+    """
+    Construit une requête qui joint chaque emprunt à son livre et à son membre,
+    pour obtenir tous les détails en un seul aller-retour vers la base.
+
+    Returns:
+        Select: La requête (colonnes de l'emprunt, entités Book et Member).
+    """
+    loans = models.loan_association_table
+    return (
+        select(loans, models.Book, models.Member)
+        .join(models.Book, models.Book.id == loans.c.book_id)
+        .join(models.Member, models.Member.id == loans.c.member_id)
+    )
+
+
+# Requête d'emprunt : réserve les exemplaires et crée les emprunts en une seule requête
+def checkout_statement(book_condition):
+    """
+    Construit la requête qui réserve un exemplaire de chaque livre sélectionné
+    et crée les emprunts correspondants pour un membre.
+
+    La mise à jour conditionnelle (available_copies > 0) verrouille la ligne de
+    chaque livre : deux emprunts simultanés du dernier exemplaire ne peuvent pas
+    réussir tous les deux.  Aucune ligne n'est retournée pour un livre qui
+    n'existe pas ou n'a plus d'exemplaire disponible.
+
+    Paramètres : ceux de book_condition, member_id, loan_date, due_date.
+
+    Args:
+        book_condition (ColumnElement): La sélection des livres à emprunter.
+
+    Returns:
+        Select: La requête, dont les lignes ont la forme de loan_details_query.
+    """
+    loans = models.loan_association_table
+    books = models.Book.__table__
+    reserved = (
+        books.update()
+        .where(book_condition, books.c.available_copies > 0)
+        .values(available_copies=books.c.available_copies - 1, version=books.c.version + 1)
+        .returning(*BOOK_RETURNING_COLUMNS)
+        .cte("reserved")
+    )
+    created = (
+        loans.insert()
+        .from_select(
+            ["book_id", "member_id", "loan_date", "due_date", "status"],
+            select(
+                reserved.c.id,
+                bindparam("member_id", type_=Integer),
+                bindparam("loan_date", type_=Date),
+                bindparam("due_date", type_=Date),
+                literal("En cours"),
+            ),
+        )
+        .returning(loans)
+        .cte("created")
+    )
+    book = aliased(models.Book, reserved, name="Book")
+    return (
+        select(created, book, models.Member)
+        .join(book, book.id == created.c.book_id)
+        .join(models.Member, models.Member.id == created.c.member_id)
+    )
+
+
+# Requête de retour : clôt les emprunts et rend les exemplaires en une seule requête
+def return_statement(loan_condition):
+    """
+    Construit la requête qui enregistre le retour des emprunts sélectionnés
+    et rend les exemplaires à leurs livres.
+
+    La condition sur return_date empêche un double retour de rendre deux
+    exemplaires.  Aucune ligne n'est retournée pour un emprunt qui n'existe
+    pas ou a déjà été retourné.
+
+    Paramètres : ceux de loan_condition, return_date.
+
+    Args:
+        loan_condition (ColumnElement): La sélection des emprunts à clôturer.
+
+    Returns:
+        Select: La requête, dont les lignes ont la forme de loan_details_query.
+    """
+    loans = models.loan_association_table
+    books = models.Book.__table__
+    returned = (
+        loans.update()
+        .where(loan_condition, loans.c.return_date.is_(None))
+        .values(
+            return_date=bindparam("return_date", type_=Date),
+            status="Retourné",
+            version=loans.c.version + 1,
+        )
+        .returning(loans)
+        .cte("returned")
+    )
+    # Une mise à jour ne modifie qu'une fois chaque livre : les retours sont
+    # comptés par livre.
+    returned_per_book = (
+        select(returned.c.book_id, func.count().label("copies"))
+        .group_by(returned.c.book_id)
+        .subquery("returned_per_book")
+    )
+    released = (
+        books.update()
+        .where(books.c.id == returned_per_book.c.book_id)
+        .values(
+            available_copies=books.c.available_copies + returned_per_book.c.copies,
+            version=books.c.version + 1,
+        )
+        .returning(*BOOK_RETURNING_COLUMNS)
+        .cte("released")
+    )
+    book = aliased(models.Book, released, name="Book")
+    return (
+        select(returned, book, models.Member)
+        .join(book, book.id == returned.c.book_id)
+        .join(models.Member, models.Member.id == returned.c.member_id)
+    )
+
+
+# Requêtes construites une seule fois, exécutées avec leurs paramètres
+CHECKOUT_STATEMENT = checkout_statement(models.Book.id == bindparam("book_id"))
+RETURN_STATEMENT = return_statement(
+    models.loan_association_table.c.id == bindparam("loan_id")
+)
+BATCH_CHECKOUT_STATEMENT = checkout_statement(
+    models.Book.id == any_(bindparam("book_ids", type_=ARRAY(Integer)))
+)
+BATCH_RETURN_STATEMENT = return_statement(
+    models.loan_association_table.c.id == any_(bindparam("loan_ids", type_=ARRAY(Integer)))
+)
+
+
+# Filtres communs à la liste et à l'export des emprunts
+def filter_loans(query, status_filter: Optional[str]):
+    """
+    Applique à la requête les filtres de GET /loans.
+
+    Args:
+        query (Select): La requête sur les emprunts.
+        status_filter (str, optional): Filtrer les emprunts par statut.
+
+    Returns:
+        Select: La requête filtrée.
+    """
+    if status_filter:
+        query = query.where(models.loan_association_table.c.status == status_filter)
+    return query
+
+
+# Conversion d'une ligne de loan_details_query en schéma LoanWithDetails
+def to_loan_with_details(row) -> schemas.LoanWithDetails:
+    """
+    Construit le schéma LoanWithDetails à partir d'une ligne de loan_details_query.
+
+    Args:
+        row (Row): Une ligne retournée par loan_details_query.
+
+    Returns:
+        schemas.LoanWithDetails: L'emprunt avec les détails du livre et du membre.
+    """
+    # Une seule validation : le livre et le membre sont lus par leurs attributs
+    return schemas.LoanWithDetails.model_validate(
+        {
+            "id": row.id,
+            "book": row.Book,
+            "member": row.Member,
+            "loan_date": row.loan_date,
+            "due_date": row.due_date,
+            "return_date": row.return_date,
+            "status": row.status,
+        },
+        from_attributes=True,
+    )
+
+
+# Versions dont dépend la représentation d'un emprunt (pour son ETag)
+def loan_versions(row) -> tuple:
+    """
+    Retourne l'ID et la version de l'emprunt, ainsi que les versions de son
+    livre et de son membre, inclus dans LoanWithDetails.
+
+    Args:
+        row (Row): Une ligne retournée par loan_details_query.
+
+    Returns:
+        tuple: (ID, version de l'emprunt, version du livre, version du membre).
+    """
+    return row.id, row.version, row.Book.version, row.Member.version
+
+
+# Récupère un emprunt et ses détails à partir de son ID
+async def get_loan_row(db: AsyncSession, loan_id: int):
+    """
+    Récupère l'emprunt correspondant à l'ID fourni, avec son livre et son membre.
+
+    Args:
+        db (AsyncSession): La session de base de données.
+        loan_id (int): L'ID de l'emprunt.
+
+    Returns:
+        Row: La ligne de l'emprunt.
+
+    Raises:
+        HTTPException: Si l'emprunt n'est pas trouvé.
+    """
+    loans = models.loan_association_table
+    result = await db.execute(loan_details_query().where(loans.c.id == loan_id))
+    loan = result.first()
+    if not loan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Loan not found"
+        )
+    return loan
 
 
 
@@ -37,7 +279,7 @@ def check_book_availability(db: Session, book_id: int) -> bool:
 @router.post("/", response_model=schemas.LoanWithDetails, status_code=status.HTTP_201_CREATED)
 async def create_loan(
     loan: schemas.LoanCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     """
@@ -45,7 +287,7 @@ async def create_loan(
 
     Args:
         loan (schemas.LoanCreate): Les données de l'emprunt à créer (book_id, member_id).
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
@@ -55,132 +297,337 @@ async def create_loan(
         HTTPException: Si le livre n'est pas trouvé, n'est pas disponible,
             ou si le membre n'est pas trouvé.
     """
-    # Vérifie si le livre existe et est disponible
-    if not check_book_availability(db, loan.book_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Book not available for loan",
+    try:
+        result = await db.execute(
+            CHECKOUT_STATEMENT,
+            {
+                "book_id": loan.book_id,
+                "member_id": loan.member_id,
+                "loan_date": loan.loan_date,
+                "due_date": loan.due_date or due_date_for(loan.loan_date),
+            },
         )
-
-    # Vérifie si le membre existe
-    member = db.query(models.Member).filter(models.Member.id == loan.member_id).first()
-    if not member:
+    except IntegrityError:
+        # Seule la clé étrangère vers le membre peut échouer : le livre vient d'être réservé
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
         )
+    created_loan = result.first()
+    if created_loan is None:
+        raise await checkout_error(db, loan.book_id)
+    await db.commit()
+    await catalog_cache.invalidate_books([loan.book_id])
+    LOANS_CREATED.inc()
 
-    # Crée l'emprunt en utilisant la table d'association
-    book = db.query(models.Book).filter(models.Book.id == loan.book_id).first()
-    book.available_copies -= 1  # Décrémente le nombre d'exemplaires disponibles
-    book.members.append(member)  # Ajoute le membre à la liste des emprunteurs du livre
-
-    # Crée un enregistrement dans la table d'association pour stocker les détails de l'emprunt
-    loan_association = models.loan_association_table.insert().values(
-        book_id=loan.book_id,
-        member_id=loan.member_id,
-        loan_date=loan.loan_date,
-        status="En cours",
+    logger.info(
+        "Loan created: Loan ID %d - Book ID %d - Member ID %d - Status: En cours",
+        created_loan.id, loan.book_id, loan.member_id,
     )
-    db.execute(loan_association)
+    return to_loan_with_details(created_loan)
 
-    db.commit()
 
-    # Récupère l'emprunt avec les détails du livre et du membre pour la réponse
-    created_loan = (
-        db.query(models.loan_association_table)
-        .filter(
-            models.loan_association_table.c.book_id == loan.book_id,
-            models.loan_association_table.c.member_id == loan.member_id,
-        )
-        .first()
-    )
 
-    # Construire manuellement le schéma LoanWithDetails
-    loan_with_details = schemas.LoanWithDetails(
-        id=created_loan[0],  # L'ID de l'emprunt dans la table d'association n'est pas directement exposé.
-        book=schemas.Book.from_orm(book),
-        member=schemas.Member.from_orm(member),
-        loan_date=created_loan[2],
-        return_date=created_loan[3],
-        status=created_loan[4],
+# Construit le résultat d'une opération groupée à partir de ses éléments
+def batch_result(items: List[schemas.LoanBatchItem]) -> schemas.LoanBatchResult:
+    succeeded = sum(1 for item in items if item.loan is not None)
+    return schemas.LoanBatchResult(
+        succeeded=succeeded, failed=len(items) - succeeded, items=items
     )
 
+
+
+# Endpoint pour emprunter plusieurs livres pour un membre
+@router.post("/batch/checkout", response_model=schemas.LoanBatchResult)
+async def batch_checkout(
+    batch: schemas.LoanBatchCheckout,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Crée en une transaction un emprunt par livre demandé pour un membre.
+
+    Les exemplaires de tous les livres sont réservés par une seule requête ;
+    les livres introuvables ou indisponibles sont signalés dans le résultat
+    sans empêcher les autres emprunts.
+
+    Args:
+        batch (schemas.LoanBatchCheckout): Le membre, les livres à emprunter et les dates.
+        db (AsyncSession, optional): La session de base de données.
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        schemas.LoanBatchResult: Le résultat de chaque livre demandé, dans l'ordre de la demande.
+
+    Raises:
+        HTTPException: Si le membre n'est pas trouvé.
+    """
+    book_ids = list(dict.fromkeys(batch.book_ids))  # Sans doublons, dans l'ordre
+    try:
+        result = await db.execute(
+            BATCH_CHECKOUT_STATEMENT,
+            {
+                "book_ids": book_ids,
+                "member_id": batch.member_id,
+                "loan_date": batch.loan_date,
+                "due_date": batch.due_date or due_date_for(batch.loan_date),
+            },
+        )
+    except IntegrityError:
+        # Seule la clé étrangère vers le membre peut échouer
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
+        )
+    created = {row.book_id: to_loan_with_details(row) for row in result}
+
+    # Cas d'échec uniquement : distingue les livres introuvables des livres indisponibles
+    missing = [book_id for book_id in book_ids if book_id not in created]
+    existing = set()
+    if missing:
+        if not created:
+            # Aucun emprunt créé : la clé étrangère n'a pas vérifié le membre
+            result = await db.execute(
+                select(models.Member.id).where(models.Member.id == batch.member_id)
+            )
+            if result.first() is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
+                )
+        result = await db.execute(select(models.Book.id).where(models.Book.id.in_(missing)))
+        existing = set(result.scalars().all())
+    await db.commit()
+    await catalog_cache.invalidate_books(created)
+    LOANS_CREATED.inc(len(created))
+
+    items, seen = [], set()
+    for book_id in batch.book_ids:
+        if book_id in seen:
+            item = schemas.LoanBatchItem(
+                id=book_id, status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate book in request"
+            )
+        elif book_id in created:
+            item = schemas.LoanBatchItem(
+                id=book_id, status_code=status.HTTP_201_CREATED, loan=created[book_id]
+            )
+        elif book_id in existing:
+            item = schemas.LoanBatchItem(
+                id=book_id, status_code=status.HTTP_400_BAD_REQUEST, detail="Book not available for loan"
+            )
+        else:
+            item = schemas.LoanBatchItem(
+                id=book_id, status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
+            )
+        seen.add(book_id)
+        items.append(item)
+
     logger.info(
-        f"Loan created: Book ID {loan.book_id} - Member ID {loan.member_id} - Status: En cours"
+        "Batch checkout for Member ID %d: %d loans created, %d failed",
+        batch.member_id, len(created), len(items) - len(created),
     )
-    return loan_with_details
+    return batch_result(items)
+
+
+
+# Endpoint pour retourner plusieurs emprunts
+@router.post("/batch/return", response_model=schemas.LoanBatchResult)
+async def batch_return(
+    batch: schemas.LoanBatchReturn,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Enregistre en une transaction le retour de plusieurs emprunts.
+
+    Les emprunts sont clôturés et les exemplaires rendus par une seule requête ;
+    les emprunts introuvables ou déjà retournés sont signalés dans le résultat
+    sans empêcher les autres retours.
+
+    Args:
+        batch (schemas.LoanBatchReturn): Les IDs des emprunts à clôturer.
+        db (AsyncSession, optional): La session de base de données.
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        schemas.LoanBatchResult: Le résultat de chaque emprunt demandé, dans l'ordre de la demande.
+    """
+    loans = models.loan_association_table
+    loan_ids = list(dict.fromkeys(batch.loan_ids))  # Sans doublons, dans l'ordre
+    result = await db.execute(
+        BATCH_RETURN_STATEMENT, {"loan_ids": loan_ids, "return_date": date.today()}
+    )
+    rows = result.all()
+    returned = {row.id: to_loan_with_details(row) for row in rows}
+
+    # Cas d'échec uniquement : distingue les emprunts introuvables des emprunts déjà retournés
+    missing = [loan_id for loan_id in loan_ids if loan_id not in returned]
+    existing = set()
+    if missing:
+        result = await db.execute(select(loans.c.id).where(loans.c.id.in_(missing)))
+        existing = set(result.scalars().all())
+    await db.commit()
+    await catalog_cache.invalidate_books({row.book_id for row in rows})
+    LOANS_RETURNED.inc(len(returned))
+
+    items, seen = [], set()
+    for loan_id in batch.loan_ids:
+        if loan_id in seen:
+            item = schemas.LoanBatchItem(
+                id=loan_id, status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate loan in request"
+            )
+        elif loan_id in returned:
+            item = schemas.LoanBatchItem(
+                id=loan_id, status_code=status.HTTP_200_OK, loan=returned[loan_id]
+            )
+        elif loan_id in existing:
+            item = schemas.LoanBatchItem(
+                id=loan_id, status_code=status.HTTP_400_BAD_REQUEST, detail="Book already returned"
+            )
+        else:
+            item = schemas.LoanBatchItem(
+                id=loan_id, status_code=status.HTTP_404_NOT_FOUND, detail="Loan not found"
+            )
+        seen.add(loan_id)
+        items.append(item)
+
+    logger.info("Batch return: %d loans returned, %d failed", len(returned), len(items) - len(returned))
+    return batch_result(items)
 
 
 
 # Endpoint pour récupérer tous les emprunts
 @router.get("/", response_model=List[schemas.LoanWithDetails])
 async def get_loans(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Curseur de la page suivante (remplace skip)"),
     status_filter: Optional[str] = Query(None,
-                                            description="Filter by loan status: 'En cours', 'Retourné', 'En retard'"),
+                                            description="Filter by loan status: 'En cours', 'Retourné', 'En retard' "
+                                            "('En cours' excludes overdue loans)"),
     current_user: models.User = Depends(get_current_user),
 ):
     """
     Récupère tous les emprunts, avec pagination et filtrage par statut.
+    Lorsqu'une page est pleine, le curseur de la page suivante est retourné dans
+    les en-têtes X-Next-Cursor et Link. La réponse porte un ETag : une requête
+    avec If-None-Match reçoit une réponse 304 si la page n'a pas changé.
 
     Args:
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (lien de la page suivante, If-None-Match).
+        response (Response): La réponse HTTP (en-têtes de pagination et ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
         skip (int, optional): Le nombre d'éléments à sauter (pour la pagination).
         limit (int, optional): Le nombre maximum d'éléments à retourner (pour la pagination).
+        after (str, optional): Le curseur de la page suivante (pagination par curseur).
         status_filter (str, optional): Filtrer les emprunts par statut ('En cours', 'Retourné', 'En retard').
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
         List[schemas.LoanWithDetails]: La liste des emprunts соответств. aux critères de filtrage et pagination.
     """
-    query = (
-        db.query(models.loan_association_table)
-        .options(
-            joinedload(models.Book), joinedload(models.Member)
-        )  # Charger les détails du livre et du membre
-    )
-
-    if status_filter:
-        query = query.filter(models.loan_association_table.c.status == status_filter)
-
-    # Applique la pagination
-    loans = query.offset(skip).limit(limit).all()
-
-    # Construire la réponse manuellement pour inclure les détails du livre et du membre
-    loans_with_details = []
-    for loan in loans:
-        book = db.query(models.Book).filter(models.Book.id == loan[1]).first()
-        member = db.query(models.Member).filter(models.Member.id == loan[2]).first()
-        loan_with_details = schemas.LoanWithDetails(
-            id=loan[0],
-            book=schemas.Book.from_orm(book),
-            member=schemas.Member.from_orm(member),
-            loan_date=loan[2],
-            return_date=loan[3],
-            status=loan[4],
+    loans = models.loan_association_table
+    query = filter_loans(loan_details_query(), status_filter)
+
+    # Applique un tri stable (clé primaire) puis la pagination
+    sort_columns = (loans.c.id,)
+    query = query.order_by(*sort_columns)
+    if after:
+        values = decode_cursor(after, "id:asc", sort_columns)
+        query = query.where(keyset_condition(sort_columns, values))
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+
+    if len(rows) == limit:
+        set_next_cursor(
+            request, response, encode_cursor("id:asc", [rows[-1].id])
         )
-        loans_with_details.append(loan_with_details)
+    # Réponse 304 décidée avant la construction des schémas
+    not_modified = conditional_response(
+        request, response, compute_etag("loans", [loan_versions(row) for row in rows])
+    )
+    if not_modified:
+        return not_modified
+    loans_with_details = [to_loan_with_details(row) for row in rows]
 
-    logger.info(f"Retrieved {len(loans_with_details)} loans (skip: {skip}, limit: {limit})")
+    logger.info(
+        "Retrieved %d loans (skip: %d, limit: %d)", len(loans_with_details), skip, limit,
+        extra={"sample": "loans.list"},
+    )
     return loans_with_details
 
 
 
+# Endpoint pour exporter les emprunts (CSV ou NDJSON), sans limite de taille
+@router.get("/export")
+async def export_loans(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[str] = Query(None,
+                                            description="Filter by loan status: 'En cours', 'Retourné', 'En retard' "
+                                            "('En cours' excludes overdue loans)"),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Exporte tous les emprunts correspondant aux filtres de GET /loans, dans le même ordre,
+    avec le titre et l'ISBN du livre et le nom du membre.
+    Les lignes sont lues avec un curseur côté serveur et envoyées au fil de l'eau.
+
+    Args:
+        format (str, optional): Le format du fichier ('csv' ou 'ndjson').
+        status_filter (str, optional): Filtrer les emprunts par statut ('En cours', 'Retourné', 'En retard').
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        StreamingResponse: Le fichier exporté.
+    """
+    loans = models.loan_association_table
+    query = (
+        select(
+            loans.c.id,
+            loans.c.book_id,
+            loans.c.member_id,
+            loans.c.loan_date,
+            loans.c.due_date,
+            loans.c.return_date,
+            loans.c.status,
+            models.Book.title.label("book_title"),
+            models.Book.isbn.label("book_isbn"),
+            models.Member.membership_number,
+            models.Member.first_name.label("member_first_name"),
+            models.Member.last_name.label("member_last_name"),
+        )
+        .join(models.Book, models.Book.id == loans.c.book_id)
+        .join(models.Member, models.Member.id == loans.c.member_id)
+    )
+    query = filter_loans(query, status_filter).order_by(loans.c.id)
+    logger.info("Loans export started by %s (%s)", current_user.username, format)
+    return export_response(query, format, "loans", settings.EXPORT_BATCH_SIZE)
+
+
+
 # Endpoint pour récupérer un emprunt par ID
 @router.get("/{loan_id}", response_model=schemas.LoanWithDetails)
 async def get_loan(
     loan_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     """
     Récupère un emprunt par son ID.
+    La réponse porte un ETag : une requête avec If-None-Match reçoit une
+    réponse 304 si l'emprunt, son livre et son membre n'ont pas changé.
 
     Args:
         loan_id (int): L'ID de l'emprunt à récupérer.
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (en-tête If-None-Match).
+        response (Response): La réponse HTTP (en-tête ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
@@ -189,29 +636,14 @@ async def get_loan(
     Raises:
         HTTPException: Si l'emprunt n'est pas trouvé.
     """
-
-    loan = (
-        db.query(models.loan_association_table)
-        .filter(models.loan_association_table.c.book_id == loan_id)
-        .first()
-    )
-    if not loan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Loan not found"
-        )
-
-    book = db.query(models.Book).filter(models.Book.id == loan[1]).first()
-    member = db.query(models.Member).filter(models.Member.id == loan[2]).first()
-    loan_with_details = schemas.LoanWithDetails(
-        id=loan[0],
-        book=schemas.Book.from_orm(book),
-        member=schemas.Member.from_orm(member),
-        loan_date=loan[2],
-        return_date=loan[3],
-        status=loan[4],
+    loan = await get_loan_row(db, loan_id)
+    not_modified = conditional_response(
+        request, response, compute_etag("loan", *loan_versions(loan))
     )
-    logger.info(f"Retrieved loan with ID {loan_id}")
-    return loan_with_details
+    if not_modified:
+        return not_modified
+    logger.info("Retrieved loan with ID %d", loan_id, extra={"sample": "loans.get"})
+    return to_loan_with_details(loan)
 
 
 
@@ -219,7 +651,7 @@ async def get_loan(
 @router.put("/{loan_id}", response_model=schemas.LoanWithDetails)
 async def return_loan(
     loan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     """
@@ -227,7 +659,7 @@ async def return_loan(
 
     Args:
         loan_id (int): L'ID de l'emprunt dont le livre est retourné.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
@@ -236,98 +668,81 @@ async def return_loan(
     Raises:
         HTTPException: Sil'emprunt n'est pas trouvé ou si le livre a déjà été retourné.
     """
-    # loan = db.query(models.Loan).filter(models.Loan.id == loan_id).first()
-    loan_to_return = (
-        db.query(models.loan_association_table)
-        .filter(models.loan_association_table.c.book_id == loan_id)
-        .first()
+    result = await db.execute(
+        RETURN_STATEMENT, {"loan_id": loan_id, "return_date": date.today()}
     )
-
-    if not loan_to_return:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Loan not found"
-        )
-
-    if loan_to_return[3]:  # Vérifie si la date de retour est déjà définie
+    loan_to_return = result.first()
+    if loan_to_return is None:
+        # Échec : l'emprunt n'existe pas ou a déjà été retourné
+        await get_loan_row(db, loan_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Book already returned",
         )
+    await db.commit()
+    await catalog_cache.invalidate_books([loan_to_return.book_id])
+    LOANS_RETURNED.inc()
 
-    # Met à jour la date de retour
-    # loan.return_date = date.today()
-    # loan.status = "Retourné"
-    update_statement = (
-        models.loan_association_table.update()
-        .where(models.loan_association_table.c.book_id == loan_id)
-        .values(return_date=date.today(), status="Retourné")
-    )
-    db.execute(update_statement)
-
-    # Incrémente le nombre d'exemplaires disponibles du livre
-    book = db.query(models.Book).filter(models.Book.id == loan_to_return[1]).first()
-    book.available_copies += 1
-    db.commit()
-
-    # Récupère l'emprunt mis à jour avec les détails
-    loan = (
-        db.query(models.loan_association_table)
-        .filter(models.loan_association_table.c.book_id == loan_id)
-        .first()
-    )
-    book = db.query(models.Book).filter(models.Book.id == loan[1]).first()
-    member = db.query(models.Member).filter(models.Member.id == loan[2]).first()
-    loan_with_details = schemas.LoanWithDetails(
-        id=loan[0],
-        book=schemas.Book.from_orm(book),
-        member=schemas.Member.from_orm(member),
-        loan_date=loan[2],
-        return_date=loan[3],
-        status=loan[4],
-    )
-    logger.info(f"Loan returned: Loan ID {loan_id}")
-    return loan_with_details
+    logger.info("Loan returned: Loan ID %d", loan_id)
+    return to_loan_with_details(loan_to_return)
 
 
 # Endpoint pour récupérer les emprunts en retard
 @router.get("/overdue/", response_model=List[schemas.LoanWithDetails])
 async def get_overdue_loans(
-    db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Curseur de la page suivante"),
+    current_user: models.User = Depends(get_current_user),
 ):
     """
-    Récupère tous les emprunts en retard (dont la date de retour prévue est dépassée).
+    Récupère les emprunts en retard (non retournés, date de retour prévue dépassée),
+    du plus ancien au plus récent, avec pagination par curseur.
+    Lorsqu'une page est pleine, le curseur de la page suivante est retourné dans
+    les en-têtes X-Next-Cursor et Link. La réponse porte un ETag : une requête
+    avec If-None-Match reçoit une réponse 304 si la page n'a pas changé.
+
+    La requête parcourt l'index partiel des emprunts en cours (date de retour
+    prévue, ID) : elle ne dépend pas du passage périodique au statut "En retard".
 
     Args:
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (lien de la page suivante, If-None-Match).
+        response (Response): La réponse HTTP (en-têtes de pagination et ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
+        limit (int, optional): Le nombre maximum d'éléments à retourner.
+        after (str, optional): Le curseur de la page suivante.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
         List[schemas.LoanWithDetails]: La liste des emprunts en retard.
     """
-    today = date.today()
-   
-    # Requête pour récupérer les emprunts en retard en utilisant la table d'association
-    overdue_loans = (
-        db.query(models.loan_association_table)
-        .filter(
-            models.loan_association_table.c.return_date < today,
-            models.loan_association_table.c.status == "En cours",
-        )
-        .all()
-    )
+    loans = models.loan_association_table
+    sort_columns = (loans.c.due_date, loans.c.id)
 
-    loans_with_details = []
-    for loan in overdue_loans:
-        book = db.query(models.Book).filter(models.Book.id == loan[1]).first()
-        member = db.query(models.Member).filter(models.Member.id == loan[2]).first()
-        loan_with_details = schemas.LoanWithDetails(
-            id=loan[0],
-            book=schemas.Book.from_orm(book),
-            member=schemas.Member.from_orm(member),
-            loan_date=loan[2],
-            return_date=loan[3],
-            status=loan[4],
+    # Une seule requête : emprunts en retard joints à leur livre et à leur membre
+    query = (
+        loan_details_query()
+        .where(loans.c.return_date.is_(None), loans.c.due_date < date.today())
+        .order_by(*sort_columns)
+    )
+    if after:
+        # due_date n'est jamais nulle ici : comparaison de tuples, exploitable par l'index
+        values = decode_cursor(after, "due_date:asc", sort_columns)
+        query = query.where(tuple_(*sort_columns) > tuple_(*values))
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+
+    if len(rows) == limit:
+        set_next_cursor(
+            request, response, encode_cursor("due_date:asc", [rows[-1].due_date, rows[-1].id])
         )
-        loans_with_details.append(loan_with_details)
-    logger.info(f"Retrieved {len(loans_with_details)} overdue loans")
-    return loans_with_details
\ No newline at end of file
+    not_modified = conditional_response(
+        request, response, compute_etag("overdue", [loan_versions(row) for row in rows])
+    )
+    if not_modified:
+        return not_modified
+    loans_with_details = [to_loan_with_details(row) for row in rows]
+    logger.info("Retrieved %d overdue loans", len(loans_with_details), extra={"sample": "loans.overdue"})
+    return loans_with_details
@@ -1,8 +1,13 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.core.config import settings
+from app.core.export import export_response
+from app.core.etag import compute_etag, conditional_response
+from app.core.pagination import decode_cursor, encode_cursor, keyset_condition, set_next_cursor
 from app.security import get_current_user, get_current_admin_user
 from datetime import date
 import logging
@@ -10,12 +15,83 @@ import logging
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Colonnes de tri pour chaque option de "sort".  L'ID termine chaque clé de tri
+# pour la rendre unique (pagination par curseur) ; chaque clé est couverte par
+# un index composite (voir models.Member).  Le tri par nom de famille départage
+# par prénom, comme le tri par défaut.
+MEMBER_SORT_COLUMNS = {
+    "first_name": (models.Member.first_name, models.Member.id),
+    "last_name": (models.Member.last_name, models.Member.first_name, models.Member.id),
+    "join_date": (models.Member.join_date, models.Member.id),
+}
+
+# Colonnes des exports de membres
+MEMBER_EXPORT_COLUMNS = (
+    models.Member.id,
+    models.Member.membership_number,
+    models.Member.first_name,
+    models.Member.last_name,
+    models.Member.email,
+    models.Member.phone_number,
+    models.Member.address,
+    models.Member.join_date,
+    models.Member.user_id,
+)
+
+
+# Tri de l'historique des emprunts d'un membre (du plus récent au plus ancien),
+# couvert par l'index (member_id, loan_date, id) parcouru à rebours
+MEMBER_LOAN_SORT_COLUMNS = (
+    models.loan_association_table.c.loan_date,
+    models.loan_association_table.c.id,
+)
+
+# Filtres et tri communs à la liste et à l'export des membres
+def filter_members(
+    query, first_name: Optional[str], last_name: Optional[str], email: Optional[str]
+):
+    """
+    Applique à la requête les filtres de GET /members.
+
+    Args:
+        query (Select): La requête sur les membres.
+        first_name (str, optional): Filtrer les membres par prénom.
+        last_name (str, optional): Filtrer les membres par nom de famille.
+        email (str, optional): Filtrer les membres par email.
+
+    Returns:
+        Select: La requête filtrée.
+    """
+    if first_name:
+        query = query.where(
+            models.Member.first_name.ilike(f"%{first_name}%")
+        )  # Recherche insensible à la casse
+    if last_name:
+        query = query.where(
+            models.Member.last_name.ilike(f"%{last_name}%")
+        )  # Recherche insensible à la casse
+    if email:
+        query = query.where(models.Member.email.ilike(f"%{email}%"))
+    return query
+
+
+def member_sort(sort: Optional[str], order: Optional[str]):
+    """
+    Retourne les colonnes de tri, le sens du tri et l'identifiant du tri
+    (utilisé par les curseurs) pour les paramètres "sort" et "order".
+    Le tri par défaut est par nom puis prénom.
+    """
+    sort_columns = MEMBER_SORT_COLUMNS[sort or "last_name"]
+    descending = bool(sort) and order == "desc"
+    sort_key = f"{sort or 'last_name'}:{'desc' if descending else 'asc'}"
+    return sort_columns, descending, sort_key
+
 
 # Endpoint pour créer un nouveau membre (accessible uniquement aux administrateurs)
 @router.post("/", response_model=schemas.Member, status_code=status.HTTP_201_CREATED)
 async def create_member(
     member: schemas.MemberCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user),
 ):
     """
@@ -23,7 +99,7 @@ async def create_member(
 
     Args:
         member (schemas.MemberCreate): Les données du membre à créer.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
             Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
 
@@ -34,11 +110,10 @@ async def create_member(
         HTTPException: Si le numéro de membre ou l'email est déjà utilisé.
     """
     # Vérifie si le numéro de membre est déjà utilisé
-    db_member_by_membership_number = (
-        db.query(models.Member)
-        .filter(models.Member.membership_number == member.membership_number)
-        .first()
+    result = await db.execute(
+        select(models.Member).where(models.Member.membership_number == member.membership_number)
     )
+    db_member_by_membership_number = result.scalars().first()
     if db_member_by_membership_number:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,15 +121,15 @@ async def create_member(
         )
 
     # Vérifie si l'email est déjà utilisé
-    db_member_by_email = (
-        db.query(models.Member).filter(models.Member.email == member.email).first()
-    )
+    result = await db.execute(select(models.Member).where(models.Member.email == member.email))
+    db_member_by_email = result.scalars().first()
     if db_member_by_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
     # verifier si l'user_id existe
-    user = db.query(models.User).filter(models.User.id == member.user_id).first()
+    result = await db.execute(select(models.User).where(models.User.id == member.user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -72,9 +147,9 @@ async def create_member(
         user_id=member.user_id,
     )
     db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
-    logger.info(f"Member created: {db_member.first_name} {db_member.last_name} (ID: {db_member.id})")
+    await db.commit()
+    await db.refresh(db_member)
+    logger.info("Member created: %s %s (ID: %d)", db_member.first_name, db_member.last_name, db_member.id)
     return db_member
 
 
@@ -82,23 +157,32 @@ async def create_member(
 # Endpoint pour récupérer tous les membres avec pagination, filtrage et tri
 @router.get("/", response_model=List[schemas.Member])
 async def get_members(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Curseur de la page suivante (remplace skip)"),
     first_name: Optional[str] = Query(None),
     last_name: Optional[str] = Query(None),
     email: Optional[str] = Query(None),
-    sort: Optional[str] = Query(None, regex="^(first_name|last_name|join_date)$"),
-    order: Optional[str] = Query("asc", regex="^(asc|desc)$"),
+    sort: Optional[str] = Query(None, pattern="^(first_name|last_name|join_date)$"),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$"),
     current_user: models.User = Depends(get_current_user),
 ):
     """
     Récupère tous les membres de la base de données, avec pagination, filtrage et tri.
+    Lorsqu'une page est pleine, le curseur de la page suivante est retourné dans
+    les en-têtes X-Next-Cursor et Link. La réponse porte un ETag : une requête
+    avec If-None-Match reçoit une réponse 304 si la page n'a pas changé.
 
     Args:
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (lien de la page suivante, If-None-Match).
+        response (Response): La réponse HTTP (en-têtes de pagination et ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
         skip (int, optional): Le nombre d'éléments à sauter (pour la pagination).
         limit (int, optional): Le nombre maximum d'éléments à retourner (pour la pagination).
+        after (str, optional): Le curseur de la page suivante (pagination par curseur).
         first_name (str, optional): Filtrer les membres par prénom.
         last_name (str, optional): Filtrer les membres par nom de famille.
         email (str, optional): Filtrer les membres par email.
@@ -109,49 +193,100 @@ async def get_members(
     Returns:
         List[schemas.Member]: La liste des membres соответств. aux critères de filtrage, tri et pagination.
     """
-    query = db.query(models.Member)
-
     # Applique les filtres si des valeurs sont fournies
-    if first_name:
-        query = query.filter(
-            models.Member.first_name.ilike(f"%{first_name}%")
-        )  # Recherche insensible à la casse
-    if last_name:
-        query = query.filter(
-            models.Member.last_name.ilike(f"%{last_name}%")
-        )  # Recherche insensible à la casse
-    if email:
-        query = query.filter(models.Member.email.ilike(f"%{email}%"))
-
-    # Applique le tri si un champ de tri est fourni
-    if sort:
-        if order == "asc":
-            query = query.order_by(getattr(models.Member, sort))
-        else:
-            query = query.order_by(getattr(models.Member, sort).desc())
-    else:
-        query = query.order_by(models.Member.last_name, models.Member.first_name)  # Tri par défaut
+    query = filter_members(select(models.Member), first_name, last_name, email)
 
-    # Applique la pagination
-    members = query.offset(skip).limit(limit).all()
-    logger.info(f"Retrieved {len(members)} members (skip: {skip}, limit: {limit})")
+    # Applique le tri (par défaut par nom puis prénom)
+    sort_columns, descending, sort_key = member_sort(sort, order)
+    query = query.order_by(
+        *(column.desc() if descending else column for column in sort_columns)
+    )
+
+    # Applique la pagination : par curseur si "after" est fourni, sinon par décalage
+    if after:
+        values = decode_cursor(after, sort_key, sort_columns)
+        query = query.where(keyset_condition(sort_columns, values, descending))
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    members = result.scalars().all()
+
+    if len(members) == limit:
+        last = members[-1]
+        set_next_cursor(
+            request,
+            response,
+            encode_cursor(sort_key, [getattr(last, column.key) for column in sort_columns]),
+        )
+    # Réponse 304 si le client possède déjà cette page (mêmes membres, mêmes versions)
+    not_modified = conditional_response(
+        request, response, compute_etag("members", [(member.id, member.version) for member in members])
+    )
+    if not_modified:
+        return not_modified
+    logger.info(
+        "Retrieved %d members (skip: %d, limit: %d)", len(members), skip, limit, extra={"sample": "members.list"}
+    )
     return members
 
 
 
+# Endpoint pour exporter les membres (CSV ou NDJSON), sans limite de taille
+@router.get("/export")
+async def export_members(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    first_name: Optional[str] = Query(None),
+    last_name: Optional[str] = Query(None),
+    email: Optional[str] = Query(None),
+    sort: Optional[str] = Query(None, pattern="^(first_name|last_name|join_date)$"),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$"),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Exporte tous les membres correspondant aux filtres de GET /members, dans le même ordre.
+    Les lignes sont lues avec un curseur côté serveur et envoyées au fil de l'eau.
+
+    Args:
+        format (str, optional): Le format du fichier ('csv' ou 'ndjson').
+        first_name (str, optional): Filtrer les membres par prénom.
+        last_name (str, optional): Filtrer les membres par nom de famille.
+        email (str, optional): Filtrer les membres par email.
+        sort (str, optional): Le champ sur lequel trier les membres.
+        order (str, optional): L'ordre de tri ('asc' ou 'desc').
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        StreamingResponse: Le fichier exporté.
+    """
+    query = filter_members(select(*MEMBER_EXPORT_COLUMNS), first_name, last_name, email)
+    sort_columns, descending, _ = member_sort(sort, order)
+    query = query.order_by(
+        *(column.desc() if descending else column for column in sort_columns)
+    )
+    logger.info("Members export started by %s (%s)", current_user.username, format)
+    return export_response(query, format, "members", settings.EXPORT_BATCH_SIZE)
+
+
+
 # Endpoint pour récupérer un membre par ID
 @router.get("/{member_id}", response_model=schemas.Member)
 async def get_member(
     member_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     """
     Récupère un membre par son ID.
+    La réponse porte un ETag : une requête avec If-None-Match reçoit une
+    réponse 304 si le membre n'a pas changé.
 
     Args:
         member_id (int): L'ID du membre à récupérer.
-        db (Session, optional): La session de base de données.
+        request (Request): La requête HTTP (en-tête If-None-Match).
+        response (Response): La réponse HTTP (en-tête ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
 
     Returns:
@@ -161,22 +296,204 @@ async def get_member(
         HTTPException: Si le membre n'est pas trouvé.
     """
     # Récupère le membre
-    db_member = db.query(models.Member).filter(models.Member.id == member_id).first()
+    result = await db.execute(select(models.Member).where(models.Member.id == member_id))
+    db_member = result.scalars().first()
     if not db_member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
         )
-    logger.info(f"Retrieved member with ID {member_id}: {db_member.first_name} {db_member.last_name}")
+    not_modified = conditional_response(
+        request, response, compute_etag("member", db_member.id, db_member.version)
+    )
+    if not_modified:
+        return not_modified
+    logger.info(
+        "Retrieved member with ID %d: %s %s", member_id, db_member.first_name, db_member.last_name,
+        extra={"sample": "members.get"},
+    )
     return db_member
 
 
 
+# Requête de l'historique des emprunts d'un membre
+def member_loans_query(
+    member_id: int,
+    status_filter: Optional[str],
+    loan_date_from: Optional[date],
+    loan_date_to: Optional[date],
+    after_values: Optional[list],
+    limit: int,
+):
+    """
+    Construit la requête qui retourne, en un seul aller-retour, une page des
+    emprunts d'un membre jointe à leurs livres, et le nombre d'emprunts en
+    cours et en retard du membre.
+
+    La page est lue par l'index (member_id, loan_date, id), puis jointe au
+    membre par une jointure externe : la requête retourne une ligne (sans
+    emprunt) si la page est vide, et aucune si le membre n'existe pas.  Les
+    compteurs portent sur tous les emprunts du membre, sans les filtres.
+
+    Args:
+        member_id (int): L'ID du membre.
+        status_filter (str, optional): Filtrer les emprunts par statut.
+        loan_date_from (date, optional): Date d'emprunt minimale (incluse).
+        loan_date_to (date, optional): Date d'emprunt maximale (incluse).
+        after_values (list, optional): Les valeurs de tri du dernier emprunt de
+            la page précédente (curseur décodé).
+        limit (int): Le nombre maximum d'emprunts de la page.
+
+    Returns:
+        Select: La requête (member_id, active_loans, overdue_loans, colonnes de
+            l'emprunt et entité Book, nulles pour une page vide).
+    """
+    loans = models.loan_association_table
+    history = loans.c.member_id == member_id
+    active = loans.c.return_date.is_(None)
+
+    page = select(loans).where(history)
+    if status_filter:
+        page = page.where(loans.c.status == status_filter)
+    if loan_date_from:
+        page = page.where(loans.c.loan_date >= loan_date_from)
+    if loan_date_to:
+        page = page.where(loans.c.loan_date <= loan_date_to)
+    if after_values is not None:
+        page = page.where(keyset_condition(MEMBER_LOAN_SORT_COLUMNS, after_values, descending=True))
+    page = (
+        page.order_by(*(column.desc() for column in MEMBER_LOAN_SORT_COLUMNS))
+        .limit(limit)
+        .subquery("page")
+    )
+
+    return (
+        select(
+            models.Member.id.label("member_id"),
+            select(func.count()).where(history, active).scalar_subquery().label("active_loans"),
+            select(func.count())
+            .where(history, active, loans.c.due_date < date.today())
+            .scalar_subquery()
+            .label("overdue_loans"),
+            page.c.id,
+            page.c.loan_date,
+            page.c.due_date,
+            page.c.return_date,
+            page.c.status,
+            page.c.version,
+            models.Book,
+        )
+        .select_from(models.Member)
+        .outerjoin(page, true())
+        .outerjoin(models.Book, models.Book.id == page.c.book_id)
+        .where(models.Member.id == member_id)
+        .order_by(page.c.loan_date.desc(), page.c.id.desc())
+    )
+
+
+# Endpoint pour récupérer l'historique des emprunts d'un membre
+@router.get("/{member_id}/loans", response_model=schemas.MemberLoanHistory)
+async def get_member_loans(
+    member_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Curseur de la page suivante"),
+    status_filter: Optional[str] = Query(None,
+                                            description="Filter by loan status: 'En cours', 'Retourné', 'En retard' "
+                                            "('En cours' excludes overdue loans)"),
+    loan_date_from: Optional[date] = Query(None, description="Date d'emprunt minimale (incluse)"),
+    loan_date_to: Optional[date] = Query(None, description="Date d'emprunt maximale (incluse)"),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Récupère les emprunts d'un membre, du plus récent au plus ancien, avec les
+    détails de leurs livres, filtrage par statut et par date d'emprunt, et
+    pagination par curseur.  La réponse indique aussi le nombre d'emprunts en
+    cours et en retard du membre.
+    Lorsqu'une page est pleine, le curseur de la page suivante est retourné dans
+    les en-têtes X-Next-Cursor et Link. La réponse porte un ETag : une requête
+    avec If-None-Match reçoit une réponse 304 si la page et les compteurs n'ont
+    pas changé.
+
+    Args:
+        member_id (int): L'ID du membre.
+        request (Request): La requête HTTP (lien de la page suivante, If-None-Match).
+        response (Response): La réponse HTTP (en-têtes de pagination et ETag).
+        db (AsyncSession, optional): La session de lecture (réplica).
+        limit (int, optional): Le nombre maximum d'emprunts à retourner.
+        after (str, optional): Le curseur de la page suivante.
+        status_filter (str, optional): Filtrer les emprunts par statut ('En cours', 'Retourné', 'En retard').
+        loan_date_from (date, optional): Date d'emprunt minimale (incluse).
+        loan_date_to (date, optional): Date d'emprunt maximale (incluse).
+        current_user (models.User, optional): L'utilisateur actuellement authentifié.
+
+    Returns:
+        schemas.MemberLoanHistory: Les compteurs du membre et la page d'emprunts.
+
+    Raises:
+        HTTPException: Si le membre n'est pas trouvé ou si le curseur est invalide.
+    """
+    after_values = decode_cursor(after, "loan_date:desc", MEMBER_LOAN_SORT_COLUMNS) if after else None
+    result = await db.execute(member_loans_query(
+        member_id, status_filter, loan_date_from, loan_date_to, after_values, limit
+    ))
+    rows = result.all()
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
+        )
+    summary = rows[0]
+    # Page vide : une seule ligne, sans emprunt
+    loan_rows = [row for row in rows if row.id is not None]
+
+    if len(loan_rows) == limit:
+        last = loan_rows[-1]
+        set_next_cursor(
+            request, response, encode_cursor("loan_date:desc", [last.loan_date, last.id])
+        )
+    not_modified = conditional_response(
+        request,
+        response,
+        compute_etag(
+            "member_loans", member_id, summary.active_loans, summary.overdue_loans,
+            [(row.id, row.version, row.Book.version) for row in loan_rows],
+        ),
+    )
+    if not_modified:
+        return not_modified
+    history = schemas.MemberLoanHistory.model_validate(
+        {
+            "member_id": member_id,
+            "active_loans": summary.active_loans,
+            "overdue_loans": summary.overdue_loans,
+            "loans": [
+                {
+                    "id": row.id,
+                    "book": row.Book,
+                    "loan_date": row.loan_date,
+                    "due_date": row.due_date,
+                    "return_date": row.return_date,
+                    "status": row.status,
+                }
+                for row in loan_rows
+            ],
+        },
+        from_attributes=True,
+    )
+    logger.info(
+        "Retrieved %d loans of member %d", len(loan_rows), member_id, extra={"sample": "members.loans"}
+    )
+    return history
+
+
+
 # Endpoint pour modifier un membre (accessible uniquement aux administrateurs)
 @router.put("/{member_id}", response_model=schemas.Member)
 async def update_member(
     member_id: int,
     member: schemas.MemberUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user),
 ):
     """
@@ -185,7 +502,7 @@ async def update_member(
     Args:
         member_id (int): L'ID du membre à modifier.
         member (schemas.MemberUpdate): Les nouvelles données du membre.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
             Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
 
@@ -196,7 +513,8 @@ async def update_member(
         HTTPException: Si le membre n'est pas trouvé ou si l'email/numéro de membre est déjà utilisé.
     """
     # Récupère le membre à modifier
-    db_member = db.query(models.Member).filter(models.Member.id == member_id).first()
+    result = await db.execute(select(models.Member).where(models.Member.id == member_id))
+    db_member = result.scalars().first()
     if not db_member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
@@ -204,9 +522,8 @@ async def update_member(
 
     # Vérifie si l'email est déjà utilisé par un autre membre
     if member.email and member.email != db_member.email:
-        email_exists = (
-            db.query(models.Member).filter(models.Member.email == member.email).first()
-        )
+        result = await db.execute(select(models.Member).where(models.Member.email == member.email))
+        email_exists = result.scalars().first()
         if email_exists:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
@@ -217,18 +534,18 @@ async def update_member(
         member.membership_number
         and member.membership_number != db_member.membership_number
     ):
-        membership_number_exists = (
-            db.query(models.Member)
-            .filter(models.Member.membership_number == member.membership_number)
-            .first()
+        result = await db.execute(
+            select(models.Member).where(models.Member.membership_number == member.membership_number)
         )
+        membership_number_exists = result.scalars().first()
         if membership_number_exists:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Membership number already taken",
             )
     if member.user_id and member.user_id != db_member.user_id:
-        user_exists = db.query(models.User).filter(models.User.id == member.user_id).first()
+        result = await db.execute(select(models.User).where(models.User.id == member.user_id))
+        user_exists = result.scalars().first()
         if not user_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -251,9 +568,10 @@ async def update_member(
         db_member.join_date = member.join_date
     if member.user_id:
         db_member.user_id = member.user_id
-    db.commit()
-    db.refresh(db_member)
-    logger.info(f"Member updated: {db_member.first_name} {db_member.last_name} (ID: {db_member.id})")
+    db_member.version = models.Member.version + 1  # Nouvelle version (ETag)
+    await db.commit()
+    await db.refresh(db_member)
+    logger.info("Member updated: %s %s (ID: %d)", db_member.first_name, db_member.last_name, db_member.id)
     return db_member
 
 
@@ -262,7 +580,7 @@ async def update_member(
 @router.delete("/{member_id}", response_model=dict, status_code=status.HTTP_200_OK)
 async def delete_member(
     member_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user),
 ):
     """
@@ -270,7 +588,7 @@ async def delete_member(
 
     Args:
         member_id (int): L'ID du membre à supprimer.
-        db (Session, optional): La session de base de données.
+        db (AsyncSession, optional): La session de base de données.
         current_user (models.User, optional): L'utilisateur actuellement authentifié.
             Dépend de get_current_admin_user pour vérifier les droits d'administrateur.
 
@@ -281,14 +599,15 @@ async def delete_member(
         HTTPException: Si le membre n'est pas trouvé.
     """
     # Récupère le membre à supprimer
-    db_member = db.query(models.Member).filter(models.Member.id == member_id).first()
+    result = await db.execute(select(models.Member).where(models.Member.id == member_id))
+    db_member = result.scalars().first()
     if not db_member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
         )
 
     # Supprime le membre
-    db.delete(db_member)
-    db.commit()
-    logger.info(f"Member deleted: {db_member.first_name} {db_member.last_name} (ID: {member_id})")
+    await db.delete(db_member)
+    await db.commit()
+    logger.info("Member deleted: %s %s (ID: %d)", db_member.first_name, db_member.last_name, member_id)
     return {"message": "Member deleted successfully"}
\ No newline at end of file
@@ -1,31 +1,43 @@
 from datetime import date
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, validator
+from typing import Literal, Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
-# Schéma pour la création d'un utilisateur
-class UserCreate(BaseModel):
+# Champs communs aux schémas des utilisateurs.  Les schémas de représentation
+# (réponses) reprennent les champs sans les validations d'entrée coûteuses
+# (EmailStr) : les lignes lues en base ont été validées à l'écriture.
+class UserBase(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
-    email: EmailStr
-    password: str = Field(..., min_length=8)
+    email: str
     first_name: str = Field(..., min_length=1, max_length=50)
     last_name: str = Field(..., min_length=1, max_length=50)
     created_at: date = Field(default_factory=date.today)
 
-    @validator("username")
+
+# Schéma pour la création d'un utilisateur
+class UserCreate(UserBase):
+    email: EmailStr
+    password: str = Field(..., min_length=8)
+
+    @field_validator("username")
+    @classmethod
     def validate_username(cls, value):
         if not value.isalnum():
             raise ValueError("Username must contain only alphanumeric characters")
         return value
 
 
-# Schéma pour la représentation d'un utilisateur
-class User(UserCreate):
+# Schéma pour la représentation d'un utilisateur (sans le mot de passe)
+class User(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     role: str
-    last_login: Optional[date]
+    last_login: Optional[date] = None
 
-    class Config:
-        from_attributes = True  # Pydantic v2
+
+# Schéma pour la modification du rôle d'un utilisateur (administrateurs)
+class UserRoleUpdate(BaseModel):
+    role: Literal["member", "librarian", "admin"]
 
 
 # Schéma pour la connexion d'un utilisateur
@@ -35,17 +47,21 @@ class UserLogin(BaseModel):
 
 
 
-# Schéma pour la création d'un livre
-class BookCreate(BaseModel):
+# Champs communs aux schémas des livres
+class BookBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     author: str = Field(..., min_length=1, max_length=200)
     isbn: str = Field(..., min_length=10, max_length=13)
     publisher: Optional[str] = Field(None, max_length=200)
-    publication_date: Optional[date]
+    publication_date: Optional[date] = None
     number_of_copies: int = Field(1, ge=1)
     available_copies: int = Field(1, ge=0)
 
-    @validator("isbn")
+
+# Schéma pour la création d'un livre
+class BookCreate(BookBase):
+    @field_validator("isbn")
+    @classmethod
     def validate_isbn(cls, value):
         if not value.isdigit():
             raise ValueError("ISBN must contain only digits")
@@ -54,11 +70,18 @@ class BookCreate(BaseModel):
 
 
 # Schéma pour la représentation d'un livre
-class Book(BookCreate):
+class Book(BookBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
 
-    class Config:
-        from_attributes = True  # Pydantic v2
+
+
+# Schéma pour une suggestion d'autocomplétion
+class BookSuggestion(BaseModel):
+    id: int
+    title: str
+    author: str
 
 
 
@@ -68,11 +91,12 @@ class BookUpdate(BaseModel):
     author: Optional[str] = Field(None, min_length=1, max_length=200)
     isbn: Optional[str] = Field(None, min_length=10, max_length=13)
     publisher: Optional[str] = Field(None, max_length=200)
-    publication_date: Optional[date]
+    publication_date: Optional[date] = None
     number_of_copies: Optional[int] = Field(None, ge=1)
     available_copies: Optional[int] = Field(None, ge=0)
 
-    @validator("isbn")
+    @field_validator("isbn")
+    @classmethod
     def validate_isbn(cls, value):
         if value is None:  # Permettre à isbn d'être None
             return None
@@ -81,24 +105,28 @@ class BookUpdate(BaseModel):
         return value
 
 
-# Schéma pour la création d'un membre
-class MemberCreate(BaseModel):
+# Champs communs aux schémas des membres
+class MemberBase(BaseModel):
     membership_number: str = Field(..., min_length=5, max_length=20)
     first_name: str = Field(..., min_length=1, max_length=50)
     last_name: str = Field(..., min_length=1, max_length=50)
-    email: EmailStr
+    email: str
     phone_number: Optional[str] = Field(None, max_length=20)
     address: Optional[str] = Field(None, max_length=200)
     join_date: date = Field(default_factory=date.today)
     user_id: int  # Clé étrangère vers l'utilisateur
 
 
+# Schéma pour la création d'un membre
+class MemberCreate(MemberBase):
+    email: EmailStr
+
+
 # Schéma pour la représentation d'un membre
-class Member(MemberCreate):
-    id: int
+class Member(MemberBase):
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True  # Pydantic v2
+    id: int
 
 
 # Schéma pour la mise à jour d'un membre
@@ -106,11 +134,11 @@ class MemberUpdate(BaseModel):
     membership_number: Optional[str] = Field(None, min_length=5, max_length=20)
     first_name: Optional[str] = Field(None, min_length=1, max_length=50)
     last_name: Optional[str] = Field(None, min_length=1, max_length=50)
-    email: Optional[EmailStr]
+    email: Optional[EmailStr] = None
     phone_number: Optional[str] = Field(None, max_length=20)
     address: Optional[str] = Field(None, max_length=200)
     join_date: Optional[date] = Field(None)
-    user_id: Optional[int]
+    user_id: Optional[int] = None
 
 
 
@@ -119,23 +147,77 @@ class LoanCreate(BaseModel):
     book_id: int
     member_id: int
     loan_date: date = Field(default_factory=date.today)
-    return_date: Optional[date]
+    due_date: Optional[date] = None  # Date de retour prévue
+    return_date: Optional[date] = None
     status: str = "En cours"  # Valeur par défaut
 
 # Schéma pour la représentation d'un emprunt
 class Loan(LoanCreate):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
-    class Config:
-        from_attributes = True  # Pydantic v2
 
 # Schéma pour la représentation d'un emprunt avec les détails du livre et du membre
 class LoanWithDetails(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     book: Book
     member: Member
     loan_date: date
-    return_date: Optional[date]
+    due_date: Optional[date] = None
+    return_date: Optional[date] = None
+    status: str
+
+
+# Schéma pour un emprunt de l'historique d'un membre (avec les détails du livre)
+class MemberLoan(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    book: Book
+    loan_date: date
+    due_date: Optional[date] = None
+    return_date: Optional[date] = None
     status: str
 
-    class Config:
-        from_attributes = True  # Pydantic v2
+
+# Schéma pour l'historique des emprunts d'un membre : une page d'emprunts et
+# le nombre d'emprunts en cours et en retard du membre (sans les filtres)
+class MemberLoanHistory(BaseModel):
+    member_id: int
+    active_loans: int
+    overdue_loans: int
+    loans: List[MemberLoan]
+
+
+# Nombre maximal d'éléments d'une opération d'emprunt ou de retour groupée
+LOAN_BATCH_MAX_ITEMS = 100
+
+
+# Schéma pour l'emprunt de plusieurs livres par un membre
+class LoanBatchCheckout(BaseModel):
+    member_id: int
+    book_ids: List[int] = Field(..., min_length=1, max_length=LOAN_BATCH_MAX_ITEMS)
+    loan_date: date = Field(default_factory=date.today)
+    due_date: Optional[date] = None  # Date de retour prévue
+
+
+# Schéma pour le retour de plusieurs emprunts
+class LoanBatchReturn(BaseModel):
+    loan_ids: List[int] = Field(..., min_length=1, max_length=LOAN_BATCH_MAX_ITEMS)
+
+
+# Schéma pour le résultat d'un élément d'une opération groupée
+class LoanBatchItem(BaseModel):
+    id: int  # ID du livre (emprunt) ou de l'emprunt (retour) demandé
+    status_code: int
+    detail: Optional[str] = None
+    loan: Optional[LoanWithDetails] = None
+
+
+# Schéma pour le résultat d'une opération groupée
+class LoanBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[LoanBatchItem]
@@ -1,18 +1,36 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models
 from app.database import get_db
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-# Configuration de Passlib pour la gestion des mots de passe
+T = TypeVar("T")
+
+# Configuration de Passlib pour la gestion des mots de passe.
+# min_rounds/max_rounds sont fixés au coût configuré : tout hachage produit avec
+# un autre coût est signalé par needs_update et recalculé à la connexion.
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Cache des utilisateurs authentifiés, indexé par token JWT.
+# Évite le décodage du token et la requête sur "users" à chaque appel.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
 )
 
 # Configuration de OAuth2 pour l'authentification et l'autorisation
@@ -50,6 +68,97 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Fonction pour vérifier le mot de passe et recalculer son hachage si nécessaire
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Vérifie le mot de passe et, si le hachage stocké n'utilise pas le coût
+    bcrypt configuré, retourne un nouveau hachage à enregistrer.
+
+    Args:
+        plain_password (str): Le mot de passe en clair à vérifier.
+        hashed_password (str): Le hachage du mot de passe stocké.
+
+    Returns:
+        Tuple[bool, Optional[str]]: (mot de passe valide, nouveau hachage ou None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Exécute les opérations bcrypt dans un pool de threads ou de processus
+    pour ne pas bloquer la boucle d'événements.
+
+    Le nombre d'opérations en cours ou en attente est borné : au-delà de
+    max_pending, la requête est rejetée immédiatement (503) au lieu de
+    s'accumuler dans la file du pool.
+    """
+
+    def __init__(self, executor_kind: str, workers: int, max_pending: int):
+        if executor_kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor_kind}")
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        # Création paresseuse : un pool de processus ne doit pas être créé
+        # à l'import, avant le fork des workers du serveur.
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Exécute func(*args) dans le pool et attend son résultat.
+
+        Raises:
+            HTTPException: Si la file d'attente du pool est pleine.
+        """
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, retry later",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def warm_up(self) -> None:
+        """
+        Démarre tous les workers du pool (processus compris) et charge le
+        backend bcrypt, pour que les premières connexions n'en paient pas le coût.
+        """
+        await asyncio.gather(*(self.run(get_password_hash, "warm-up") for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Pool de hachage partagé par les endpoints d'authentification
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_EXECUTOR,
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
 # Fonction pour créer un token JWT
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -107,7 +216,7 @@ def decode_access_token(token: str) -> dict:
 
 # Fonction pour obtenir l'utilisateur actuel à partir du token
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ) -> models.User:
     """
     Obtient l'utilisateur actuel à partir du token JWT fourni dans l'en-tête Authorization.
@@ -115,7 +224,7 @@ async def get_current_user(
     Args:
         token (str, optional): Le token JWT.  Dépend de oauth2_scheme pour l'obtenir
                                 depuis l'en-tête de la requête.
-        db (Session, optional): La session de base de données.  Dépend de get_db pour l'obtenir.
+        db (AsyncSession, optional): La session de base de données.  Dépend de get_db pour l'obtenir.
 
     Returns:
         models.User: L'objet utilisateur correspondant au token.
@@ -123,6 +232,10 @@ async def get_current_user(
     Raises:
         HTTPException: Si le token est invalide, a expiré, ou si l'utilisateur n'existe pas.
     """
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
     payload = decode_access_token(token)  # Décode le token
     username: str = payload.get("sub")  # Récupère le nom d'utilisateur du payload
     if username is None:
@@ -131,18 +244,36 @@ async def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = (
-        db.query(models.User).filter(models.User.username == username).first()
+    result = await db.execute(
+        select(models.User).where(models.User.username == username)
     )  # Récupère l'utilisateur depuis la base de données
+    user = result.scalars().first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # L'utilisateur est détaché de la session pour pouvoir être partagé entre
+    # requêtes ; le cache n'est jamais conservé au-delà de l'expiration du token.
+    db.expunge(user)
+    exp = payload.get("exp")
+    principal_cache.set(token, user, ttl=exp - time.time() if exp else None)
     return user
 
 
+# Fonction pour invalider les entrées du cache d'un utilisateur
+def invalidate_principal(user_id: int) -> None:
+    """
+    Supprime du cache toutes les entrées correspondant à un utilisateur.
+    À appeler après toute modification de son compte (rôle, mot de passe, ...).
+
+    Args:
+        user_id (int): L'ID de l'utilisateur modifié.
+    """
+    principal_cache.discard_where(lambda token, user: user.id == user_id)
+
+
 
 # Fonction pour obtenir l'utilisateur actuel avec les droits d'administrateur
 async def get_current_admin_user(current_user: models.User = Depends(get_current_user)) -> models.User:
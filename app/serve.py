@@ -0,0 +1,130 @@
+"""
+Serveur de production de l'API : plusieurs workers uvicorn derrière un même socket.
+
+    python -m app.serve
+
+Le nombre de workers vient de SERVER_WORKERS, ou du nombre de CPU disponibles
+pour le processus (affinité et quota CPU du conteneur compris).  Chaque worker
+est un processus indépendant (boucle uvloop et parseur httptools lorsqu'ils
+sont installés, avec uvicorn[standard]) : ses pools de connexions sont réduits
+pour que l'ensemble des workers respecte DB_MAX_CONNECTIONS.
+
+L'application est importée une fois dans le processus parent avant le
+lancement des workers, pour échouer immédiatement sur une erreur de
+configuration.  Elle n'est pas partagée par fork : les pools de connexions,
+le pool de hachage et les métriques sont propres à chaque worker, qui
+l'importe à son tour.
+
+À l'arrêt (SIGTERM), chaque worker cesse d'accepter des connexions, laisse
+les requêtes en cours se terminer (SERVER_GRACEFUL_TIMEOUT_SECONDS), puis
+exécute l'arrêt de l'application (voir main.on_shutdown).
+
+En développement, SERVER_RELOAD=true lance un seul processus rechargé à
+chaque modification du code.
+"""
+import importlib
+import importlib.util
+import logging
+import os
+from typing import Tuple
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logs import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """
+    Retourne le nombre de CPU utilisables par le processus : affinité, puis
+    quota CPU du cgroup (limite d'un conteneur) s'il est plus petit.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Plateformes sans sched_getaffinity
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def worker_pool_size(workers: int, pool_size: int, max_overflow: int) -> Tuple[int, int]:
+    """
+    Réduit la taille et le débordement du pool d'un worker pour que `workers`
+    pools restent dans le budget de connexions (DB_MAX_CONNECTIONS moins
+    DB_RESERVED_CONNECTIONS), en gardant leur proportion.
+
+    Returns:
+        Tuple[int, int]: La taille du pool et le débordement par worker.
+
+    Raises:
+        SystemExit: Si le budget ne permet pas une connexion par worker.
+    """
+    budget = (settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS) // workers
+    if budget < 1:
+        raise SystemExit(
+            f"{workers} workers need at least {workers} database connections, but only "
+            f"{settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS} are available "
+            f"(DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS)"
+        )
+    if pool_size + max_overflow <= budget:
+        return pool_size, max_overflow
+    size = max(1, budget * pool_size // (pool_size + max_overflow))
+    return size, budget - size
+
+
+def main() -> None:
+    configure_logging()
+    workers = 1 if settings.SERVER_RELOAD else settings.SERVER_WORKERS or available_cpus()
+
+    # Pools par worker, transmis aux workers par l'environnement (Settings)
+    pools = {
+        "DB": (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+        "DB_REPLICA": (settings.DB_REPLICA_POOL_SIZE, settings.DB_REPLICA_MAX_OVERFLOW),
+    }
+    for prefix, (pool_size, max_overflow) in pools.items():
+        pool_size, max_overflow = worker_pool_size(workers, pool_size, max_overflow)
+        os.environ[f"APP_{prefix}_POOL_SIZE"] = str(pool_size)
+        os.environ[f"APP_{prefix}_MAX_OVERFLOW"] = str(max_overflow)
+        pools[prefix] = (pool_size, max_overflow)
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(
+        "Starting %d worker(s) on %s:%d (loop: %s, http: %s, pool per worker: %d+%d, "
+        "replica pool per worker: %d+%d)",
+        workers, settings.SERVER_HOST, settings.SERVER_PORT, loop, http,
+        *pools["DB"], *pools["DB_REPLICA"],
+    )
+
+    # Import dans le parent : une erreur de configuration arrête le serveur
+    # au lieu de faire redémarrer les workers en boucle
+    if not settings.SERVER_RELOAD:
+        importlib.import_module("app.main")
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        reload=settings.SERVER_RELOAD,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        # Journal des accès désactivé : la latence par route est dans /metrics
+        access_log=False,
+        # Les journaux d'uvicorn passent par la file de l'application (app.core.logs)
+        log_config=None,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    main()
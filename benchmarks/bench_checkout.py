@@ -0,0 +1,218 @@
+"""
+Test de charge des emprunts concurrents (POST /loans et PUT /loans/{id}).
+
+Crée dans la base configurée (APP_DATABASE_URL) --books livres de --copies
+exemplaires et --members membres, puis envoie en parallèle un emprunt par
+membre (les membres sont répartis entre les livres) vers une instance de l'API
+déjà démarrée. Chaque emprunt réussi est ensuite retourné plusieurs fois en
+parallèle.
+
+Le script vérifie qu'aucun exemplaire n'est prêté deux fois :
+  - pour chaque livre, exactement min(copies, membres du livre) emprunts réussissent,
+  - les exemplaires disponibles correspondent aux emprunts réussis, puis
+    reviennent au nombre initial après les retours (un seul retour réussi
+    par emprunt).
+Il affiche aussi le débit et les latences, à comparer entre deux versions.
+Avec un seul livre (--books 1, le défaut), toutes les transactions se
+disputent la même ligne ; avec beaucoup de livres, le débit mesure surtout
+le coût de chaque requête.
+
+Les données de test (éditeur et numéros de membre "bench-checkout") sont
+supprimées à la fin.
+
+Exemple:
+    python -m benchmarks.bench_checkout --base-url http://localhost:8000 \\
+        --username admin --password secretpass --copies 50 --members 500 --concurrency 100
+    python -m benchmarks.bench_checkout --username admin --password secretpass \\
+        --books 1000 --copies 1 --members 1000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.database import engine
+from benchmarks.bench_concurrency import _login, report
+
+BENCH_MARKER = "bench-checkout"
+
+
+async def seed(books: int, copies: int, members: int) -> list:
+    """
+    Crée les livres et les membres (avec leurs utilisateurs) du test.
+
+    Returns:
+        list: Les IDs des livres créés.
+    """
+    async with engine.begin() as conn:
+        book_ids = (await conn.execute(
+            text(
+                "INSERT INTO books (title, author, isbn, publisher, number_of_copies, available_copies) "
+                "SELECT 'Bench checkout ' || g, 'Bench', '99' || lpad(g::text, 11, '0'), :marker, "
+                ":copies, :copies FROM generate_series(1, :books) AS g "
+                "RETURNING id"
+            ),
+            {"marker": BENCH_MARKER, "copies": copies, "books": books},
+        )).scalars().all()
+        await conn.execute(
+            text(
+                "INSERT INTO users (username, email, password_hash, role, first_name, last_name, created_at) "
+                "SELECT 'benchcheckout' || g, 'bench-checkout-' || g || '@example.com', '-', 'member', "
+                "'Bench', 'Checkout', current_date FROM generate_series(1, :members) AS g"
+            ),
+            {"members": members},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO members (membership_number, first_name, last_name, email, join_date, user_id) "
+                "SELECT :marker || '-' || g, 'Bench', 'Checkout', 'bench-checkout-' || g || '@example.com', "
+                "current_date, users.id "
+                "FROM generate_series(1, :members) AS g "
+                "JOIN users ON users.username = 'benchcheckout' || g"
+            ),
+            {"marker": BENCH_MARKER, "members": members},
+        )
+    return sorted(book_ids)
+
+
+async def member_ids() -> list:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT id FROM members WHERE membership_number LIKE :pattern ORDER BY id"),
+            {"pattern": f"{BENCH_MARKER}-%"},
+        )
+        return result.scalars().all()
+
+
+async def available_copies() -> dict:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT id, available_copies FROM books WHERE publisher = :marker"),
+            {"marker": BENCH_MARKER},
+        )
+        return dict(result.all())
+
+
+async def cleanup() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "DELETE FROM loan_association WHERE book_id IN "
+                "(SELECT id FROM books WHERE publisher = :marker)"
+            ),
+            {"marker": BENCH_MARKER},
+        )
+        await conn.execute(text("DELETE FROM books WHERE publisher = :marker"), {"marker": BENCH_MARKER})
+        await conn.execute(
+            text("DELETE FROM members WHERE membership_number LIKE :pattern"),
+            {"pattern": f"{BENCH_MARKER}-%"},
+        )
+        await conn.execute(text("DELETE FROM users WHERE username LIKE 'benchcheckout%'"))
+
+
+async def fire(client: httpx.AsyncClient, requests: list, concurrency: int):
+    """
+    Envoie les requêtes (méthode, chemin, corps JSON) en parallèle.
+
+    Returns:
+        tuple: (réponses, latences, durée totale).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request(method: str, path: str, body):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            return response
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(one_request(*request) for request in requests))
+    return responses, latencies, time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> bool:
+    book_ids = await seed(args.books, args.copies, args.members)
+    members = await member_ids()
+    # Répartition des membres entre les livres, et nombre de demandes par livre
+    assignments = [(book_ids[index % len(book_ids)], member_id) for index, member_id in enumerate(members)]
+    demand = {book_id: 0 for book_id in book_ids}
+    for book_id, _ in assignments:
+        demand[book_id] += 1
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60.0) as client:
+        token = await _login(client, args.username, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        checkouts = [
+            ("POST", "/loans/", {"book_id": book_id, "member_id": member_id, "return_date": None})
+            for book_id, member_id in assignments
+        ]
+        responses, latencies, elapsed = await fire(client, checkouts, args.concurrency)
+        created = [response.json() for response in responses if response.status_code == 201]
+        refused = sum(1 for response in responses if response.status_code == 400)
+        errors = len(responses) - len(created) - refused
+        print("checkout")
+        report(latencies, elapsed, errors, args.concurrency)
+        after_checkout = await available_copies()
+
+        returns = [("PUT", f"/loans/{loan['id']}", None) for loan in created for _ in range(args.returns)]
+        responses, latencies, elapsed = await fire(client, returns, args.concurrency)
+        returned = sum(1 for response in responses if response.status_code == 200)
+        errors = sum(1 for response in responses if response.status_code not in (200, 400))
+        print("\nreturn")
+        report(latencies, elapsed, errors, args.concurrency)
+        after_return = await available_copies()
+
+    loaned = {book_id: 0 for book_id in book_ids}
+    for loan in created:
+        loaned[loan["book"]["id"]] += 1
+    expected = sum(min(args.copies, count) for count in demand.values())
+    checks = [
+        (f"successful checkouts == {expected}", len(created) == expected),
+        (
+            "no book loaned beyond its copies",
+            all(loaned[book_id] == min(args.copies, demand[book_id]) for book_id in book_ids),
+        ),
+        (
+            "available copies after checkout == copies - loans",
+            all(after_checkout[book_id] == args.copies - loaned[book_id] for book_id in book_ids),
+        ),
+        (f"successful returns == {len(created)}", returned == len(created)),
+        (
+            f"available copies after return == {args.copies}",
+            all(count == args.copies for count in after_return.values()),
+        ),
+    ]
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+    return all(passed for _, passed in checks)
+
+
+async def main_async(args: argparse.Namespace) -> bool:
+    try:
+        return await run(args)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--books", type=int, default=1)
+    parser.add_argument("--copies", type=int, default=50, help="Exemplaires par livre")
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--returns", type=int, default=3, help="Retours concurrents par emprunt")
+    parser.add_argument("--concurrency", type=int, default=100)
+    raise SystemExit(0 if asyncio.run(main_async(parser.parse_args())) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark de débit en requêtes concurrentes.
+
+Envoie un grand nombre de requêtes authentifiées en parallèle vers une instance
+de l'API déjà démarrée, puis affiche le débit (requêtes/s) et la latence.
+Lancer le script sur deux versions de l'application (avant / après un
+changement) permet de comparer leur comportement sous charge.
+
+Exemple:
+    python -m benchmarks.bench_concurrency --base-url http://localhost:8000 \\
+        --username admin --password secretpass --concurrency 50 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    """
+    Récupère un token d'accès via /auth/login.
+    """
+    response = await client.post(
+        "/auth/login", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30.0) as client:
+        token = await _login(client, args.username, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+        errors = 0
+
+        async def one_request():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(args.path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    print(f"path:        {args.path}")
+    report(latencies, elapsed, errors, args.concurrency)
+
+
+def report(latencies: list, elapsed: float, errors: int, concurrency: int) -> None:
+    """
+    Affiche le débit et les percentiles de latence d'une série de requêtes.
+    """
+    quantiles = statistics.quantiles(sorted(latencies), n=100)
+    print(f"requests:    {len(latencies)} (concurrency {concurrency}, errors {errors})")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50: {quantiles[49] * 1000:.1f} ms")
+    print(f"latency p95: {quantiles[94] * 1000:.1f} ms")
+    print(f"latency p99: {quantiles[98] * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", default="/books/?limit=10")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
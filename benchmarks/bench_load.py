@@ -0,0 +1,421 @@
+"""
+Test de charge de l'API sur des mélanges de requêtes réalistes, avec référence JSON.
+
+Crée dans la base configurée (APP_DATABASE_URL) un jeu de données marqué
+"bench-load" (livres, membres, emprunts en retard, un administrateur), puis
+envoie pendant --duration secondes, avec --concurrency clients simultanés, des
+requêtes tirées au hasard selon le profil --mix :
+  - catalog : recherche plein texte, liste filtrée, détail et autocomplétion,
+  - login : connexions (/auth/login, hachage bcrypt),
+  - checkout : emprunt puis retour immédiat d'un livre,
+  - overdue : liste des emprunts en retard,
+  - mixed : mélange des profils précédents (défaut).
+
+Par défaut l'application (app.main:app) est exécutée dans le processus du
+script (httpx.ASGITransport) : client et serveur partagent la même boucle
+d'événements, ce qui suffit pour comparer deux versions entre elles.
+--base-url cible plutôt une instance déjà démarrée sur la même base.
+
+Le débit et les latences p50/p95/p99 sont affichés par endpoint. --save les
+enregistre dans un fichier JSON de référence ; --compare les compare à une
+référence et termine en erreur si la latence p95 ou le débit d'un endpoint se
+dégrade de plus de --tolerance. Le tirage des requêtes est déterminé par
+--random-seed.
+
+Les données de test sont supprimées à la fin.
+
+Exemple:
+    python -m benchmarks.bench_load --duration 30 --save benchmarks/baseline.json
+    python -m benchmarks.bench_load --duration 30 --compare benchmarks/baseline.json
+    python -m benchmarks.bench_load --base-url http://localhost:8000 --mix checkout
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import httpx
+from sqlalchemy import text
+
+from app.database import engine
+from app.security import get_password_hash
+from benchmarks.bench_concurrency import _login
+from benchmarks.bench_search import AUTHORS, WORDS, _sql_array
+
+BENCH_MARKER = "bench-load"
+ADMIN_USERNAME = "benchload-admin"
+
+# Poids des scénarios de chaque profil
+MIXES = {
+    "catalog": {"search": 4, "list": 3, "detail": 2, "suggest": 1},
+    "login": {"login": 1},
+    "checkout": {"checkout_return": 1},
+    "overdue": {"overdue": 1},
+    "mixed": {
+        "search": 30, "list": 20, "detail": 15, "suggest": 10,
+        "checkout_return": 15, "overdue": 7, "login": 3,
+    },
+}
+
+
+async def seed(books: int, copies: int, members: int, overdue: int, password: str) -> dict:
+    """
+    Crée les livres, les membres (avec leurs utilisateurs), l'administrateur
+    et `overdue` emprunts en retard.
+
+    Returns:
+        dict: Les IDs des livres ("book_ids") et des membres ("member_ids").
+    """
+    words, authors = _sql_array(WORDS), _sql_array(AUTHORS)
+    async with engine.begin() as conn:
+        book_ids = (await conn.execute(
+            text(
+                f"INSERT INTO books (title, author, isbn, publisher, number_of_copies, available_copies) "
+                f"SELECT initcap(w[1 + (g * 7) % {len(WORDS)}]) || ' ' || w[1 + (g * 13) % {len(WORDS)}], "
+                f"a[1 + (g * 3) % {len(AUTHORS)}], '98' || lpad(g::text, 11, '0'), :marker, :copies, :copies "
+                f"FROM generate_series(1, :books) AS g, (SELECT {words} AS w, {authors} AS a) AS vocabulary "
+                f"RETURNING id"
+            ),
+            {"marker": BENCH_MARKER, "copies": copies, "books": books},
+        )).scalars().all()
+        await conn.execute(
+            text(
+                "INSERT INTO users (username, email, password_hash, role, first_name, last_name, created_at) "
+                "SELECT 'benchload' || g, 'bench-load-' || g || '@example.com', '-', 'member', "
+                "'Bench', 'Load', current_date FROM generate_series(1, :members) AS g "
+                "UNION ALL SELECT :admin, 'bench-load-admin@example.com', :hash, 'admin', "
+                "'Bench', 'Load', current_date"
+            ),
+            {"members": members, "admin": ADMIN_USERNAME, "hash": get_password_hash(password)},
+        )
+        member_ids = (await conn.execute(
+            text(
+                "INSERT INTO members (membership_number, first_name, last_name, email, join_date, user_id) "
+                "SELECT :marker || '-' || g, 'Bench', 'Load', 'bench-load-' || g || '@example.com', "
+                "current_date, users.id "
+                "FROM generate_series(1, :members) AS g "
+                "JOIN users ON users.username = 'benchload' || g "
+                "RETURNING id"
+            ),
+            {"marker": BENCH_MARKER, "members": members},
+        )).scalars().all()
+        # Emprunts en retard : un exemplaire des premiers livres
+        overdue_books = sorted(book_ids)[:overdue]
+        if overdue_books:
+            await conn.execute(
+                text(
+                    "INSERT INTO loan_association (book_id, member_id, loan_date, due_date, status) "
+                    "VALUES (:book_id, :member_id, current_date - 30, current_date - 16, 'En cours')"
+                ),
+                [
+                    {"book_id": book_id, "member_id": member_ids[index % len(member_ids)]}
+                    for index, book_id in enumerate(overdue_books)
+                ],
+            )
+            await conn.execute(
+                text("UPDATE books SET available_copies = available_copies - 1 WHERE id = ANY(:ids)"),
+                {"ids": overdue_books},
+            )
+        await conn.execute(text("ANALYZE books"))
+    return {"book_ids": sorted(book_ids), "member_ids": sorted(member_ids)}
+
+
+async def cleanup() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "DELETE FROM loan_association WHERE book_id IN "
+                "(SELECT id FROM books WHERE publisher = :marker)"
+            ),
+            {"marker": BENCH_MARKER},
+        )
+        await conn.execute(text("DELETE FROM books WHERE publisher = :marker"), {"marker": BENCH_MARKER})
+        await conn.execute(
+            text("DELETE FROM members WHERE membership_number LIKE :pattern"),
+            {"pattern": f"{BENCH_MARKER}-%"},
+        )
+        await conn.execute(text("DELETE FROM users WHERE username LIKE 'benchload%'"))
+
+
+class LoadSession:
+    """
+    Client d'un utilisateur simulé : envoie les requêtes des scénarios et
+    enregistre leur latence par endpoint.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, data: dict, rng: random.Random, results: dict):
+        self.client = client
+        self.data = data
+        self.rng = rng
+        self.results = results
+
+    async def call(self, label: str, method: str, url: str, ok=(200,), **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        stats = self.results.setdefault(label, {"latencies": [], "errors": 0})
+        stats["latencies"].append(time.perf_counter() - started)
+        if response.status_code not in ok:
+            stats["errors"] += 1
+        return response
+
+
+async def search(session: LoadSession) -> None:
+    query = " ".join(session.rng.sample(WORDS, session.rng.choice((1, 2))))
+    await session.call("GET /books/search", "GET", "/books/search", params={"q": query})
+
+
+async def list_books(session: LoadSession) -> None:
+    params = {"limit": 20, "sort": session.rng.choice(("title", "author", "publication_date"))}
+    if session.rng.random() < 0.5:
+        params["author"] = session.rng.choice(AUTHORS).split()[-1]
+    await session.call("GET /books/", "GET", "/books/", params=params)
+
+
+async def book_detail(session: LoadSession) -> None:
+    book_id = session.rng.choice(session.data["book_ids"])
+    await session.call("GET /books/{id}", "GET", f"/books/{book_id}")
+
+
+async def suggest(session: LoadSession) -> None:
+    prefix = session.rng.choice(WORDS)[:session.rng.randint(2, 4)]
+    await session.call("GET /books/suggest", "GET", "/books/suggest", params={"prefix": prefix})
+
+
+async def login(session: LoadSession) -> None:
+    await session.call(
+        "POST /auth/login", "POST", "/auth/login",
+        data={"username": ADMIN_USERNAME, "password": session.data["password"]},
+    )
+
+
+async def checkout_return(session: LoadSession) -> None:
+    # Un livre sans exemplaire disponible (400) n'est pas une erreur
+    response = await session.call(
+        "POST /loans/", "POST", "/loans/", ok=(201, 400),
+        json={
+            "book_id": session.rng.choice(session.data["book_ids"]),
+            "member_id": session.rng.choice(session.data["member_ids"]),
+            "return_date": None,
+        },
+    )
+    if response.status_code == 201:
+        await session.call("PUT /loans/{id}", "PUT", f"/loans/{response.json()['id']}")
+
+
+async def overdue(session: LoadSession) -> None:
+    await session.call("GET /loans/overdue/", "GET", "/loans/overdue/", params={"limit": 20})
+
+
+SCENARIOS = {
+    "search": search,
+    "list": list_books,
+    "detail": book_detail,
+    "suggest": suggest,
+    "login": login,
+    "checkout_return": checkout_return,
+    "overdue": overdue,
+}
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 120.0) -> None:
+    """
+    Attend que l'API se déclare prête (/health/ready : pools ouverts, bcrypt
+    chargé) avant les mesures. Une API sans cet endpoint (404) est considérée prête.
+    """
+    deadline = time.perf_counter() + timeout
+    while (await client.get("/health/ready")).status_code not in (200, 404):
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f"API not ready after {timeout:.0f}s")
+        await asyncio.sleep(0.2)
+
+
+async def drive(client: httpx.AsyncClient, data: dict, args: argparse.Namespace,
+                duration: float, seed_offset: int) -> tuple:
+    """
+    Fait tourner --concurrency utilisateurs simulés pendant `duration` secondes.
+
+    Returns:
+        tuple: (résultats par endpoint, durée effective).
+    """
+    names, weights = zip(*MIXES[args.mix].items())
+    results: Dict[str, dict] = {}
+    deadline = time.perf_counter() + duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(args.random_seed + seed_offset + index)
+        session = LoadSession(client, data, rng, results)
+        while time.perf_counter() < deadline:
+            await SCENARIOS[rng.choices(names, weights)[0]](session)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(index) for index in range(args.concurrency)))
+    return results, time.perf_counter() - started
+
+
+def summarize(results: Dict[str, dict], elapsed: float) -> Dict[str, dict]:
+    """
+    Calcule pour chaque endpoint le débit et les latences p50/p95/p99 (en ms).
+    """
+    summary = {}
+    for label, stats in sorted(results.items()):
+        ordered = sorted(stats["latencies"])
+
+        def percentile(fraction: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+
+        summary[label] = {
+            "requests": len(ordered),
+            "errors": stats["errors"],
+            "throughput": round(len(ordered) / elapsed, 1),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, dict]) -> None:
+    print(f"{'endpoint':<22} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, stats in summary.items():
+        print(
+            f"{label:<22} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+
+
+def compare(summary: Dict[str, dict], baseline: dict, tolerance: float) -> bool:
+    """
+    Compare les résultats à une référence et affiche les écarts par endpoint.
+
+    Returns:
+        bool: False si un endpoint régresse (p95 plus haute ou débit plus bas
+            de plus de `tolerance`, en fraction) ou a plus d'erreurs.
+    """
+    print(f"\n{'endpoint':<22} {'p95 ref':>8} {'p95':>8} {'delta':>8} {'req/s ref':>10} {'req/s':>8} {'delta':>8}")
+    passed = True
+    for label, stats in summary.items():
+        reference = baseline["endpoints"].get(label)
+        if reference is None:
+            print(f"{label:<22} (not in baseline)")
+            continue
+        p95_delta = stats["p95_ms"] / reference["p95_ms"] - 1 if reference["p95_ms"] else 0.0
+        throughput_delta = (
+            stats["throughput"] / reference["throughput"] - 1 if reference["throughput"] else 0.0
+        )
+        regressed = (
+            p95_delta > tolerance
+            or throughput_delta < -tolerance
+            or (stats["errors"] > 0 and reference["errors"] == 0)
+        )
+        passed = passed and not regressed
+        print(
+            f"{label:<22} {reference['p95_ms']:>8.1f} {stats['p95_ms']:>8.1f} {p95_delta:>+8.0%} "
+            f"{reference['throughput']:>10.1f} {stats['throughput']:>8.1f} {throughput_delta:>+8.0%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return passed
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    data = await seed(args.books, args.copies, args.members, args.overdue, args.password)
+    data["password"] = args.password
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60.0)
+        startup = shutdown = None
+    else:
+        from app.main import app, on_shutdown, on_startup
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60.0
+        )
+        startup, shutdown = on_startup, on_shutdown
+
+    if startup:
+        await startup()
+    try:
+        async with client:
+            await wait_ready(client)
+            token = await _login(client, ADMIN_USERNAME, args.password)
+            client.headers["Authorization"] = f"Bearer {token}"
+            if args.warmup > 0:
+                await drive(client, data, args, args.warmup, seed_offset=10_000)
+            results, elapsed = await drive(client, data, args, args.duration, seed_offset=0)
+    finally:
+        if shutdown:
+            await shutdown()
+
+    return {
+        "meta": {
+            "mix": args.mix,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "books": args.books,
+            "members": args.members,
+            "random_seed": args.random_seed,
+            "target": args.base_url or "in-process",
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "endpoints": summarize(results, elapsed),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    try:
+        return await run(args)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default=None, help="Instance à tester (défaut : app.main:app dans le processus)")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--duration", type=float, default=30.0, help="Durée de la mesure, en secondes")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Durée de la chauffe (non mesurée)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--copies", type=int, default=3, help="Exemplaires par livre")
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--overdue", type=int, default=200, help="Emprunts en retard créés")
+    parser.add_argument("--password", default="bench-load-password")
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--save", help="Fichier JSON où enregistrer les résultats (référence)")
+    parser.add_argument("--compare", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Dégradation tolérée (fraction)")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    print(f"mix: {args.mix}, {args.concurrency} clients, {args.duration:.0f} s ({result['meta']['target']})\n")
+    print_summary(result["endpoints"])
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+        print(f"\nresults saved to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline["meta"]["mix"] != args.mix:
+            print(f"\nwarning: baseline mix is {baseline['meta']['mix']!r}")
+        raise SystemExit(0 if compare(result["endpoints"], baseline, args.tolerance) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark de latence de /auth/login sous charge concurrente.
+
+Envoie des connexions en parallèle vers une instance de l'API déjà démarrée
+et affiche le débit ainsi que les latences p50/p95/p99. Les réponses 503
+(file du pool bcrypt pleine) sont comptées comme erreurs.
+Pendant la mesure, une sonde interroge /health en continu pour vérifier que
+la boucle d'événements reste réactive pendant le hachage.
+
+Exemple:
+    python -m benchmarks.bench_login --base-url http://localhost:8000 \\
+        --username admin --password secretpass --concurrency 32 --requests 500
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.bench_concurrency import report
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60.0) as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+        health_latencies = []
+        errors = 0
+        done = asyncio.Event()
+
+        async def one_login():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/auth/login",
+                    data={"username": args.username, "password": args.password},
+                )
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        async def probe_health():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        probe = asyncio.create_task(probe_health())
+        started = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+
+    print("path:        /auth/login")
+    report(latencies, elapsed, errors, args.concurrency)
+    if health_latencies:
+        print(f"/health max during run: {max(health_latencies) * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Micro-benchmarks des coûts CPU par requête (authentification et sérialisation).
+
+Mesure, sans base de données ni serveur, le temps par opération de :
+  - security.create_access_token et decode_access_token,
+  - security.verify_password pour plusieurs coûts bcrypt (--bcrypt-rounds),
+  - la construction de schemas.Book, Member et LoanWithDetails depuis des
+    objets ORM (model_validate, to_loan_with_details),
+  - la sérialisation JSON de réponses de 100 éléments, comme le fait FastAPI
+    (validation par le response_model puis sérialisation par pydantic-core).
+
+Chaque cas est exécuté par séries calibrées (timeit.autorange) répétées
+--repeat fois ; la médiane et le minimum par opération sont affichés.
+--save enregistre les résultats dans un fichier JSON ; --compare les compare
+à un fichier enregistré sur un autre commit (médianes, tolérance --tolerance).
+
+Exemple:
+    python -m benchmarks.bench_micro --save micro-before.json
+    python -m benchmarks.bench_micro --compare micro-before.json
+    python -m benchmarks.bench_micro --only token --only schema
+"""
+import argparse
+import json
+import platform
+import statistics
+import timeit
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+import fastapi
+import pydantic
+from passlib.hash import bcrypt
+from pydantic import TypeAdapter
+
+from app import models, schemas
+from app.routers.loans import to_loan_with_details
+from app.security import create_access_token, decode_access_token, verify_password
+from benchmarks.bench_load import _git_commit
+
+PASSWORD = "bench-micro-password"
+LIST_SIZE = 100
+
+
+def make_book(index: int) -> models.Book:
+    return models.Book(
+        id=index,
+        title=f"Les Misérables, tome {index}",
+        author="Victor Hugo",
+        isbn=f"978{index:010d}",
+        publisher="Bench",
+        publication_date=date(1862, 4, 3),
+        number_of_copies=3,
+        available_copies=2,
+        version=1,
+    )
+
+
+def make_member(index: int) -> models.Member:
+    return models.Member(
+        id=index,
+        membership_number=f"M{index:06d}",
+        first_name="Jean",
+        last_name="Valjean",
+        email=f"member{index}@example.com",
+        phone_number="0102030405",
+        address="1 rue de la Bibliothèque, Paris",
+        join_date=date(2024, 1, 15),
+        user_id=index,
+        version=1,
+    )
+
+
+def make_loan_row(index: int) -> SimpleNamespace:
+    """
+    Ligne de la forme retournée par loans.loan_details_query.
+    """
+    return SimpleNamespace(
+        id=index,
+        book_id=index,
+        member_id=index,
+        loan_date=date(2026, 1, 2),
+        due_date=date(2026, 1, 16),
+        return_date=None,
+        status="En cours",
+        version=1,
+        Book=make_book(index),
+        Member=make_member(index),
+    )
+
+
+def build_cases(rounds: List[int]) -> Dict[str, Callable[[], object]]:
+    """
+    Prépare les données de chaque cas et retourne les fonctions à mesurer, par nom.
+    """
+    token = create_access_token({"sub": "bench-user"})
+    book, member, loan_row = make_book(1), make_member(1), make_loan_row(1)
+    books = [make_book(index) for index in range(LIST_SIZE)]
+    members = [make_member(index) for index in range(LIST_SIZE)]
+    loan_rows = [make_loan_row(index) for index in range(LIST_SIZE)]
+    book_list = TypeAdapter(List[schemas.Book])
+    member_list = TypeAdapter(List[schemas.Member])
+    loan_list = TypeAdapter(List[schemas.LoanWithDetails])
+
+    def list_response(adapter: TypeAdapter, content) -> bytes:
+        # Chemin de FastAPI : validation par le response_model, puis dump_json
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+    cases = {
+        "token.create": lambda: create_access_token({"sub": "bench-user"}),
+        "token.decode": lambda: decode_access_token(token),
+        "schema.book": lambda: schemas.Book.model_validate(book),
+        "schema.member": lambda: schemas.Member.model_validate(member),
+        "schema.loan_with_details": lambda: to_loan_with_details(loan_row),
+        "json.books_100": lambda: list_response(book_list, books),
+        "json.members_100": lambda: list_response(member_list, members),
+        "json.loans_100": lambda: list_response(
+            loan_list, [to_loan_with_details(row) for row in loan_rows]
+        ),
+    }
+    for cost in rounds:
+        hashed = bcrypt.using(rounds=cost).hash(PASSWORD)
+        cases[f"password.verify_rounds_{cost:02d}"] = (
+            lambda hashed=hashed: verify_password(PASSWORD, hashed)
+        )
+    return cases
+
+
+def measure(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Mesure le temps par opération (en microsecondes) sur `repeat` séries calibrées.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    timings = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_us": round(statistics.median(timings), 2),
+        "min_us": round(min(timings), 2),
+        "loops": number,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float) -> bool:
+    """
+    Compare les médianes à une référence.
+
+    Returns:
+        bool: False si un cas est plus lent de plus de `tolerance` (fraction).
+    """
+    print(f"\n{'case':<30} {'ref us':>12} {'us':>12} {'delta':>8}")
+    passed = True
+    for name, stats in results.items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            print(f"{name:<30} (not in baseline)")
+            continue
+        delta = stats["median_us"] / reference["median_us"] - 1
+        regressed = delta > tolerance
+        passed = passed and not regressed
+        print(
+            f"{name:<30} {reference['median_us']:>12.2f} {stats['median_us']:>12.2f} "
+            f"{delta:>+8.0%}{'  REGRESSION' if regressed else ''}"
+        )
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bcrypt-rounds", default="4,10,12", help="Coûts bcrypt mesurés (liste)")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de séries par cas")
+    parser.add_argument("--only", action="append", default=[], help="Préfixe des cas à mesurer")
+    parser.add_argument("--save", help="Fichier JSON où enregistrer les résultats")
+    parser.add_argument("--compare", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Ralentissement toléré (fraction)")
+    args = parser.parse_args()
+
+    rounds = [int(cost) for cost in args.bcrypt_rounds.split(",") if cost]
+    results = {}
+    print(f"{'case':<30} {'median us':>12} {'min us':>12} {'loops':>8}")
+    for name, function in build_cases(rounds).items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        results[name] = measure(function, args.repeat)
+        stats = results[name]
+        print(f"{name:<30} {stats['median_us']:>12.2f} {stats['min_us']:>12.2f} {stats['loops']:>8}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "meta": {
+                        "commit": _git_commit(),
+                        "python": platform.python_version(),
+                        "pydantic": pydantic.VERSION,
+                        "fastapi": fastapi.__version__,
+                        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    },
+                    "cases": results,
+                },
+                file,
+                indent=2,
+            )
+        print(f"\nresults saved to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        raise SystemExit(0 if compare(results, baseline, args.tolerance) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark de la recherche dans le catalogue : ILIKE contre plein texte (GIN).
+
+Génère un catalogue synthétique (1 million de livres par défaut) dans la base
+configurée (APP_DATABASE_URL), puis compare pour plusieurs termes le temps
+d'exécution et le plan de :
+  - la recherche historique de GET /books (title ILIKE '%x%' OR author ILIKE '%x%'),
+  - la recherche de GET /books/search (search_vector @@ websearch_to_tsquery, rang).
+
+Les livres synthétiques sont marqués par l'éditeur "bench-synthetic" et
+supprimés avec --cleanup.
+
+Exemple:
+    python -m benchmarks.bench_search --seed --rows 1000000
+    python -m benchmarks.bench_search            # réutilise les données existantes
+    python -m benchmarks.bench_search --cleanup
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.models import BOOK_SEARCH_CONFIG
+
+SYNTHETIC_PUBLISHER = "bench-synthetic"
+
+WORDS = [
+    "misérables", "prince", "château", "mémoires", "été", "forêt", "océan", "étranger",
+    "guerre", "paix", "rouge", "noir", "nuit", "voyage", "lune", "montagne", "jardin",
+    "secret", "lumière", "rivière", "hiver", "cœur", "ombre", "royaume", "liberté",
+    "éducation", "sentimentale", "peste", "chute", "rêve", "mer", "silence", "mystère",
+    "histoire", "femme", "enfant", "roi", "reine", "île", "désert",
+]
+AUTHORS = [
+    "Victor Hugo", "Émile Zola", "Albert Camus", "Gustave Flaubert", "Marcel Proust",
+    "George Sand", "Honoré de Balzac", "Jules Verne", "Colette", "Stendhal",
+    "Marguerite Duras", "Simone de Beauvoir", "Alexandre Dumas", "Molière",
+]
+TERMS = ["misérables", "miserables", "hugo", "château forêt", "zola", "introuvable"]
+
+
+def _sql_array(values) -> str:
+    return "ARRAY[" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + "]"
+
+
+async def seed(rows: int) -> None:
+    """
+    Insère `rows` livres synthétiques en un seul INSERT ... SELECT generate_series.
+    """
+    words, authors = _sql_array(WORDS), _sql_array(AUTHORS)
+    statement = text(
+        f"""
+        INSERT INTO books (title, author, isbn, publisher, number_of_copies, available_copies)
+        SELECT
+            initcap(w[1 + (g * 7) % {len(WORDS)}]) || ' ' || w[1 + (g * 13) % {len(WORDS)}]
+                || ' ' || w[1 + (g * 31) % {len(WORDS)}],
+            a[1 + (g * 3) % {len(AUTHORS)}],
+            '979' || lpad(g::text, 10, '0'),
+            :publisher,
+            1,
+            1
+        FROM generate_series(1, :rows) AS g,
+             (SELECT {words} AS w, {authors} AS a) AS vocabulary
+        ON CONFLICT (isbn) DO NOTHING
+        """
+    )
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(statement, {"publisher": SYNTHETIC_PUBLISHER, "rows": rows})
+        await conn.execute(text("ANALYZE books"))
+    print(f"seeded {rows} books in {time.perf_counter() - started:.1f} s")
+
+
+async def cleanup() -> None:
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text("DELETE FROM books WHERE publisher = :publisher"),
+            {"publisher": SYNTHETIC_PUBLISHER},
+        )
+        await conn.execute(text("ANALYZE books"))
+    print(f"deleted {result.rowcount} synthetic books")
+
+
+async def explain(conn, statement: str, params: dict) -> tuple:
+    """
+    Exécute EXPLAIN ANALYZE et retourne (temps d'exécution en ms, nœud de scan principal).
+    """
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}"), params)
+    plan = result.scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    node = plan[0]["Plan"]
+    while node.get("Plans") and "Scan" not in node["Node Type"]:
+        node = node["Plans"][0]
+    return plan[0]["Execution Time"], node["Node Type"]
+
+
+async def run(limit: int) -> None:
+    ilike = (
+        "SELECT id FROM books WHERE title ILIKE :pattern OR author ILIKE :pattern "
+        "ORDER BY title, id LIMIT :limit"
+    )
+    fulltext = (
+        f"SELECT id FROM books "
+        f"WHERE search_vector @@ websearch_to_tsquery('{BOOK_SEARCH_CONFIG}', :q) "
+        f"ORDER BY ts_rank_cd(search_vector, websearch_to_tsquery('{BOOK_SEARCH_CONFIG}', :q)) DESC, id "
+        f"LIMIT :limit"
+    )
+    async with engine.connect() as conn:
+        count = (await conn.execute(text("SELECT count(*) FROM books"))).scalar()
+        print(f"catalog size: {count} books\n")
+        print(f"{'term':<16} {'ilike ms':>10} {'ilike plan':<22} {'fts ms':>10} {'fts plan':<22}")
+        for term in TERMS:
+            ilike_ms, ilike_plan = await explain(
+                conn, ilike, {"pattern": f"%{term}%", "limit": limit}
+            )
+            fts_ms, fts_plan = await explain(conn, fulltext, {"q": term, "limit": limit})
+            print(f"{term:<16} {ilike_ms:>10.1f} {ilike_plan:<22} {fts_ms:>10.1f} {fts_plan:<22}")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    try:
+        if args.cleanup:
+            await cleanup()
+            return
+        if args.seed:
+            await seed(args.rows)
+        await run(args.limit)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", action="store_true", help="Générer le catalogue synthétique")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--cleanup", action="store_true", help="Supprimer les livres synthétiques")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -496,7 +496,8 @@ function renderLoans(loans) {
 
     loans.forEach(loan => {
         const row = tbody.insertRow();
-        const returnButton = loan.status === 'En cours' ?
+        // Tout emprunt non retourné peut être retourné, y compris en retard
+        const returnButton = !loan.return_date ?
             `<button data-id="${loan.id}" class="px-4 py-2 rounded-md font-semibold transition duration-200 ease-in-out bg-blue-600 text-white hover:bg-blue-700 text-sm return-loan-btn">Retourner</button>` :
             '';
         row.innerHTML = `
@@ -0,0 +1,59 @@
+-- Schéma initial : utilisateurs, livres, membres et emprunts, tels que créés
+-- par la première version de l'application (Base.metadata.create_all).
+-- Les migrations suivantes le font évoluer.  Toutes les instructions sont
+-- idempotentes : une base créée par une version antérieure de l'application
+-- peut être placée sous le contrôle des migrations sans être recréée.
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR NOT NULL,
+    email VARCHAR NOT NULL,
+    password_hash VARCHAR NOT NULL,
+    role VARCHAR,
+    first_name VARCHAR NOT NULL,
+    last_name VARCHAR NOT NULL,
+    created_at DATE NOT NULL,
+    last_login DATE
+);
+CREATE INDEX IF NOT EXISTS ix_users_id ON users (id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS books (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR NOT NULL,
+    author VARCHAR NOT NULL,
+    isbn VARCHAR NOT NULL,
+    publisher VARCHAR,
+    publication_date DATE,
+    number_of_copies INTEGER NOT NULL,
+    available_copies INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_books_id ON books (id);
+CREATE INDEX IF NOT EXISTS ix_books_title ON books (title);
+CREATE INDEX IF NOT EXISTS ix_books_author ON books (author);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_books_isbn ON books (isbn);
+
+CREATE TABLE IF NOT EXISTS members (
+    id SERIAL PRIMARY KEY,
+    membership_number VARCHAR NOT NULL,
+    first_name VARCHAR NOT NULL,
+    last_name VARCHAR NOT NULL,
+    email VARCHAR NOT NULL,
+    phone_number VARCHAR,
+    address VARCHAR,
+    join_date DATE NOT NULL,
+    user_id INTEGER NOT NULL UNIQUE REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_members_id ON members (id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_members_membership_number ON members (membership_number);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_members_email ON members (email);
+
+CREATE TABLE IF NOT EXISTS loan_association (
+    book_id INTEGER NOT NULL REFERENCES books (id),
+    member_id INTEGER NOT NULL REFERENCES members (id),
+    loan_date DATE,
+    return_date DATE,
+    status VARCHAR,
+    PRIMARY KEY (book_id, member_id)
+);
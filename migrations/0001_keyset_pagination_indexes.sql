@@ -0,0 +1,14 @@
+-- Index composites pour le tri et la pagination par curseur (?after=...)
+-- de /books, /members et /loans.  Chaque index couvre une clé de tri suivie
+-- de l'ID, dans l'ordre utilisé par les endpoints.
+
+CREATE INDEX IF NOT EXISTS ix_books_title_id ON books (title, id);
+CREATE INDEX IF NOT EXISTS ix_books_author_id ON books (author, id);
+CREATE INDEX IF NOT EXISTS ix_books_publication_date_id ON books (publication_date, id);
+
+CREATE INDEX IF NOT EXISTS ix_members_last_name_first_name_id ON members (last_name, first_name, id);
+CREATE INDEX IF NOT EXISTS ix_members_first_name_id ON members (first_name, id);
+CREATE INDEX IF NOT EXISTS ix_members_join_date_id ON members (join_date, id);
+
+-- /loans est trié par sa clé primaire : (book_id, member_id) à l'origine, puis
+-- l'ID de l'emprunt depuis 0003_loans_surrogate_id.sql.  Pas d'index supplémentaire.
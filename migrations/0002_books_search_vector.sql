@@ -0,0 +1,23 @@
+-- Recherche plein texte du catalogue (/books/search).
+-- Configuration française sans accents, colonne générée search_vector
+-- (titre > auteur > éditeur) et index GIN.
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'fr_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION public.fr_unaccent (COPY = pg_catalog.french);
+        ALTER TEXT SEARCH CONFIGURATION public.fr_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+    END IF;
+END $$;
+
+ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('public.fr_unaccent', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('public.fr_unaccent', coalesce(author, '')), 'B') ||
+        setweight(to_tsvector('public.fr_unaccent', coalesce(publisher, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_books_search_vector ON books USING gin (search_vector);
@@ -0,0 +1,47 @@
+-- Emprunts : clé primaire propre (id), date de retour prévue (due_date) et
+-- index des chemins d'accès fréquents.
+-- L'ancienne clé primaire (book_id, member_id) interdisait d'emprunter deux
+-- fois le même livre et obligeait /loans à identifier un emprunt par son livre.
+
+ALTER TABLE loan_association ADD COLUMN IF NOT EXISTS due_date date;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'loan_association' AND column_name = 'id'
+    ) THEN
+        ALTER TABLE loan_association ADD COLUMN id integer;
+
+        -- Les emprunts existants sont numérotés par ordre chronologique
+        UPDATE loan_association AS loan
+        SET id = numbered.rn
+        FROM (
+            SELECT book_id, member_id,
+                   row_number() OVER (ORDER BY loan_date, book_id, member_id) AS rn
+            FROM loan_association
+        ) AS numbered
+        WHERE loan.book_id = numbered.book_id AND loan.member_id = numbered.member_id;
+
+        CREATE SEQUENCE loan_association_id_seq OWNED BY loan_association.id;
+        PERFORM setval('loan_association_id_seq', COALESCE(MAX(id), 0) + 1, false)
+        FROM loan_association;
+
+        ALTER TABLE loan_association
+            ALTER COLUMN id SET DEFAULT nextval('loan_association_id_seq'),
+            ALTER COLUMN id SET NOT NULL;
+        ALTER TABLE loan_association DROP CONSTRAINT loan_association_pkey;
+        ALTER TABLE loan_association ADD PRIMARY KEY (id);
+    END IF;
+END $$;
+
+-- Emprunts en cours (non retournés), par date de retour prévue
+CREATE INDEX IF NOT EXISTS ix_loans_active_due_date
+    ON loan_association (due_date, id) WHERE return_date IS NULL;
+
+-- Historique des emprunts d'un membre et d'un livre
+CREATE INDEX IF NOT EXISTS ix_loans_member_id_loan_date ON loan_association (member_id, loan_date, id);
+CREATE INDEX IF NOT EXISTS ix_loans_book_id_loan_date ON loan_association (book_id, loan_date, id);
+
+-- Filtre par statut de GET /loans (trié par ID)
+CREATE INDEX IF NOT EXISTS ix_loans_status_id ON loan_association (status, id);
@@ -0,0 +1,11 @@
+-- Dates de retour prévues et passage périodique au statut "En retard".
+-- Les emprunts existants sans date de retour prévue reçoivent la durée par
+-- défaut (APP_LOAN_DURATION_DAYS, 14 jours).
+
+UPDATE loan_association
+SET due_date = loan_date + 14
+WHERE due_date IS NULL AND loan_date IS NOT NULL;
+
+-- Emprunts "En cours" par date de retour prévue (passage en retard)
+CREATE INDEX IF NOT EXISTS ix_loans_in_progress_due_date
+    ON loan_association (due_date) WHERE status = 'En cours';
@@ -0,0 +1,7 @@
+-- Versions des lignes pour les ETag des livres, membres et emprunts.
+-- Chaque modification d'une ligne incrémente sa version ; les lignes
+-- existantes commencent à 1.
+
+ALTER TABLE books ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE members ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE loan_association ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
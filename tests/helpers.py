@@ -0,0 +1,119 @@
+"""
+Fonctions utilitaires des tests : données de test, comptage des requêtes SQL
+et plans d'exécution.
+"""
+import json
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterator, List
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.dialects import postgresql
+
+from app import models
+from app.database import engine
+
+
+async def create_books(db, count: int, copies: int = 1) -> List[int]:
+    """
+    Ajoute `count` livres de `copies` exemplaires et retourne leurs IDs.
+    """
+    result = await db.execute(insert(models.Book).returning(models.Book.id), [
+        {
+            "title": f"Book {index:05d}", "author": f"Author {index % 50}",
+            "isbn": f"{9780000000000 + index}", "publication_date": date(2000, 1, 1),
+            "number_of_copies": copies, "available_copies": copies,
+        }
+        for index in range(count)
+    ])
+    await db.commit()
+    return list(result.scalars())
+
+
+async def create_members(db, count: int) -> List[int]:
+    """
+    Ajoute `count` membres (et leurs utilisateurs) et retourne leurs IDs.
+    """
+    result = await db.execute(insert(models.User).returning(models.User.id), [
+        {
+            "username": f"member{index}", "email": f"member{index}@example.com",
+            "password_hash": "-", "role": "member", "first_name": "Member",
+            "last_name": f"{index:05d}", "created_at": date.today(),
+        }
+        for index in range(count)
+    ])
+    user_ids = list(result.scalars())
+    result = await db.execute(insert(models.Member).returning(models.Member.id), [
+        {
+            "membership_number": f"M{index:05d}", "first_name": "Member",
+            "last_name": f"{index:05d}", "email": f"member{index}@example.com",
+            "join_date": date(2020, 1, 1), "user_id": user_id,
+        }
+        for index, user_id in enumerate(user_ids)
+    ])
+    await db.commit()
+    return list(result.scalars())
+
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """
+    Enregistre les requêtes SQL exécutées sur le moteur principal pendant le
+    bloc (événement before_cursor_execute) et retourne leur liste.
+
+    Exemple:
+        with count_queries() as statements:
+            await client.get("/loans/", headers=headers)
+        assert len(statements) == 1
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def assert_max_queries(response, max_queries: int) -> None:
+    """
+    Vérifie qu'une réponse de l'API n'a pas exécuté plus de `max_queries`
+    requêtes SQL, d'après l'en-tête X-DB-Queries (QueryStatsMiddleware,
+    actif hors production).
+
+    Exemple:
+        response = await client.get("/loans/", headers=headers)
+        assert_max_queries(response, 1)
+
+    Raises:
+        AssertionError: Si l'en-tête est absent ou si le budget est dépassé.
+    """
+    header = response.headers.get("x-db-queries")
+    assert header is not None, "X-DB-Queries header missing (is ENV set to production?)"
+    assert int(header) <= max_queries, (
+        f"{response.request.method} {response.request.url.path} executed {header} SQL queries "
+        f"(budget: {max_queries}, time: {response.headers.get('x-db-time-ms')} ms)"
+    )
+
+
+async def plan_indexes(db, query, seek: bool = False) -> set:
+    """
+    Retourne les noms des index parcourus par le plan d'exécution de la requête.
+    Avec seek=True, seuls les index parcourus avec une borne (Index Cond), et
+    non seulement filtrés, sont retournés.
+    """
+    sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    names, nodes = set(), [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if "Index Name" in node and (not seek or "Index Cond" in node):
+            names.add(node["Index Name"])
+        nodes.extend(node.get("Plans", []))
+    return names
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from app.core.suggest import suggest_service
+from tests.helpers import create_books
+
+pytestmark = pytest.mark.anyio
+
+CSV_FILE = """title,author,isbn,publication_date,number_of_copies
+Les Misérables,Victor Hugo,9782070409228,1862-04-03,2
+Madame Bovary,Gustave Flaubert,9782070413119,,1
+,Anonyme,9782070000001,,1
+Germinal,Émile Zola,97820704,,1
+Germinal,Émile Zola,9782070409228,,1
+Book 00000,Author 0,9780000000000,,1
+Nana,Émile Zola,9782253002864,1880-01-01,3
+"""
+
+
+async def import_file(client, headers, filename: str, content: str, **params) -> list:
+    response = await client.post(
+        "/books/import", params=params, headers=headers,
+        files={"file": (filename, content.encode(), "application/octet-stream")},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_csv_import_reports_rejected_rows_and_summary(client, db, admin_headers):
+    # Livre déjà présent dans la base (ISBN 9780000000000)
+    await create_books(db, 1)
+
+    report = await import_file(client, admin_headers, "books.csv", CSV_FILE)
+
+    errors = [line for line in report if line["type"] == "error"]
+    assert [(error["row"], error["isbn"]) for error in errors] == [
+        (4, "9782070000001"), (5, "97820704"), (6, "9782070409228"), (7, "9780000000000"),
+    ]
+    assert errors[0]["detail"].startswith("title:")
+    assert errors[1]["detail"].startswith("isbn:")
+    assert errors[2]["detail"] == "Duplicate ISBN in file"
+    assert errors[3]["detail"] == "ISBN already exists"
+    assert report[-2] == {"type": "progress", "processed": 7, "inserted": 3, "rejected": 4}
+    assert report[-1] == {"type": "summary", "processed": 7, "inserted": 3, "rejected": 4}
+
+    books = (await db.execute(
+        select(models.Book.isbn, models.Book.available_copies).order_by(models.Book.isbn)
+    )).all()
+    assert [tuple(book) for book in books] == [
+        ("9780000000000", 1), ("9782070409228", 2), ("9782070413119", 1), ("9782253002864", 3),
+    ]
+    # L'index d'autocomplétion est reconstruit après l'import
+    assert [title for _, title, _ in suggest_service.search("zola")] == ["Nana"]
+
+
+async def test_ndjson_import_reports_invalid_json_per_batch(client, db, admin_headers, monkeypatch):
+    monkeypatch.setattr("app.routers.books.settings.BULK_IMPORT_BATCH_SIZE", 2)
+    content = "\n".join([
+        json.dumps({"title": "Nana", "author": "Émile Zola", "isbn": "9782253002864"}),
+        "{not json",
+        "",
+        json.dumps({"title": "Germinal", "author": "Émile Zola", "isbn": "9782253004226"}),
+    ])
+
+    report = await import_file(client, admin_headers, "books.ndjson", content)
+
+    assert [line["type"] for line in report] == ["error", "progress", "progress", "summary"]
+    assert report[0]["row"] == 2
+    assert report[0]["detail"].startswith("Invalid JSON")
+    assert report[1] == {"type": "progress", "processed": 2, "inserted": 1, "rejected": 1}
+    assert report[-1] == {"type": "summary", "processed": 3, "inserted": 2, "rejected": 1}
+    assert await db.scalar(select(func.count()).select_from(models.Book)) == 2
+
+
+async def test_import_requires_admin(client, db):
+    response = await client.post(
+        "/books/import", files={"file": ("books.csv", CSV_FILE.encode(), "text/csv")}
+    )
+    assert response.status_code == 401
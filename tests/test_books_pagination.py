@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app import models
+from app.core.pagination import keyset_segments
+from app.routers.books import book_sort
+from tests.helpers import create_books, plan_indexes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def dated_books(db):
+    """
+    Livres datés (plusieurs par date) et livres sans date de publication.
+    """
+    book_ids = await create_books(db, 20)
+    for index, book_id in enumerate(book_ids):
+        publication_date = None if index % 4 == 0 else date(2000, 1, 1) + timedelta(days=index % 3)
+        await db.execute(
+            update(models.Book).where(models.Book.id == book_id).values(publication_date=publication_date)
+        )
+    await db.commit()
+    return book_ids
+
+
+async def read_pages(client, headers, order: str) -> list:
+    ids, params = [], {"sort": "publication_date", "order": order, "limit": 3}
+    while True:
+        response = await client.get("/books/", params=params, headers=headers)
+        assert response.status_code == 200
+        ids.extend(book["id"] for book in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+        params = {**params, "after": cursor}
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_cursor_pages_cover_undated_books(client, db, admin_headers, dated_books, order):
+    sort_columns, descending, _ = book_sort("publication_date", order)
+    expected = (await db.execute(
+        select(models.Book.id).order_by(
+            *(column.desc() if descending else column for column in sort_columns)
+        )
+    )).scalars().all()
+
+    assert await read_pages(client, admin_headers, order) == expected
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_dated_cursor_seeks_publication_date_index(db, dated_books, order):
+    sort_columns, descending, _ = book_sort("publication_date", order)
+    query = select(models.Book).order_by(
+        *(column.desc() if descending else column for column in sort_columns)
+    )
+    [condition, *_] = keyset_segments(sort_columns, [date(2000, 1, 2), dated_books[5]], descending)
+
+    assert "ix_books_publication_date_id" in await plan_indexes(
+        db, query.where(condition).limit(3), seek=True
+    )
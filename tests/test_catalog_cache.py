@@ -0,0 +1,105 @@
+import pytest
+
+from app.core.catalog_cache import BOOK_LIST_TAG, CatalogCache, SharedCacheBackend, book_tag
+
+pytestmark = pytest.mark.anyio
+
+
+class LocalKeyValueClient:
+    """
+    Remplaçant local du client redis.asyncio (get, set(ex=), mget, incr),
+    partagé par les caches de plusieurs « workers ».
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.fixture
+def workers():
+    """
+    Deux caches (deux workers) sur le même stockage partagé.
+    """
+    client = LocalKeyValueClient()
+    return (
+        CatalogCache(SharedCacheBackend(client), ttl=30),
+        CatalogCache(SharedCacheBackend(client), ttl=30),
+    )
+
+
+async def read_through(cache, key, value, tags):
+    generation = await cache.generation()
+    await cache.set(key, value, tags, generation)
+
+
+async def test_entry_is_shared_between_workers(workers):
+    first, second = workers
+    await read_through(first, "book?id=1", {"title": "Dune"}, [book_tag(1)])
+
+    assert await second.get("book", "book?id=1") == {"title": "Dune"}
+    assert second.stats()["namespaces"]["book"]["hits"] == 1
+
+
+async def test_invalidation_by_another_worker_expires_entry(workers):
+    first, second = workers
+    await read_through(first, "books?limit=10", {"count": 2}, [BOOK_LIST_TAG, book_tag(1), book_tag(2)])
+    await read_through(first, "book?id=3", {"title": "Emma"}, [book_tag(3)])
+
+    await second.invalidate_books([2])
+
+    assert await first.get("books", "books?limit=10") is None
+    assert await first.get("book", "book?id=3") == {"title": "Emma"}
+
+
+async def test_invalidation_between_read_and_set_is_not_overwritten(workers):
+    first, second = workers
+    # Le premier worker relève l'état du cache, puis lit la base...
+    generation = await first.generation()
+    stale = {"title": "Old title"}
+    # ... pendant que le second modifie le livre et invalide ses entrées...
+    await second.invalidate_books([1], lists=True)
+    # ... avant que la valeur lue par le premier soit enregistrée
+    await first.set("book?id=1", stale, [book_tag(1)], generation)
+
+    assert await first.get("book", "book?id=1") is None
+    assert await second.get("book", "book?id=1") is None
+
+    # Une lecture faite après l'invalidation est enregistrée
+    await read_through(first, "book?id=1", {"title": "New title"}, [book_tag(1)])
+    assert await second.get("book", "book?id=1") == {"title": "New title"}
+
+
+async def test_unrelated_invalidation_also_discards_pending_value(workers):
+    first, second = workers
+    generation = await first.generation()
+    await second.invalidate_books([42])
+    await first.set("book?id=1", {"title": "Dune"}, [book_tag(1)], generation)
+
+    assert await first.get("book", "book?id=1") is None
+
+
+async def test_backend_errors_are_cache_misses():
+    class BrokenClient(LocalKeyValueClient):
+        async def mget(self, keys):
+            raise ConnectionError("unreachable")
+
+    cache = CatalogCache(SharedCacheBackend(BrokenClient()), ttl=30)
+    generation = await cache.generation()
+    await cache.set("book?id=1", {"title": "Dune"}, [book_tag(1)], generation)
+
+    assert generation is None
+    assert await cache.get("book", "book?id=1") is None
+    assert cache.stats()["errors"] == 1
@@ -0,0 +1,46 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from tests.helpers import create_books, create_members
+
+pytestmark = pytest.mark.anyio
+
+COPIES = 5
+CHECKOUTS = 50
+
+
+async def test_concurrent_checkouts_never_oversell(client, db, admin_headers):
+    [book_id] = await create_books(db, 1, copies=COPIES)
+    [member_id] = await create_members(db, 1)
+    payload = {"book_id": book_id, "member_id": member_id, "loan_date": date.today().isoformat()}
+
+    responses = await asyncio.gather(*(
+        client.post("/loans/", json=payload, headers=admin_headers) for _ in range(CHECKOUTS)
+    ))
+
+    statuses = [response.status_code for response in responses]
+    assert statuses.count(201) == COPIES
+    assert statuses.count(400) == CHECKOUTS - COPIES
+    # Chaque emprunt accepté a réservé un exemplaire différent
+    assert sorted(
+        response.json()["book"]["available_copies"]
+        for response in responses if response.status_code == 201
+    ) == list(range(COPIES))
+    assert all(
+        response.json()["detail"] == "Book not available for loan"
+        for response in responses if response.status_code == 400
+    )
+
+    available = await db.scalar(
+        select(models.Book.available_copies).where(models.Book.id == book_id)
+    )
+    loans = await db.scalar(
+        select(func.count()).select_from(models.loan_association_table)
+        .where(models.loan_association_table.c.book_id == book_id)
+    )
+    assert available == 0
+    assert loans == COPIES
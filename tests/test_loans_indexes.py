@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from app import models
+from app.routers.loans import filter_loans, loan_details_query
+from app.routers.members import member_loans_query
+from tests.helpers import create_books, create_members, plan_indexes
+
+pytestmark = pytest.mark.anyio
+
+loans = models.loan_association_table
+
+LOAN_COUNT = 20000
+
+
+@pytest.fixture
+async def loan_history(db):
+    """
+    Emprunts sur trois ans : la plupart retournés, quelques-uns en cours ou en
+    retard, avec des statistiques à jour pour le planificateur.
+    """
+    book_ids = await create_books(db, 500)
+    member_ids = await create_members(db, 200)
+    today = date.today()
+    rows = []
+    for index in range(LOAN_COUNT):
+        loan_date = today - timedelta(days=1095 * (LOAN_COUNT - index) // LOAN_COUNT)
+        due_date = loan_date + timedelta(days=14)
+        if index % 100 == 0:
+            status, return_date, due_date = "En retard", None, today - timedelta(days=3)
+        elif index >= LOAN_COUNT - 500:
+            status, return_date = "En cours", None
+        else:
+            status, return_date = "Retourné", loan_date + timedelta(days=7)
+        rows.append({
+            "book_id": book_ids[index % len(book_ids)],
+            "member_id": member_ids[index * 7 % len(member_ids)],
+            "loan_date": loan_date, "due_date": due_date,
+            "return_date": return_date, "status": status,
+        })
+    await db.execute(insert(loans), rows)
+    await db.commit()
+    await db.execute(text("ANALYZE loan_association"))
+    return book_ids, member_ids
+
+
+async def test_loan_lookup_by_id_uses_primary_key(db, loan_history):
+    query = loan_details_query().where(loans.c.id == 1234)
+    assert "loan_association_pkey" in await plan_indexes(db, query)
+
+
+async def test_status_filter_uses_status_index(db, loan_history):
+    query = filter_loans(loan_details_query(), "En retard").order_by(loans.c.id).limit(10)
+    assert "ix_loans_status_id" in await plan_indexes(db, query)
+
+
+async def test_overdue_loans_use_active_due_date_index(db, loan_history):
+    query = (
+        loan_details_query()
+        .where(loans.c.return_date.is_(None), loans.c.due_date < date.today())
+        .order_by(loans.c.due_date, loans.c.id)
+        .limit(10)
+    )
+    assert "ix_loans_active_due_date" in await plan_indexes(db, query)
+
+
+async def test_member_history_uses_member_index(db, loan_history):
+    _, member_ids = loan_history
+    query = member_loans_query(member_ids[3], None, None, None, None, 10)
+    assert "ix_loans_member_id_loan_date" in await plan_indexes(db, query)
+
+
+async def test_book_history_uses_book_index(db, loan_history):
+    book_ids, _ = loan_history
+    query = (
+        select(loans)
+        .where(loans.c.book_id == book_ids[3])
+        .order_by(loans.c.loan_date.desc(), loans.c.id.desc())
+        .limit(10)
+    )
+    assert "ix_loans_book_id_loan_date" in await plan_indexes(db, query)
+
+
+async def test_member_history_cursor_seeks_member_index(db, loan_history):
+    _, member_ids = loan_history
+    query = member_loans_query(member_ids[3], None, None, None, [date.today() - timedelta(days=365), 10000], 10)
+    assert "ix_loans_member_id_loan_date" in await plan_indexes(db, query, seek=True)
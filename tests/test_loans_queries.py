@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app import models
+from tests.helpers import count_queries, create_books, create_members
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_loans(db, count: int) -> None:
+    book_ids = await create_books(db, count)
+    member_ids = await create_members(db, 10)
+    await db.execute(insert(models.loan_association_table), [
+        {
+            "book_id": book_id, "member_id": member_ids[index % len(member_ids)],
+            "loan_date": date.today(), "due_date": date.today() + timedelta(days=14),
+            "status": "En cours",
+        }
+        for index, book_id in enumerate(book_ids)
+    ])
+    await db.commit()
+
+
+async def loans_page_queries(client, headers, limit: int) -> int:
+    with count_queries() as statements:
+        response = await client.get("/loans/", params={"limit": limit}, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    return len(statements)
+
+
+async def test_loans_page_query_count_is_constant(client, db, admin_headers):
+    await create_loans(db, 100)
+    # Premier appel : l'utilisateur authentifié est lu puis mis en cache
+    await client.get("/loans/", params={"limit": 1}, headers=admin_headers)
+
+    # Une seule requête (emprunts joints aux livres et aux membres), quelle
+    # que soit la taille de la page
+    assert await loans_page_queries(client, admin_headers, 10) == 1
+    assert await loans_page_queries(client, admin_headers, 100) == 1
@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app import models
+from tests.helpers import create_books, create_members
+
+pytestmark = pytest.mark.anyio
+
+loans = models.loan_association_table
+
+
+@pytest.fixture
+async def history(db):
+    """
+    Deux membres : le premier a douze emprunts (huit retournés, deux en cours
+    et deux en retard, un par jour), le second aucun.
+    """
+    book_ids = await create_books(db, 12)
+    member_ids = await create_members(db, 2)
+    today = date.today()
+    rows = []
+    for index, book_id in enumerate(book_ids):
+        loan_date = today - timedelta(days=40 - index)
+        if index < 8:
+            status, return_date, due_date = "Retourné", loan_date + timedelta(days=7), loan_date + timedelta(days=14)
+        elif index < 10:
+            status, return_date, due_date = "En retard", None, today - timedelta(days=1)
+        else:
+            status, return_date, due_date = "En cours", None, today + timedelta(days=14)
+        rows.append({
+            "book_id": book_id, "member_id": member_ids[0], "loan_date": loan_date,
+            "due_date": due_date, "return_date": return_date, "status": status,
+        })
+    result = await db.execute(insert(loans).returning(loans.c.id), rows)
+    loan_ids = list(result.scalars())
+    await db.commit()
+    # Du plus récent au plus ancien
+    return member_ids, loan_ids[::-1], today
+
+
+async def test_counters_on_empty_page(client, admin_headers, history):
+    member_ids, _, _ = history
+
+    response = await client.get(f"/members/{member_ids[1]}/loans", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == {"member_id": member_ids[1], "active_loans": 0, "overdue_loans": 0, "loans": []}
+
+    # Les compteurs ne dépendent pas des filtres
+    response = await client.get(
+        f"/members/{member_ids[0]}/loans", params={"status_filter": "Perdu"}, headers=admin_headers
+    )
+    body = response.json()
+    assert (body["active_loans"], body["overdue_loans"], body["loans"]) == (4, 2, [])
+    assert "X-Next-Cursor" not in response.headers
+
+
+async def test_unknown_member_is_not_found(client, admin_headers, history):
+    response = await client.get("/members/999999/loans", headers=admin_headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Member not found"
+
+
+async def test_status_and_date_filters(client, admin_headers, history):
+    member_ids, loan_ids, today = history
+    path = f"/members/{member_ids[0]}/loans"
+
+    response = await client.get(path, params={"status_filter": "En retard"}, headers=admin_headers)
+    assert [loan["id"] for loan in response.json()["loans"]] == loan_ids[2:4]
+    assert {loan["status"] for loan in response.json()["loans"]} == {"En retard"}
+
+    params = {
+        "loan_date_from": (today - timedelta(days=35)).isoformat(),
+        "loan_date_to": (today - timedelta(days=33)).isoformat(),
+    }
+    response = await client.get(path, params=params, headers=admin_headers)
+    loans_page = response.json()["loans"]
+    assert [loan["id"] for loan in loans_page] == loan_ids[4:7]
+    assert all(params["loan_date_from"] <= loan["loan_date"] <= params["loan_date_to"] for loan in loans_page)
+    assert all("title" in loan["book"] for loan in loans_page)
+
+
+async def test_cursor_pages_follow_loan_date(client, admin_headers, history):
+    member_ids, loan_ids, _ = history
+    path = f"/members/{member_ids[0]}/loans"
+
+    ids, params = [], {"limit": 5}
+    while True:
+        response = await client.get(path, params=params, headers=admin_headers)
+        assert response.status_code == 200
+        ids.append([loan["id"] for loan in response.json()["loans"]])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 5, "after": cursor}
+
+    assert ids == [loan_ids[0:5], loan_ids[5:10], loan_ids[10:12]]
+
+
+async def test_cursor_from_another_sort_is_rejected(client, admin_headers, history):
+    member_ids, _, _ = history
+    response = await client.get("/books/", params={"limit": 1}, headers=admin_headers)
+
+    response = await client.get(
+        f"/members/{member_ids[0]}/loans",
+        params={"after": response.headers["X-Next-Cursor"]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app import models
+from tests.helpers import assert_max_queries, create_books, create_members
+
+pytestmark = pytest.mark.anyio
+
+# Requêtes SQL autorisées par endpoint, pour une page pleine, authentification
+# comprise (utilisateur absent du cache : une requête sur "users")
+QUERY_BUDGETS = [
+    ("/books/", 2),
+    ("/members/", 2),
+    ("/loans/", 2),
+    ("/loans/overdue/", 2),
+    ("/members/{member_id}/loans", 2),
+]
+
+
+@pytest.fixture
+async def catalog(db):
+    """
+    Livres, membres et emprunts en nombre suffisant pour remplir des pages
+    de 50 éléments, dont des emprunts en retard. Les emprunts sont ceux du
+    premier membre, dont l'ID est retourné.
+    """
+    book_ids = await create_books(db, 100)
+    member_ids = await create_members(db, 100)
+    today = date.today()
+    await db.execute(insert(models.loan_association_table), [
+        {
+            "book_id": book_id, "member_id": member_ids[0],
+            "loan_date": today - timedelta(days=30), "due_date": today - timedelta(days=index % 20 + 1),
+            "status": "En cours",
+        }
+        for index, book_id in enumerate(book_ids)
+    ])
+    await db.commit()
+    return member_ids[0]
+
+
+@pytest.mark.parametrize("path, budget", QUERY_BUDGETS)
+async def test_endpoint_query_budget(client, admin_headers, catalog, path, budget):
+    response = await client.get(path.format(member_id=catalog), params={"limit": 50}, headers=admin_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["loans"] if isinstance(body, dict) else body) == 50
+    assert_max_queries(response, budget)
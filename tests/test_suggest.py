@@ -0,0 +1,48 @@
+import pytest
+
+from app.core.suggest import PrefixIndex
+
+
+@pytest.fixture
+def index():
+    """
+    Index construit en une passe, comme par SuggestService.rebuild.
+    """
+    index = PrefixIndex(memory_budget_bytes=1024 * 1024)
+    index.bulk_load([
+        (1, "Les Misérables", "Victor Hugo"),
+        (2, "Notre-Dame de Paris", "Victor Hugo"),
+        (3, "Madame Bovary", "Gustave Flaubert"),
+    ])
+    return index
+
+
+def test_search_matches_word_prefixes(index):
+    assert [book_id for book_id, _, _ in index.search("misera")] == [1]
+    assert [book_id for book_id, _, _ in index.search("VICTOR")] == [1, 2]
+
+
+def test_added_books_are_merged_with_base_in_key_order(index):
+    index.add(4, "Madame de Staël", "Germaine de Staël")
+
+    assert index.delta_size == 6
+    assert [book_id for book_id, _, _ in index.search("madame")] == [3, 4]
+    assert [book_id for book_id, _, _ in index.search("madame", limit=1)] == [3]
+
+
+def test_updated_book_replaces_its_base_entries(index):
+    index.add(3, "Salammbô", "Gustave Flaubert")
+
+    assert index.search("madame") == []
+    assert index.search("salammbo") == [(3, "Salammbô", "Gustave Flaubert")]
+    assert [book_id for book_id, _, _ in index.search("gustave")] == [3]
+
+
+def test_removed_books_are_not_found(index):
+    index.add(4, "Hugo", "Anonyme")
+    index.remove(1)
+    index.remove(4)
+
+    assert [book_id for book_id, _, _ in index.search("hugo")] == [2]
+    assert index.delta_size == 0
+    assert len(index) == 2